@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
+import json
 import os
 
 load_dotenv()
@@ -152,8 +153,8 @@ MEDIA_ROOT = BASE_DIR / "mediafiles"
 
 REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'nfl.throttling.AnonRateThrottle',
+        'nfl.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '250/day',
@@ -203,8 +204,22 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'nfl.tasks.weekly_nfl_sync',
         'schedule': crontab(day_of_week=0, hour=14, minute=15),
     },
+    'publish-snapshots-nightly': {
+        'task': 'nfl.tasks.publish_api_snapshots',
+        'schedule': crontab(hour=4, minute=0),
+    },
 }
 
+# Conditional-GET cache for the ingestion pipeline, set HTTP_CACHE_DIR='' to disable
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(BASE_DIR, '.http_cache'))
+
+# Host the cache warmer and snapshot publisher render their requests for, must be in ALLOWED_HOSTS
+WARM_HOST = os.getenv('WARM_HOST', ALLOWED_HOSTS[0])
+
+# Extra fantasy scoring rulesets as JSON, e.g. {"six_pt_pass": {"base": "ppr", "points": {"pass_touchdowns": 6}}}.
+# "base" starts from another profile and "points" overrides its weights.
+FANTASY_PROFILES = json.loads(os.getenv('FANTASY_PROFILES', '{}'))
+
 # Redis Cache
 CACHES = {
     "default": {
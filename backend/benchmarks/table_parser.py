@@ -0,0 +1,76 @@
+"""
+Compares Table.parser (lxml, first table only) with the original
+BeautifulSoup parser.
+
+    python -m benchmarks.table_parser [PAGES_DIR] [--repeat N]
+
+PAGES_DIR holds saved pages named after their source, e.g.
+nfl-offense-passing.html, sumer-offense.html, sharp-coverage.html.
+Without it, synthetic pages shaped like each source are generated.
+"""
+from pathlib import Path
+from timeit import timeit
+import argparse
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nfl.services.table import Table  # noqa: E402
+
+SOURCES = ('nfl', 'sumer', 'sharp')
+NICKNAMES = [f"Team{i}" for i in range(32)]
+
+def synthetic_page(source: str) -> str:
+    """
+    A page with 32 team rows, about 20 columns and the scripts, nav
+    and footer markup that surround the table on the real sites.
+    """
+    chrome = ''.join(
+        f'<div class="nav-{i}"><a href="/link/{i}">Link {i}</a><script>var a{i} = "{"x" * 200}";</script></div>'
+        for i in range(600)
+    )
+    headers = ''.join(f'<th><span>Col {i}</span></th>' for i in range(1, 20))
+
+    rows = []
+    for name in NICKNAMES:
+        if source == 'nfl':
+            team = f'<div class="club"><div class="full">{name}</div><div class="short">{name}</div></div>'
+        elif source == 'sumer':
+            team = f'<img src="/logo.png"> City {name}'
+        else:
+            team = name
+        cells = ''.join(f'<td>{random.uniform(0, 100):.1f}%</td>' for _ in range(19))
+        rows.append(f'<tr><td>{team}</td>{cells}</tr>')
+
+    table = f'<table><thead><tr><th>Team</th>{headers}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+    return f'<html><head>{chrome}</head><body>{chrome}{table}{chrome}</body></html>'
+
+def load_pages(pages_dir: str | None) -> list[tuple[str, str, str]]:
+    if not pages_dir:
+        return [(f"synthetic-{source}", source, synthetic_page(source)) for source in SOURCES]
+
+    pages = []
+    for path in sorted(Path(pages_dir).glob('*.html')):
+        source = path.stem.split('-')[0]
+        if source in SOURCES:
+            pages.append((path.name, source, path.read_text(encoding='utf-8')))
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages_dir', nargs='?')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'page':<32}{'KB':>8}{'rows':>6}{'soup ms':>10}{'lxml ms':>10}{'speedup':>9}")
+    for name, source, html in load_pages(args.pages_dir):
+        table = Table(html=html, source=source)
+        assert table.parser == table.soup_parser, f"{name}: parsers disagree"
+
+        soup = timeit(lambda: table.soup_parser, number=args.repeat) / args.repeat * 1000
+        fast = timeit(lambda: table.parser, number=args.repeat) / args.repeat * 1000
+        print(f"{name:<32}{len(html) / 1024:>8.0f}{len(table.parser):>6}{soup:>10.2f}{fast:>10.2f}{soup / fast:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -16,6 +16,9 @@ then
 
     echo "Applying database migrations..."
     python manage.py migrate --noinput
+
+    echo "Backfilling gamelog columns..."
+    python manage.py backfill_gamelogs
 fi
 
 exec "$@"
\ No newline at end of file
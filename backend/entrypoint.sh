@@ -17,6 +17,9 @@ then
     echo "Running migrations..."
     python manage.py migrate
 
+    echo "Backfilling gamelog columns..."
+    python manage.py backfill_gamelogs
+
     # echo "Running Django tests..."
     # python manage.py test
 fi
@@ -15,7 +15,10 @@ from .models import (
     TeamCoverageSchemeStats,
     TeamOffensePlayCallingStats,
     TeamCoverageStatsByPosition,
-    TeamRankSnapshot
+    TeamRankSnapshot,
+    TeamWeeklySnapshot,
+    DefenseVsPosition,
+    PlayerSeasonAggregate
 )
 
 admin.site.register(Team)
@@ -33,4 +36,7 @@ admin.site.register(TeamAdvanceDefenseStats)
 admin.site.register(TeamCoverageSchemeStats)
 admin.site.register(TeamOffensePlayCallingStats)
 admin.site.register(TeamCoverageStatsByPosition)
-admin.site.register(TeamRankSnapshot)
\ No newline at end of file
+admin.site.register(TeamRankSnapshot)
+admin.site.register(TeamWeeklySnapshot)
+admin.site.register(DefenseVsPosition)
+admin.site.register(PlayerSeasonAggregate)
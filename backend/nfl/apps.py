@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class NflConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nfl'
+
+    def ready(self):
+        from .services import signals  # noqa: F401
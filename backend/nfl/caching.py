@@ -0,0 +1,260 @@
+from collections.abc import Callable, Iterable
+from functools import wraps
+from hashlib import md5
+from urllib.parse import urlencode
+from time import time
+from uuid import uuid4
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_response_headers
+from django.utils.http import http_date, quote_etag
+from .models import Team, Player, Game, PlayerGameStats, TeamRankSnapshot, DefenseVsPosition, PlayerSeasonAggregate
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Root tag of every cached endpoint, a Team change touches all of them
+ENDPOINT_TAGS = ['teams', 'team-stats', 'ranks', 'players', 'player', 'gamelogs', 'events', 'defense', 'leaderboard']
+
+def tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+def new_version() -> str:
+    """
+    A fresh tag version: when it was made, and a random part so two
+    invalidations in the same second still differ.
+    """
+    return f"{int(time())}.{uuid4().hex}"
+
+def version_time(version: str) -> int | None:
+    stamp, _, _ = version.partition('.')
+    return int(stamp) if stamp.isdigit() else None
+
+def tag_versions(tags: list[str]) -> dict[str, str]:
+    """
+    Current version token of each tag, creating the ones that are missing
+    so an evicted tag can never bring back responses cached under it.
+    """
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, new_version(), None)
+        versions.update(cache.get_many(missing))
+
+    return {tag: versions.get(tag_key(tag), '') for tag in tags}
+
+def invalidate(tags: Iterable[str]) -> None:
+    """
+    Gives every tag a new version in a single round trip. Responses cached
+    under the old versions are never read again and expire on their own.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return
+
+    cache.set_many({tag_key(tag): new_version() for tag in tags}, None)
+    logger.info(f"INVALIDATED: {len(tags)} cache tags {tags[:10]}")
+
+def request_tag_versions(request, tags: list[str]) -> dict[str, str]:
+    """
+    tag_versions, read once per request however many decorators ask.
+    """
+    seen = request.__dict__.setdefault('_tag_versions', {})
+    missing = [tag for tag in tags if tag not in seen]
+    if missing:
+        seen.update(tag_versions(missing))
+    return {tag: seen[tag] for tag in tags}
+
+def response_key(request, name: str, tags: list[str]) -> str:
+    renderer = getattr(request, 'accepted_renderer', None)
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    versions = request_tag_versions(request, tags)
+
+    url = md5(f"{request.path}?{query}".encode()).hexdigest()
+    version = md5(':'.join(versions[tag] for tag in tags).encode()).hexdigest()
+    return f"response:{name}:{getattr(renderer, 'format', '')}:{url}:{version}"
+
+def cached_response(timeout: int, tags: Callable[..., list[str]]):
+    """
+    Replacement for cache_page whose entries are tied to tags.
+
+    tags(request, **kwargs) returns the tags a response depends on; once
+    any of them is invalidated the response is rendered again.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            key = response_key(request, view.__qualname__, tags(request, **kwargs))
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            patch_response_headers(response, timeout)
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(lambda r: cache.set(key, r, timeout))
+            else:
+                cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
+
+def cached_objects(name: str, ids: list, tags: Callable[..., list[str]], params: str, timeout: int, build: Callable[[list], dict]) -> dict:
+    """
+    Per-object counterpart of cached_response for batch endpoints: each
+    id is cached on its own under its tags(id) and the request's params,
+    so any later batch asking for it reuses the entry. build(missing)
+    renders the ids not found, together, and returns {id: data}.
+    """
+    tags_by_id = {pk: tags(pk) for pk in ids}
+    versions = tag_versions(sorted({tag for object_tags in tags_by_id.values() for tag in object_tags}))
+    keys = {
+        pk: f"object:{name}:{pk}:" + md5(f"{params}:{':'.join(versions[tag] for tag in object_tags)}".encode()).hexdigest()
+        for pk, object_tags in tags_by_id.items()
+    }
+
+    found = cache.get_many(list(keys.values()))
+    results = {pk: found[key] for pk, key in keys.items() if key in found}
+
+    missing = [pk for pk in ids if pk not in results]
+    if missing:
+        built = build(missing)
+        cache.set_many({keys[pk]: data for pk, data in built.items()}, timeout)
+        results.update(built)
+    return results
+
+def conditional_response(tags: Callable[..., list[str]]):
+    """
+    ETag and Last-Modified for a view, derived from the versions of the
+    tags its response depends on (the same ones cached_response uses), so
+    a client already holding the current data gets a 304 before any
+    query or serializer runs.
+
+    Responses are marked no-cache: browsers keep them but revalidate,
+    which costs a 304 until the next ingest moves a tag on.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            renderer = getattr(request, 'accepted_renderer', None)
+            query = urlencode(sorted(request.GET.lists()), doseq=True)
+            versions = request_tag_versions(request, tags(request, **kwargs))
+            etag = quote_etag(md5(
+                f"{getattr(renderer, 'format', '')}:{request.path}?{query}:{':'.join(versions.values())}".encode()
+            ).hexdigest())
+            stamps = [stamp for stamp in map(version_time, versions.values()) if stamp]
+            modified = max(stamps) if stamps else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response['ETag'] = etag
+            if modified:
+                response['Last-Modified'] = http_date(modified)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
+
+def count_hits(prefix: str, timeout: int):
+    """
+    Counts requests per object (kwargs['pk']) in the cache, cached or not,
+    so the warmer can tell which detail pages are actually visited.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(request, 'cache_warming', False):
+                key = f"hits:{prefix}:{kwargs.get('pk')}"
+                cache.add(key, 0, timeout)
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    pass
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def top_hits(prefix: str, ids: Iterable, n: int) -> list:
+    """
+    The n ids with the most counted hits, in one round trip.
+    """
+    ids = list(ids)
+    hits = cache.get_many([f"hits:{prefix}:{pk}" for pk in ids])
+    counted = [(hits.get(f"hits:{prefix}:{pk}", 0), pk) for pk in ids]
+    return [pk for count, pk in sorted(counted, key=lambda item: -item[0]) if count][:n]
+
+def static_tags(*tags: str) -> Callable[..., list[str]]:
+    return lambda request, **kwargs: list(tags)
+
+def player_tags(request, pk=None, **kwargs) -> list[str]:
+    return ['player', f'player:{pk}']
+
+def gamelog_tags(request, **kwargs) -> list[str]:
+    return ['gamelogs', f"gamelogs:season:{request.GET.get('season_year') or '*'}"]
+
+def batch_player_tags(request, **kwargs) -> list[str]:
+    ids = request.GET.get('ids', '').split(',')
+    return ['player', *(f'player:{pk.strip()}' for pk in ids if pk.strip().isdigit())]
+
+def export_tags(request, dataset=None, **kwargs) -> list[str]:
+    return gamelog_tags(request) if dataset == 'gamelogs' else ['team-stats']
+
+def event_tags(request, **kwargs) -> list[str]:
+    return ['events', f"events:week:{request.GET.get('week') or '*'}"]
+
+def changed_tags(objects: Iterable[Model]) -> set[str]:
+    """
+    Tags touched by a set of written rows, used after an ingest so only
+    the affected players, seasons and weeks lose their cached responses.
+    """
+    tags = set()
+    games = set()
+
+    for obj in objects:
+        if isinstance(obj, Team):
+            tags.update(ENDPOINT_TAGS)
+        elif isinstance(obj, Player):
+            tags.update(['players', 'gamelogs', f'player:{obj.pk}'])
+        elif isinstance(obj, Game):
+            games.add(obj.pk)
+            tags.update([
+                'events:week:*', f'events:week:{obj.week}',
+                'gamelogs:season:*', f'gamelogs:season:{obj.season_year}',
+            ])
+        elif isinstance(obj, PlayerGameStats):
+            # 'players' too, the autocomplete index ranks by games played
+            tags.update([
+                'players', f'player:{obj.player_id}',
+                'gamelogs:season:*', f'gamelogs:season:{obj.game.season_year}',
+            ])
+        elif isinstance(obj, TeamRankSnapshot):
+            tags.add('ranks')
+        elif isinstance(obj, DefenseVsPosition):
+            tags.add('defense')
+        elif isinstance(obj, PlayerSeasonAggregate):
+            tags.add('leaderboard')
+        else:
+            # The scraped per-team stat tables
+            tags.add('team-stats')
+
+    if games:
+        player_ids = PlayerGameStats.objects.filter(game__in=games).values_list('player_id', flat=True).distinct()
+        tags.update(f'player:{player_id}' for player_id in player_ids)
+
+    return tags
@@ -0,0 +1,184 @@
+from collections.abc import Iterator
+from django.db.models import DecimalField, JSONField, QuerySet
+from django_filters.utils import translate_validation
+from .filters import PlayerMatchupsFilter
+from .models import PlayerGameStats, Team, TEAM_STAT_TABLES
+import csv
+import io
+import json
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows per server-side cursor fetch, and per Parquet row group
+CHUNK_SIZE = 5000
+
+ARROW_TYPES = {
+    'AutoField': pa.int64(),
+    'BigAutoField': pa.int64(),
+    'IntegerField': pa.int64(),
+    'PositiveIntegerField': pa.int64(),
+    'FloatField': pa.float64(),
+    'BooleanField': pa.bool_(),
+    'DateField': pa.date32(),
+    'DateTimeField': pa.timestamp('us', tz='UTC'),
+}
+
+def resolve(model, lookup: str):
+    """
+    The field a values() lookup ends on, the target column for relations.
+    """
+    for name in lookup.split('__'):
+        field = model._meta.get_field(name)
+        model = field.related_model
+    return field.target_field if field.is_relation else field
+
+class Dataset(object):
+    """
+    One exportable table: a queryset, the lookups read from it as flat
+    columns (joined tables included), and the FilterSet that query
+    params go through.
+    """
+    def __init__(self, queryset: QuerySet, columns: list[str], filterset_class=None):
+        self.queryset = queryset
+        self.columns = columns
+        self.fields = [resolve(queryset.model, column) for column in columns]
+        self.filterset_class = filterset_class
+
+    def filter(self, params) -> QuerySet:
+        if self.filterset_class is None:
+            return self.queryset
+
+        filterset = self.filterset_class(params, queryset=self.queryset)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
+
+    def chunks(self, queryset: QuerySet) -> Iterator[list[tuple]]:
+        """
+        The rows as tuples, CHUNK_SIZE at a time, read through a
+        server-side cursor so memory stays flat whatever the size.
+        """
+        chunk = []
+        for row in queryset.values_list(*self.columns).iterator(chunk_size=CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def json_columns(self) -> list[int]:
+        return [i for i, field in enumerate(self.fields) if isinstance(field, JSONField)]
+
+    def schema(self) -> pa.Schema:
+        types = []
+        for field in self.fields:
+            if isinstance(field, DecimalField):
+                types.append(pa.decimal128(field.max_digits, field.decimal_places))
+            else:
+                types.append(ARROW_TYPES.get(field.get_internal_type(), pa.string()))
+        return pa.schema(list(zip(self.columns, types)))
+
+GAMELOG_KEYS = [
+    'id', 'game_date', 'player', 'player__full_name', 'player__position',
+    'game', 'game__season_year', 'game__season_type', 'game__week',
+    'team_at_game_time__abbreviation', 'opponent__abbreviation', 'is_home',
+]
+
+DATASETS = {
+    'gamelogs': Dataset(
+        PlayerGameStats.objects.order_by('game_date', 'id'),
+        GAMELOG_KEYS + [
+            field.name for field in PlayerGameStats._meta.concrete_fields
+            if not field.is_relation and field.name not in GAMELOG_KEYS
+        ],
+        PlayerMatchupsFilter,
+    ),
+    'team-stats': Dataset(
+        Team.objects.order_by('abbreviation'),
+        ['id', 'abbreviation', 'full_name', 'conference', 'division'] + [
+            f'{table}__{field.name}'
+            for table in TEAM_STAT_TABLES
+            for field in Team._meta.get_field(table).related_model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation
+        ],
+    ),
+}
+
+def write_csv(dataset: Dataset, chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(dataset.columns)
+    json_columns = dataset.json_columns()
+
+    for chunk in chunks:
+        if json_columns:
+            chunk = [
+                [json.dumps(value) if i in json_columns and value is not None else value for i, value in enumerate(row)]
+                for row in chunk
+            ]
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def write_ndjson(dataset: Dataset, chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield b''.join(orjson.dumps(dict(zip(dataset.columns, row)), default=float) + b'\n' for row in chunk)
+
+class Sink(io.RawIOBase):
+    """
+    File object the Parquet writer writes into, drained after every row
+    group so the bytes can be streamed as they are produced.
+    """
+    def __init__(self):
+        self.buffer = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b''.join(self.buffer)
+        self.buffer = []
+        return data
+
+def write_parquet(dataset: Dataset, chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    schema = dataset.schema()
+    json_columns = dataset.json_columns()
+    sink = Sink()
+
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            columns = [list(column) for column in zip(*chunk)]
+            for i in json_columns:
+                columns[i] = [json.dumps(value) if value is not None else None for value in columns[i]]
+            writer.write_table(pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+# format -> (writer, content type)
+FORMATS = {
+    'csv': (write_csv, 'text/csv'),
+    'ndjson': (write_ndjson, 'application/x-ndjson'),
+    'parquet': (write_parquet, 'application/vnd.apache.parquet'),
+}
+
+def export(dataset: Dataset, file_format: str, queryset: QuerySet) -> Iterator[bytes]:
+    """
+    The file's bytes, piece by piece, as the rows are read.
+    """
+    write, _ = FORMATS[file_format]
+    for data in write(dataset, dataset.chunks(queryset)):
+        if data:
+            yield data
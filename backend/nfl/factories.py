@@ -19,7 +19,8 @@ class TeamFactory(factory.django.DjangoModelFactory):
 
     @factory.lazy_attribute
     def slug(self):
-        return slugify(self.full_name)
+        # Faker repeats company names, the abbreviation keeps slugs unique
+        return slugify(f"{self.full_name} {self.abbreviation}")
 
 class PlayerFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -36,9 +37,7 @@ class PlayerFactory(factory.django.DjangoModelFactory):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
-    @factory.lazy_attribute
-    def slug(self):
-        return slugify(self.full_name)
+    slug = factory.LazyAttributeSequence(lambda o, n: slugify(f"{o.full_name} {n}"))
 
 class GameFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -62,6 +61,9 @@ class PlayerGameStatsFactory(factory.django.DjangoModelFactory):
 
     player = factory.SubFactory(PlayerFactory)
     game = factory.SubFactory(GameFactory)
+    game_date = factory.LazyAttribute(lambda o: o.game.date)
+    opponent_id = factory.LazyAttribute(lambda o: o.game.matchup(o.player.team_id)[0])
+    is_home = factory.LazyAttribute(lambda o: o.game.matchup(o.player.team_id)[1])
     
     games_played = 1
     is_starter = factory.Faker('boolean')
@@ -71,6 +73,10 @@ class PlayerGameStatsFactory(factory.django.DjangoModelFactory):
     pass_touchdowns = factory.Faker('random_int', min=0, max=4)
     interceptions = factory.Faker('random_int', min=0, max=2)
 
+    @factory.lazy_attribute
+    def team_at_game_time_id(self):
+        return self.player.team_id if self.is_home is not None else None
+
 class TeamOffensePassingStatsFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = TeamOffensePassingStats
@@ -0,0 +1,94 @@
+from collections.abc import Iterable
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import DecimalField, FloatField, IntegerField
+from .models import PlayerGameStats
+import numpy as np
+import pandas as pd
+
+DEFAULT_PROFILE = 'ppr'
+
+STANDARD = {
+    'pass_yards': 0.04,
+    'pass_touchdowns': 4,
+    'interceptions': -1,
+    'rush_yards': 0.1,
+    'rush_touchdowns': 6,
+    'rec_yards': 0.1,
+    'rec_touchdowns': 6,
+    'fumbles_lost': -2,
+}
+
+# Profile -> points per unit of each stat, plus (stat, threshold, bonus) bonuses
+SCORING_PROFILES = {
+    'standard': {'points': STANDARD},
+    'half_ppr': {'points': {**STANDARD, 'receptions': 0.5}},
+    'ppr': {'points': {**STANDARD, 'receptions': 1}},
+    'draftkings': {
+        'points': {**STANDARD, 'receptions': 1, 'fumbles_lost': -1},
+        'bonuses': [('pass_yards', 300, 3), ('rush_yards', 100, 3), ('rec_yards', 100, 3)],
+    },
+    'fanduel': {'points': {**STANDARD, 'receptions': 0.5}},
+}
+
+def load_profiles(custom: dict[str, dict]) -> None:
+    """
+    Adds the FANTASY_PROFILES rulesets to SCORING_PROFILES. A stat that
+    is not a numeric gamelog column, or a base that is not a profile,
+    is a configuration error rather than a silent zero.
+    """
+    for name, profile in custom.items():
+        base = {'points': {}}
+        if 'base' in profile:
+            if profile['base'] not in SCORING_PROFILES:
+                raise ImproperlyConfigured(f"FANTASY_PROFILES['{name}']: unknown base profile '{profile['base']}'")
+            base = SCORING_PROFILES[profile['base']]
+
+        scoring = {
+            'points': {**base['points'], **profile.get('points', {})},
+            'bonuses': [tuple(bonus) for bonus in profile.get('bonuses', base.get('bonuses', []))],
+        }
+        for stat in [*scoring['points'], *(bonus[0] for bonus in scoring['bonuses'])]:
+            if not is_stat(stat):
+                raise ImproperlyConfigured(f"FANTASY_PROFILES['{name}']: '{stat}' is not a PlayerGameStats stat")
+        SCORING_PROFILES[name] = scoring
+
+def is_stat(name: str) -> bool:
+    try:
+        field = PlayerGameStats._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return isinstance(field, (IntegerField, FloatField, DecimalField))
+
+load_profiles(settings.FANTASY_PROFILES)
+
+# Every PlayerGameStats column some profile scores
+SCORED_STATS = sorted({
+    stat
+    for profile in SCORING_PROFILES.values()
+    for stat in [*profile['points'], *(bonus[0] for bonus in profile.get('bonuses', []))]
+})
+
+def score(stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fantasy points of every row under every profile, one column per
+    profile, computed a whole column at a time.
+    """
+    values = stats.reindex(columns=SCORED_STATS).apply(pd.to_numeric, errors='coerce').fillna(0)
+    points = {}
+    for name, profile in SCORING_PROFILES.items():
+        weights = pd.Series(profile['points']).reindex(SCORED_STATS, fill_value=0)
+        total = values.to_numpy() @ weights.to_numpy()
+        for stat, threshold, bonus in profile.get('bonuses', []):
+            total += np.where(values[stat].to_numpy() >= threshold, bonus, 0)
+        points[name] = total.round(2)
+    return pd.DataFrame(points, index=stats.index)
+
+def fantasy_points(rows: Iterable[dict]) -> list[dict[str, float]]:
+    """
+    {profile: points} for each gamelog row, in order.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    return score(pd.DataFrame(rows)).to_dict('records')
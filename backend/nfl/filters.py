@@ -1,16 +1,6 @@
 from django_filters import FilterSet, CharFilter, NumberFilter, ChoiceFilter
-from django.db.models import Q, F, Prefetch
-from .models import Player, PlayerGameStats
-
-class PlayerFilter(FilterSet):
-    fullName = CharFilter(
-        field_name='full_name',
-        lookup_expr='icontains'
-    )
-
-    class Meta:
-        model = Player
-        fields = ['fullName']
+from django.db.models import Prefetch
+from .models import Player, PlayerGameStats, TeamWeeklySnapshot, DefenseVsPosition, PlayerSeasonAggregate
 
 class PlayerStatFilter(FilterSet):
     season_year = NumberFilter(field_name='stats__game__season_year')
@@ -35,16 +25,16 @@ class PlayerStatFilter(FilterSet):
             stats_filter = stats_filter.filter(game__season_type=stype)
 
         if loc == 'home':
-            stats_filter = stats_filter.filter(player__team=F('game__homeTeam'))
+            stats_filter = stats_filter.filter(is_home=True)
         elif loc == 'away':
-            stats_filter = stats_filter.filter(player__team=F('game__awayTeam'))
+            stats_filter = stats_filter.filter(is_home=False)
 
         return queryset.prefetch_related(
             Prefetch(
                 'stats', 
                 queryset=stats_filter
             )
-        ).distinct()
+        )
 
 class PlayerMatchupsFilter(FilterSet):
     position = CharFilter(field_name='player__position', lookup_expr='exact')
@@ -64,16 +54,13 @@ class PlayerMatchupsFilter(FilterSet):
     def filter_by_opponent(self, queryset, name, opponent):
         if not opponent: return queryset
 
-        return queryset.filter(
-            Q(game__homeTeam__abbreviation=opponent) |
-            Q(game__awayTeam__abbreviation=opponent)
-        ).exclude(player__team__abbreviation=opponent)
+        return queryset.filter(opponent__abbreviation=opponent)
     
     def filter_by_location(self, queryset, name, value):
         if value == 'home':
-            return queryset.filter(player__team=F('game__homeTeam'))
+            return queryset.filter(is_home=True)
         elif value == 'away':
-            return queryset.filter(player__team=F('game__awayTeam'))
+            return queryset.filter(is_home=False)
         return queryset
     
 class UpcomingGameFilter(FilterSet):
@@ -85,4 +72,42 @@ class UpcomingGameFilter(FilterSet):
     status = CharFilter(
         field_name='status',
         lookup_expr='exact'
-    )
\ No newline at end of file
+    )
+
+class TeamRankHistoryFilter(FilterSet):
+    season_year = NumberFilter(field_name='season_year')
+    season_type = NumberFilter(field_name='season_type')
+
+    class Meta:
+        model = TeamWeeklySnapshot
+        fields = ['season_year', 'season_type']
+
+class TeamRankDeltaFilter(TeamRankHistoryFilter):
+    week = NumberFilter(field_name='week', lookup_expr='lte')
+
+    class Meta:
+        model = TeamWeeklySnapshot
+        fields = ['season_year', 'season_type', 'week']
+
+class DefenseVsPositionFilter(FilterSet):
+    opponent = CharFilter(field_name='opponent__abbreviation')
+    location = ChoiceFilter(choices=DefenseVsPosition.LOCATIONS)
+
+    class Meta:
+        model = DefenseVsPosition
+        fields = ['season_year', 'season_type', 'position', 'opponent', 'location']
+
+    def __init__(self, data=None, *args, **kwargs):
+        # One location per matrix, both sides unless asked for
+        data = data.copy() if data is not None else {}
+        if not data.get('location'):
+            data['location'] = 'all'
+        super().__init__(data, *args, **kwargs)
+
+class PlayerSeasonAggregateFilter(FilterSet):
+    team = CharFilter(field_name='team__abbreviation')
+    min_games = NumberFilter(field_name='games', lookup_expr='gte')
+
+    class Meta:
+        model = PlayerSeasonAggregate
+        fields = ['season_year', 'season_type', 'position', 'team', 'min_games']
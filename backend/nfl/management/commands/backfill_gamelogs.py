@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from nfl.services.services import sync_game_dates, sync_matchups
+
+class Command(BaseCommand):
+    help = "Fills the denormalized gamelog columns (game_date, team_at_game_time, opponent, is_home) on rows ingested before they existed."
+
+    def handle(self, *args, **options):
+        dated = sync_game_dates()
+        matched = sync_matchups()
+        self.stdout.write(self.style.SUCCESS(f"Backfilled game_date on {dated} and opponent on {matched} gamelog rows"))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from statistics import median
+from nfl.models import PlayerGameStats
+from nfl.planner import plan_queryset
+from nfl.rendering import FastJSONRenderer, row_plan
+from nfl.serializers import PlayerGameStatsMatchupsSerializer
+import time
+
+class Command(BaseCommand):
+    help = "Compares the CPU time of rendering gamelog lists through the serializer and through the fast values() path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[50, 500, 5000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        serializer_class = PlayerGameStatsMatchupsSerializer
+        plan = row_plan(serializer_class)
+        queryset = plan_queryset(PlayerGameStats.objects.all(), serializer_class)
+
+        def stock(rows):
+            return JSONRenderer().render(serializer_class(queryset[:rows], many=True).data)
+
+        def fast(rows):
+            return FastJSONRenderer().render(plan.render(plan.values(queryset)[:rows]))
+
+        for rows in options['rows']:
+            timings = {}
+            for name, render in (('serializer', stock), ('fast', fast)):
+                samples = []
+                for _ in range(options['repeat']):
+                    start = time.process_time()
+                    content = render(rows)
+                    samples.append(time.process_time() - start)
+                timings[name] = median(samples) * 1000
+
+            self.stdout.write(
+                f"{rows:>6} rows ({len(content)} bytes): serializer {timings['serializer']:.1f} ms, "
+                f"fast {timings['fast']:.1f} ms, {timings['serializer'] / max(timings['fast'], 1e-6):.1f}x"
+            )
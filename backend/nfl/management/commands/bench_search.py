@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from statistics import median
+from nfl.search import PlayerIndex
+import time
+
+FIRST = ["Jo", "Ja", "Mi", "Ch", "De", "Tr", "Ke", "Da"]
+LAST = ["Allen", "Smith", "Brown", "Jones", "Davis", "Hill"]
+KEYSTROKES = ["j", "ja", "jal", "s", "sm", "smith1", "jo1 b", "d", "zzz"]
+
+class Command(BaseCommand):
+    help = "Times autocomplete keystrokes against a synthetic player index and fails when the slowest is over budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--budget', type=float, default=10.0, help="Milliseconds allowed for the slowest keystroke.")
+
+    def handle(self, *args, **options):
+        index = PlayerIndex([
+            {
+                'id': i, 'slug': f'p{i}', 'fullName': f"{FIRST[i % 8]}{i} {LAST[i % 6]}{i // 6}",
+                'position': 'WR', 'team': 'DET', 'games': i % 17,
+            }
+            for i in range(options['players'])
+        ])
+
+        slowest = 0.0
+        for query in KEYSTROKES:
+            samples = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                index.search(query)
+                samples.append((time.perf_counter() - start) * 1000)
+            slowest = max(slowest, max(samples))
+            self.stdout.write(f"{query!r:>10}: median {median(samples):.3f} ms, max {max(samples):.3f} ms")
+
+        if slowest > options['budget']:
+            raise CommandError(f"Slowest keystroke took {slowest:.3f} ms, over the {options['budget']} ms budget")
+        self.stdout.write(self.style.SUCCESS(f"{options['players']} players: slowest keystroke {slowest:.3f} ms"))
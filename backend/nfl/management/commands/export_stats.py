@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from nfl.export import DATASETS, FORMATS, export
+import sys
+
+class Command(BaseCommand):
+    help = "Streams a dataset (gamelogs, team-stats) to a CSV, NDJSON or Parquet file, e.g. export_stats gamelogs -f parquet -o gamelogs.parquet --filter season_year=2024."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(DATASETS))
+        parser.add_argument('-f', '--format', choices=list(FORMATS), default='csv')
+        parser.add_argument('-o', '--output', default='-', help="File to write, - for stdout.")
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE', help="Same filters as the endpoint, repeatable.")
+
+    def handle(self, *args, **options):
+        dataset = DATASETS[options['dataset']]
+        try:
+            params = dict(item.split('=', 1) for item in options['filter'])
+            queryset = dataset.filter(params)
+        except ValueError:
+            raise CommandError("Filters are NAME=VALUE.")
+        except ValidationError as e:
+            raise CommandError(e.detail)
+
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        written = 0
+        try:
+            for data in export(dataset, options['format'], queryset):
+                output.write(data)
+                written += len(data)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        if options['output'] != '-':
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
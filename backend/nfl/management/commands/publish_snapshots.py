@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand, CommandError
+from nfl.publishing import SNAPSHOT_ROOT, PublishInProgress, publish_snapshots
+
+class Command(BaseCommand):
+    help = "Publishes the read-only endpoints as content-hashed JSON and Parquet files for nginx to serve."
+
+    def handle(self, *args, **options):
+        try:
+            manifest = publish_snapshots()
+        except PublishInProgress as e:
+            raise CommandError(e)
+        self.stdout.write(self.style.SUCCESS(f"Published {len(manifest['files'])} snapshot files to {SNAPSHOT_ROOT}"))
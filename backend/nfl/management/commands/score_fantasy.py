@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from nfl.caching import invalidate
+from nfl.services.aggregates import build_player_season_aggregates
+from nfl.services.services import rescore_fantasy_points
+
+class Command(BaseCommand):
+    help = "Rescores every gamelog under the current fantasy profiles and rebuilds the season aggregates."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            scored = rescore_fantasy_points()
+            build_player_season_aggregates()
+            transaction.on_commit(lambda: invalidate(['gamelogs', 'player', 'leaderboard']))
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} gamelog rows"))
@@ -35,6 +35,9 @@ class Player(models.Model):
     
     class Meta:
         unique_together = ('full_name', 'team')
+        indexes = [
+            models.Index(fields=['position'], name='player_position_idx'),
+        ]
     
 class Game(models.Model):
     date = models.DateTimeField()
@@ -68,10 +71,25 @@ class Game(models.Model):
 
     def __str__(self):
         return f"{self.awayTeam.abbreviation} @ {self.homeTeam.abbreviation} - Week {self.week} ({self.date})"
+
+    def matchup(self, team_id: int) -> tuple[int | None, bool | None]:
+        """
+        (opponent id, is_home) for one of the teams in this game, or
+        (None, None) when the team did not play in it.
+        """
+        if team_id == self.homeTeam_id:
+            return self.awayTeam_id, True
+        if team_id == self.awayTeam_id:
+            return self.homeTeam_id, False
+        return None, None
     
     class Meta:
         unique_together = ('homeTeam', 'awayTeam', 'date')
         ordering = ['date']
+        indexes = [
+            models.Index(fields=['season_year', 'season_type', 'week'], name='game_season_idx'),
+            models.Index(fields=['week', 'status'], name='game_week_status_idx'),
+        ]
 
 class PlayerGameStats(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='stats', null=False)
@@ -114,7 +132,18 @@ class PlayerGameStats(models.Model):
     fumbles = models.IntegerField(default=0)
     fumbles_lost = models.IntegerField(default=0)
 
-    # draftkings_fantasy_points = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
+    # Copy of game.date so gamelogs can be paged by (game_date, id) without a join
+    game_date = models.DateTimeField(null=True, blank=True)
+
+    # Which side of the game the player was on, set at ingest so the opponent
+    # and location filters are plain indexed lookups. team_at_game_time is kept
+    # once stored, player.team moves on when the player is traded
+    team_at_game_time = models.ForeignKey(Team, on_delete=models.PROTECT, related_name='game_stats', null=True, blank=True)
+    opponent = models.ForeignKey(Team, on_delete=models.PROTECT, related_name='opponent_stats', null=True, blank=True)
+    is_home = models.BooleanField(null=True, blank=True)
+
+    # {scoring profile: points}, see nfl.fantasy
+    fantasy_points = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return f"{self.player.full_name} Stats for Game {self.game.id}"
@@ -123,6 +152,10 @@ class PlayerGameStats(models.Model):
         unique_together = ('player', 'game')
         verbose_name_plural = 'Player Game Stats'
         ordering = ['-game__week', 'id']
+        indexes = [
+            models.Index(fields=['game_date', 'id'], name='gamelog_keyset_idx'),
+            models.Index(fields=['opponent', 'is_home', 'game_date', 'id'], name='gamelog_opponent_idx'),
+        ]
 
 class TeamOffensePassingStats(models.Model):
     team = models.OneToOneField(
@@ -284,6 +317,14 @@ class TeamCoverageStatsByPosition(models.Model):
     yards_allowed_outside = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
     yards_allowed_slot = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
 
+# Related names of the one-to-one team stat tables above
+TEAM_STAT_TABLES = [
+    'team_offense_passing', 'team_offense_rushing', 'team_offense_receiving',
+    'team_defense_passing', 'team_defense_rushing', 'team_defense_receiving',
+    'team_advance_offense', 'team_advance_defense', 'team_coverage_rates',
+    'team_play_calling', 'team_coverage_stats_by_position',
+]
+
 class PointSpread(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='point_spread', null=False)
     display_name = models.CharField(max_length=255, blank=True, default="")
@@ -315,10 +356,7 @@ class Total(models.Model):
     class Meta:
         unique_together = ('team', 'display_name')
 
-class TeamRankSnapshot(models.Model):
-    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name='rank_snapshot')
-    updated_at = models.DateTimeField(auto_now=True)
-
+class TeamRanks(models.Model):
     off_pass_yards_rank = models.IntegerField(default=0)
     off_pass_tds_rank = models.IntegerField(default=0)
     off_pass_rating_rank = models.IntegerField(default=0)
@@ -369,4 +407,185 @@ class TeamRankSnapshot(models.Model):
     yards_allowed_slot_rank = models.IntegerField(default=0)
 
     class Meta:
-        verbose_name = "Team Rank Snapshot"
\ No newline at end of file
+        abstract = True
+
+RANK_FIELDS = [field.name for field in TeamRanks._meta.fields]
+
+class TeamRankSnapshot(TeamRanks):
+    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name='rank_snapshot')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Team Rank Snapshot"
+
+class TeamWeeklySnapshot(TeamRanks):
+    """
+    Ranks and raw team stats as they stood after a given week, kept so
+    trends can be charted without re-scraping.
+    """
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='weekly_snapshots')
+    season_year = models.IntegerField()
+    season_type = models.IntegerField()
+    week = models.IntegerField()
+    stats = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.team.abbreviation} {self.season_year} Week {self.week}"
+
+    class Meta:
+        unique_together = ('team', 'season_year', 'season_type', 'week')
+        indexes = [
+            models.Index(fields=['season_year', 'season_type', 'week'], name='weekly_snapshot_week_idx'),
+        ]
+        ordering = ['season_year', 'season_type', 'week']
+
+# Offensive positions the matchup dashboards are built for
+SKILL_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+# PlayerGameStats columns summed into DefenseVsPosition and PlayerSeasonAggregate
+STAT_TOTALS = [
+    'pass_attempts', 'completions', 'pass_yards', 'pass_touchdowns', 'interceptions', 'sacks',
+    'rush_attempts', 'rush_yards', 'rush_touchdowns',
+    'receptions', 'rec_targets', 'rec_yards', 'rec_touchdowns',
+    'fumbles_lost',
+]
+
+class DefenseVsPosition(models.Model):
+    """
+    What one defense allowed to one skill position over a season, built
+    from the gamelogs at ingest. location is the offense's side like the
+    gamelog filter, 'all' covers both.
+    """
+    LOCATIONS = [('all', 'All'), ('home', 'Home'), ('away', 'Away')]
+
+    season_year = models.IntegerField()
+    season_type = models.IntegerField()
+    opponent = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='defense_vs_position')
+    position = models.CharField(max_length=50)
+    location = models.CharField(max_length=4, choices=LOCATIONS, default='all')
+
+    games = models.IntegerField(default=0)
+
+    pass_attempts = models.IntegerField(default=0)
+    completions = models.IntegerField(default=0)
+    pass_yards = models.IntegerField(default=0)
+    pass_touchdowns = models.IntegerField(default=0)
+    interceptions = models.IntegerField(default=0)
+    sacks = models.IntegerField(default=0)
+
+    rush_attempts = models.IntegerField(default=0)
+    rush_yards = models.IntegerField(default=0)
+    rush_touchdowns = models.IntegerField(default=0)
+
+    receptions = models.IntegerField(default=0)
+    rec_targets = models.IntegerField(default=0)
+    rec_yards = models.IntegerField(default=0)
+    rec_touchdowns = models.IntegerField(default=0)
+
+    fumbles_lost = models.IntegerField(default=0)
+
+    yards_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    # 1 is the defense that allowed the fewest yards per game to the position
+    rank = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.opponent.abbreviation} vs {self.position} {self.season_year} ({self.location})"
+
+    class Meta:
+        unique_together = ('season_year', 'season_type', 'opponent', 'position', 'location')
+        ordering = ['position', 'rank']
+        verbose_name_plural = 'Defense vs Position'
+
+# Stats that PlayerSeasonAggregate also keeps per-game and last 3/5 game averages of
+ROLLING_STATS = ['pass_yards', 'rush_attempts', 'rush_yards', 'rec_targets', 'receptions', 'rec_yards']
+
+class PlayerSeasonAggregate(models.Model):
+    """
+    A player's season, built from the gamelogs at ingest: totals, per-game
+    and rolling averages, and the share of the team's targets and carries
+    in the games they played.
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='season_aggregates')
+    team = models.ForeignKey(Team, on_delete=models.SET_NULL, related_name='season_aggregates', null=True, blank=True, help_text="Team in the player's latest game of the season.")
+    season_year = models.IntegerField()
+    season_type = models.IntegerField()
+    position = models.CharField(max_length=50, blank=True, default="")
+
+    games = models.IntegerField(default=0)
+
+    pass_attempts = models.IntegerField(default=0)
+    completions = models.IntegerField(default=0)
+    pass_yards = models.IntegerField(default=0)
+    pass_touchdowns = models.IntegerField(default=0)
+    interceptions = models.IntegerField(default=0)
+    sacks = models.IntegerField(default=0)
+
+    rush_attempts = models.IntegerField(default=0)
+    rush_yards = models.IntegerField(default=0)
+    rush_touchdowns = models.IntegerField(default=0)
+
+    receptions = models.IntegerField(default=0)
+    rec_targets = models.IntegerField(default=0)
+    rec_yards = models.IntegerField(default=0)
+    rec_touchdowns = models.IntegerField(default=0)
+
+    fumbles_lost = models.IntegerField(default=0)
+
+    pass_yards_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    pass_yards_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    pass_yards_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    rush_attempts_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rush_attempts_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rush_attempts_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    rush_yards_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rush_yards_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rush_yards_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    rec_targets_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rec_targets_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rec_targets_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    receptions_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    receptions_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    receptions_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    rec_yards_per_game = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rec_yards_last3 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+    rec_yards_last5 = models.DecimalField(max_digits=6, decimal_places=2, default=0.0)
+
+    # Share of the team's targets/carries in the games the player played
+    target_share = models.DecimalField(max_digits=5, decimal_places=4, default=0.0)
+    carry_share = models.DecimalField(max_digits=5, decimal_places=4, default=0.0)
+
+    # {scoring profile: points} over the season and per game
+    fantasy_points = models.JSONField(default=dict, blank=True)
+    fantasy_points_per_game = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f"{self.player.full_name} {self.season_year} ({self.season_type})"
+
+    class Meta:
+        unique_together = ('player', 'season_year', 'season_type')
+        indexes = [
+            models.Index(fields=['season_year', 'season_type', 'position'], name='season_aggregate_idx'),
+        ]
+        ordering = ['-games', 'id']
+
+class IngestFingerprint(models.Model):
+    """
+    Hash of the last values the pipeline wrote for one row, so a sync
+    can skip rows whose upstream data has not changed.
+    """
+    model = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.model} {self.key}"
+
+    class Meta:
+        unique_together = ('model', 'key')
@@ -1,5 +1,130 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+import binascii
+
+# Below this estimate the exact COUNT(*) is cheap enough to run
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+def approximate_count(queryset) -> int:
+    """
+    Row estimate from the Postgres planner, falling back to COUNT(*) for
+    small results and other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            estimate = int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+        if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count()
+
+class GamelogKeysetPagination(BasePagination):
+    """
+    Newest games first, keyed on (game_date, id) so every page is one
+    index range scan no matter how deep it is. The first page also
+    carries an approximate total.
+    """
+    page_size = 50
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count = None
+
+        # Rows ingested before game_date existed are picked up by backfill_gamelogs
+        queryset = queryset.filter(game_date__isnull=False)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            game_date, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(game_date__lt=game_date) | Q(game_date=game_date, id__lt=pk))
+        else:
+            self.count = approximate_count(queryset)
+
+        page = list(queryset.order_by('-game_date', '-id')[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Model instances, or values() rows on the fast list path
+        game_date, pk = (last['game_date'], last['pk']) if isinstance(last, dict) else (last.game_date, last.pk)
+        # Relative, the cached page is shared by every host it is served on
+        url = self.request.get_full_path()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(game_date, pk))
+
+    def encode_cursor(self, game_date, pk) -> str:
+        return urlsafe_b64encode(f"{game_date.isoformat()}|{pk}".encode()).decode()
+
+    def decode_cursor(self, cursor: str):
+        try:
+            game_date, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+            game_date = parse_datetime(game_date)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if game_date is None:
+            raise NotFound("Invalid cursor")
+        return game_date, pk
+
+class RelativePageNumberPagination(PageNumberPagination):
+    """
+    Page links as path and query only, since the cached response is
+    shared by every host it is served on.
+    """
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return replace_query_param(self.request.get_full_path(), self.page_query_param, self.page.next_page_number())
+
+    def get_previous_link(self):
+        if not self.page.has_previous():
+            return None
+        url = self.request.get_full_path()
+        page_number = self.page.previous_page_number()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
 
 # need rename
-class PlayerGameStatsMatchupsPagination(PageNumberPagination):
-    page_size = 50
\ No newline at end of file
+class PlayerGameStatsMatchupsPagination(RelativePageNumberPagination):
+    """
+    Page numbers by default, keyset paging as soon as the request has a
+    ?cursor= parameter (empty for the first page).
+    """
+    page_size = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if GamelogKeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = GamelogKeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+class LeaderboardPagination(RelativePageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,83 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers
+
+def plan_queryset(queryset: QuerySet, serializer_class) -> QuerySet:
+    """
+    Adds the select_related/prefetch_related a serializer needs, read off
+    its nested serializers and dotted sources, so rendering never goes
+    back to the database row by row.
+
+    Single-valued relations are joined, many-valued ones are prefetched
+    with a queryset planned the same way. A Prefetch already on the
+    queryset (e.g. from a filter) keeps its queryset and gets planned too.
+    """
+    select, prefetch = [], {}
+    walk(serializer_class(), queryset.model, '', select, prefetch)
+
+    existing = {}
+    for lookup in queryset._prefetch_related_lookups:
+        key = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        existing[key] = lookup
+
+    lookups = []
+    for path, child in prefetch.items():
+        current = existing.pop(path, None)
+        if isinstance(current, Prefetch) and current.queryset is not None:
+            planned = plan_queryset(current.queryset, type(child)) if child else current.queryset
+            lookups.append(Prefetch(current.prefetch_through, queryset=planned, to_attr=current.to_attr))
+        elif child:
+            model = child.Meta.model
+            lookups.append(Prefetch(path, queryset=plan_queryset(model._default_manager.all(), type(child))))
+        else:
+            lookups.append(path)
+    lookups.extend(existing.values())
+
+    if select:
+        queryset = queryset.select_related(*select)
+    return queryset.prefetch_related(None).prefetch_related(*lookups)
+
+def walk(serializer, model, prefix: str, select: list, prefetch: dict) -> None:
+    for field in serializer.fields.values():
+        if isinstance(field, (serializers.SerializerMethodField, serializers.HiddenField)) or field.write_only:
+            continue
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                walk(field, model, prefix, select, prefetch)
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        nested = nested if isinstance(nested, serializers.ModelSerializer) else None
+
+        current, path = model, prefix
+        for i, attr in enumerate(field.source_attrs):
+            try:
+                relation = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not relation.is_relation:
+                break
+
+            path = f"{path}{attr}"
+            last = i == len(field.source_attrs) - 1
+            if relation.many_to_many or relation.one_to_many:
+                prefetch[path] = nested if last else None
+                break
+
+            if last and nested is None:
+                # A plain primary key, the row already holds it
+                break
+
+            select.append(path)
+            current = relation.related_model
+            if last:
+                walk(nested, current, f"{path}__", select, prefetch)
+            path = f"{path}__"
+
+class PlannedQuerysetMixin(object):
+    """
+    Plans every view queryset against the view's serializer once the
+    filters have been applied.
+    """
+    def filter_queryset(self, queryset):
+        return plan_queryset(super().filter_queryset(queryset), self.get_serializer_class())
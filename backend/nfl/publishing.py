@@ -0,0 +1,193 @@
+from collections.abc import Iterable
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from hashlib import sha256
+from time import perf_counter
+from .export import DATASETS, export
+from .models import Game, Player
+from .warming import REGULAR_SEASON, render_internal
+import brotli
+import gzip
+import logging
+import orjson
+import os
+import tempfile
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Served by nginx straight from STATIC_ROOT, see nginx/default.conf
+SNAPSHOT_ROOT = os.getenv('SNAPSHOT_ROOT', os.path.join(settings.STATIC_ROOT, 'snapshots'))
+SNAPSHOT_URL = '/snapshots/'
+MANIFEST = 'manifest.json'
+COMPRESSED = ('.gz', '.br')
+PUBLISH_LOCK = 'lock:publish'
+# Longer than any publish, so a worker that died mid-run cannot hold it for good
+PUBLISH_LOCK_TIMEOUT = 60 * 60
+
+class PublishInProgress(Exception):
+    pass
+
+def snapshot_requests() -> list[tuple[str, str, dict]]:
+    """
+    (file name, path, query) of every API response published as a file:
+    teams, team stats and ranks, each week's events of the latest season
+    and the full gamelogs of every player who played in it.
+    """
+    requests = [
+        ('teams.json', reverse('nfl:team-list-api-view'), {}),
+        ('team-stats.json', reverse('nfl:team-stats-view'), {}),
+        ('ranks.json', reverse('nfl:team-stats-ranks-view'), {}),
+    ]
+
+    latest = Game.objects.filter(status='Final').order_by('-date').first()
+    if latest is None:
+        return requests
+
+    season = Game.objects.filter(season_year=latest.season_year, season_type=REGULAR_SEASON)
+    for week in season.order_by('week').values_list('week', flat=True).distinct():
+        requests.append((f'events/{week}.json', reverse('nfl:events-view'), {'week': week}))
+
+    players = Player.objects.filter(stats__game__season_year=latest.season_year).distinct().only('pk', 'slug')
+    for player in players:
+        requests.append((f'players/{player.pk}.json', reverse('nfl:player-game-stats-view', args=[player.pk, player.slug]), {}))
+
+    return requests
+
+def snapshot_tables() -> list[tuple[str, Iterable[bytes]]]:
+    """
+    (file name, bytes) of the Parquet tables: team stats, and the latest
+    season's gamelogs streamed from nfl.export.
+    """
+    tables = [('team-stats.parquet', export(DATASETS['team-stats'], 'parquet', DATASETS['team-stats'].filter({})))]
+
+    latest = Game.objects.filter(status='Final').order_by('-date').first()
+    if latest is not None:
+        gamelogs = DATASETS['gamelogs'].filter({'season_year': latest.season_year})
+        tables.append(('gamelogs.parquet', export(DATASETS['gamelogs'], 'parquet', gamelogs)))
+
+    return tables
+
+def write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+def write_compressed(path: str, data: bytes) -> None:
+    """
+    .gz and .br next to the file for nginx to serve as they are.
+    """
+    write_atomic(f'{path}.gz', gzip.compress(data, 9, mtime=0))
+    write_atomic(f'{path}.br', brotli.compress(data, quality=11))
+
+def store(name: str, chunks: Iterable[bytes]) -> str:
+    """
+    Writes one snapshot under a name carrying its content hash and returns
+    that name. Unchanged content lands on the existing file, so clients
+    and nginx keep their cached copy.
+    """
+    os.makedirs(os.path.dirname(os.path.join(SNAPSHOT_ROOT, name)), exist_ok=True)
+    digest = sha256()
+    fd, tmp = tempfile.mkstemp(dir=SNAPSHOT_ROOT)
+    with os.fdopen(fd, 'wb') as f:
+        for chunk in chunks:
+            digest.update(chunk)
+            f.write(chunk)
+
+    stem, ext = os.path.splitext(name)
+    hashed = f'{stem}.{digest.hexdigest()[:16]}{ext}'
+    path = os.path.join(SNAPSHOT_ROOT, hashed)
+    if os.path.exists(path):
+        os.remove(tmp)
+        return hashed
+
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    if ext == '.json':
+        with open(path, 'rb') as f:
+            write_compressed(path, f.read())
+    return hashed
+
+def read_manifest() -> dict:
+    try:
+        with open(os.path.join(SNAPSHOT_ROOT, MANIFEST), 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {'files': {}}
+
+def prune(keep: set[str]) -> int:
+    """
+    Deletes snapshot files no manifest in keep refers to.
+    """
+    removed = 0
+    for directory, _, names in os.walk(SNAPSHOT_ROOT):
+        for name in names:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, SNAPSHOT_ROOT)
+            base = relative[:-3] if relative.endswith(COMPRESSED) else relative
+            if base == MANIFEST or base in keep or name.startswith('tmp'):
+                continue
+            os.remove(path)
+            removed += 1
+    return removed
+
+@contextmanager
+def publish_lock():
+    """
+    Held for a whole publish. Two overlapping runs would each prune the
+    files the other had stored but not yet put in its manifest.
+    """
+    token = uuid.uuid4().hex
+    if not cache.add(PUBLISH_LOCK, token, PUBLISH_LOCK_TIMEOUT):
+        raise PublishInProgress("Another snapshot publish is running")
+    try:
+        yield
+    finally:
+        if cache.get(PUBLISH_LOCK) == token:
+            cache.delete(PUBLISH_LOCK)
+
+def publish_snapshots() -> dict:
+    """
+    Renders every snapshot, then swaps in a manifest of
+    {file name: content-hashed URL}. Files of the previous manifest are
+    kept one more round for clients still holding it. Raises
+    PublishInProgress while another publish runs.
+    """
+    with publish_lock():
+        start = perf_counter()
+        os.makedirs(SNAPSHOT_ROOT, exist_ok=True)
+        previous = read_manifest()
+        files = {}
+
+        for name, path, query in snapshot_requests():
+            try:
+                response = render_internal(path, query)
+            except Exception as e:
+                logger.error(f"SNAPSHOT FAILED: {path} {query} ({e})")
+                continue
+            if response.status_code != 200:
+                logger.warning(f"SNAPSHOT SKIPPED: {path} {query} returned {response.status_code}")
+                continue
+            files[name] = store(name, [response.content])
+
+        for name, chunks in snapshot_tables():
+            files[name] = store(name, chunks)
+
+        manifest = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'files': {name: SNAPSHOT_URL + hashed for name, hashed in files.items()},
+        }
+        data = orjson.dumps(manifest)
+        write_compressed(os.path.join(SNAPSHOT_ROOT, MANIFEST), data)
+        write_atomic(os.path.join(SNAPSHOT_ROOT, MANIFEST), data)
+
+        keep = {url.removeprefix(SNAPSHOT_URL) for url in [*manifest['files'].values(), *previous['files'].values()]}
+        removed = prune(keep)
+        logger.info(f"SNAPSHOTS: published {len(files)} files, removed {removed} in {perf_counter() - start:.2f}s")
+        return manifest
@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from django.db.models import Count, F
+from heapq import nsmallest
+from threading import Lock
+from .caching import tag_versions
+from .models import Player
+import logging
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+def words(text: str) -> list[str]:
+    """
+    Lowercase, accent-free words of a name or query. Apostrophes and
+    periods are dropped and hyphenated parts joined, so "Ja'Marr" is
+    "jamarr" and "Amon-Ra St. Brown" is ["amonra", "st", "brown"].
+    """
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().casefold()
+    return [''.join(parts) for word in re.sub(r"['.]", '', text).split() if (parts := re.findall(r'[a-z0-9]+', word))]
+
+def tokens(text: str) -> set[str]:
+    """
+    What a name can be found by: each word, and each part of a
+    hyphenated word on its own ("amon", "ra").
+    """
+    found = set(words(text))
+    for word in text.split():
+        found.update(words(word.replace('-', ' ')))
+    return found
+
+class PlayerIndex(object):
+    """
+    Every player's name tokens in one sorted list, so a term's matches are
+    a bisect and a short scan. Each query term must prefix some token of
+    the name; names that start with the whole query come first, then
+    players with more games.
+    """
+    def __init__(self, players: list[dict], version: str = ''):
+        self.version = version
+        self.results = [{key: player[key] for key in ('id', 'slug', 'fullName', 'position', 'team')} for player in players]
+        self.names = [' '.join(words(player['fullName'])) for player in players]
+        self.ranks = [-player['games'] for player in players]
+
+        entries = sorted((token, i) for i, player in enumerate(players) for token in tokens(player['fullName']))
+        self.keys = [token for token, _ in entries]
+        self.ids = [i for _, i in entries]
+
+    def prefixed(self, term: str) -> set[int]:
+        found = set()
+        for position in range(bisect_left(self.keys, term), len(self.keys)):
+            if not self.keys[position].startswith(term):
+                break
+            found.add(self.ids[position])
+        return found
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+        terms = words(query)
+        if not terms:
+            matches = range(len(self.results))
+        else:
+            # Longest terms first, they narrow the candidates the most
+            terms_by_length = sorted(set(terms), key=len, reverse=True)
+            matches = self.prefixed(terms_by_length[0])
+            for term in terms_by_length[1:]:
+                if not matches:
+                    break
+                matches &= self.prefixed(term)
+
+        key = ' '.join(terms)
+        best = nsmallest(limit, matches, key=lambda i: (not self.names[i].startswith(key), self.ranks[i], self.names[i]))
+        return [self.results[i] for i in best]
+
+    @classmethod
+    def build(cls, version: str = '') -> 'PlayerIndex':
+        players = list(
+            Player.objects.order_by()
+            .annotate(fullName=F('full_name'), team_abbreviation=F('team__abbreviation'), games=Count('stats'))
+            .values('id', 'slug', 'fullName', 'position', 'team_abbreviation', 'games')
+        )
+        for player in players:
+            player['team'] = player.pop('team_abbreviation')
+        logger.info(f"PLAYER_INDEX: built from {len(players)} players")
+        return cls(players, version)
+
+_index: PlayerIndex | None = None
+_lock = Lock()
+
+def player_index() -> PlayerIndex:
+    """
+    This process's index, rebuilt once the 'players' cache tag moves on,
+    which every ingest that writes players or teams does.
+    """
+    global _index
+    version = tag_versions(['players'])['players']
+    if _index is None or _index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = PlayerIndex.build(version)
+    return _index
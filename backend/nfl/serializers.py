@@ -86,10 +86,6 @@ class PlayerStatsSerializer(serializers.ModelSerializer):
 #######################################################################################################################
 
 class PlayerSerializer(serializers.ModelSerializer):
-    """
-    For the autocomplete search bar.
-
-    """
     team = TeamSerializer(read_only=True)
     fullName = serializers.CharField(source='full_name')
 
@@ -213,6 +209,34 @@ class TeamRankSnapshotSerializer(serializers.ModelSerializer):
         model = TeamRankSnapshot
         exclude = ['id', 'team', 'updated_at']
 
+class TeamWeeklySnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TeamWeeklySnapshot
+        exclude = ['id', 'team', 'created_at']
+
+class TeamRankDeltaSerializer(serializers.ModelSerializer):
+    """
+    A team's ranks for one week next to the previous snapshot's. A
+    positive change means the team moved up.
+    """
+    abbreviation = serializers.CharField(source='team.abbreviation')
+    ranks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TeamWeeklySnapshot
+        fields = ['abbreviation', 'season_year', 'season_type', 'week', 'ranks']
+
+    def get_ranks(self, obj):
+        ranks = {}
+        for field in RANK_FIELDS:
+            current, previous = getattr(obj, field), getattr(obj, f'previous_{field}')
+            ranks[field] = {
+                'rank': current,
+                'previous': previous,
+                'change': previous - current if previous and current else None,
+            }
+        return ranks
+
 class TeamRanksSerializer(serializers.ModelSerializer):
     rank_snapshot = TeamRankSnapshotSerializer(read_only=True)
 
@@ -234,4 +258,31 @@ class PlayerGameStatsMatchupsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PlayerGameStats
-        fields = ("__all__")
\ No newline at end of file
+        fields = ("__all__")
+
+class DefenseVsPositionSerializer(serializers.ModelSerializer):
+    """
+    One cell of the defense vs position matrix, totals next to their
+    per-game averages.
+    """
+    opponent = serializers.CharField(source='opponent.abbreviation')
+    per_game = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DefenseVsPosition
+        fields = ['season_year', 'season_type', 'opponent', 'position', 'location', 'games', *STAT_TOTALS, 'per_game', 'yards_per_game', 'rank']
+
+    def get_per_game(self, obj):
+        return {name: round(getattr(obj, name) / obj.games, 2) if obj.games else 0 for name in STAT_TOTALS}
+
+class PlayerSeasonAggregateSerializer(serializers.ModelSerializer):
+    """
+    One leaderboard row, a player's precomputed season.
+    """
+    fullName = serializers.CharField(source='player.full_name')
+    slug = serializers.CharField(source='player.slug')
+    team = serializers.CharField(source='team.abbreviation', default=None)
+
+    class Meta:
+        model = PlayerSeasonAggregate
+        exclude = ['id']
@@ -0,0 +1,173 @@
+from collections.abc import Iterable
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Avg, Count, F, RowRange, Sum, Window
+from nfl import models
+from .upsert import UpsertResult, bulk_upsert, fingerprint_key
+
+DEFENSE_KEY_FIELDS = ['season_year', 'season_type', 'opponent_id', 'position', 'location']
+SEASON_KEY_FIELDS = ['player_id', 'season_year', 'season_type']
+YARDS = ['pass_yards', 'rush_yards', 'rec_yards']
+ROLLING_GAMES = [3, 5]
+
+def build_defense_vs_position(seasons: Iterable[int] | None = None) -> UpsertResult:
+    """
+    Rebuilds DefenseVsPosition for the given seasons (all of them by
+    default) from one grouped query over the gamelogs.
+
+    Home and away come straight from the grouping and are added together
+    for 'all'; a defense plays each game on one side, so the game counts
+    add up too. Defenses are ranked within each season, position and
+    location by yards allowed per game. Cells of the rebuilt seasons the
+    gamelogs no longer produce, e.g. after a row moved to another team,
+    are deleted.
+    """
+    stats = models.PlayerGameStats.objects.filter(
+        opponent__isnull=False,
+        player__position__in=models.SKILL_POSITIONS,
+    )
+    cells = models.DefenseVsPosition.objects.all()
+    if seasons is not None:
+        seasons = list(seasons)
+        stats = stats.filter(game__season_year__in=seasons)
+        cells = cells.filter(season_year__in=seasons)
+
+    grouped = (
+        stats.order_by()
+        .values('game__season_year', 'game__season_type', 'opponent', 'player__position', 'is_home')
+        .annotate(games=Count('game', distinct=True), **{name: Sum(name) for name in models.STAT_TOTALS})
+    )
+
+    rows: dict[tuple, dict] = {}
+    for group in grouped:
+        for location in ('all', 'home' if group['is_home'] else 'away'):
+            key = (group['game__season_year'], group['game__season_type'], group['opponent'], group['player__position'], location)
+            row = rows.setdefault(key, {
+                **dict(zip(DEFENSE_KEY_FIELDS, key)),
+                'games': 0,
+                **{name: 0 for name in models.STAT_TOTALS},
+            })
+            row['games'] += group['games']
+            for name in models.STAT_TOTALS:
+                row[name] += group[name] or 0
+
+    for row in rows.values():
+        row['yards_per_game'] = (Decimal(sum(row[name] for name in YARDS)) / row['games']).quantize(Decimal('0.01'))
+    rank(rows.values())
+
+    with transaction.atomic():
+        result = bulk_upsert(models.DefenseVsPosition, list(rows.values()), unique_fields=DEFENSE_KEY_FIELDS, label="DEFENSE_VS_POSITION")
+
+        stale = {}
+        for cell in cells.only(*DEFENSE_KEY_FIELDS):
+            key = tuple(getattr(cell, name) for name in DEFENSE_KEY_FIELDS)
+            if key not in rows:
+                stale[key] = cell
+
+        if stale:
+            models.DefenseVsPosition.objects.filter(pk__in=[cell.pk for cell in stale.values()]).delete()
+            models.IngestFingerprint.objects.filter(
+                model=models.DefenseVsPosition._meta.label,
+                key__in=[fingerprint_key(key) for key in stale],
+            ).delete()
+            # Deleted cells evict the cached matrix like written ones
+            result.objects.extend(stale.values())
+
+    return result
+
+def rank(rows: Iterable[dict]) -> None:
+    """
+    Dense rank by yards per game within each season, position and
+    location, fewest yards first.
+    """
+    partitions: dict[tuple, list[dict]] = {}
+    for row in rows:
+        partitions.setdefault((row['season_year'], row['season_type'], row['position'], row['location']), []).append(row)
+
+    for partition in partitions.values():
+        values = sorted({row['yards_per_game'] for row in partition})
+        ranks = {value: i for i, value in enumerate(values, start=1)}
+        for row in partition:
+            row['rank'] = ranks[row['yards_per_game']]
+
+def build_player_season_aggregates(seasons: Iterable[int] | None = None) -> UpsertResult:
+    """
+    Rebuilds PlayerSeasonAggregate for the given seasons (all of them by
+    default) in one pass over their gamelogs.
+
+    Window functions add the team's targets and carries in each game and
+    every stat's mean over the player's last 3 and 5 games up to that row;
+    rows come oldest first, so the values a player ends on are the ones
+    kept. Totals, per-game averages and each profile's fantasy points
+    are summed alongside.
+    """
+    stats = models.PlayerGameStats.objects.all()
+    if seasons is not None:
+        stats = stats.filter(game__season_year__in=list(seasons))
+
+    season = [F('player'), F('game__season_year'), F('game__season_type')]
+    team_game = [F('game'), F('team_at_game_time')]
+    oldest_first = [F('game_date').asc(), F('id').asc()]
+    rolling = {
+        f'{name}_last{n}': Window(Avg(name), partition_by=season, order_by=oldest_first, frame=RowRange(start=1 - n, end=0))
+        for name in models.ROLLING_STATS for n in ROLLING_GAMES
+    }
+
+    rows = (
+        stats.order_by('game_date', 'id')
+        .annotate(
+            team_targets=Window(Sum('rec_targets'), partition_by=team_game),
+            team_carries=Window(Sum('rush_attempts'), partition_by=team_game),
+            **rolling,
+        )
+        .values(
+            'player', 'player__position', 'team_at_game_time', 'game__season_year', 'game__season_type',
+            'team_targets', 'team_carries', 'fantasy_points', *models.STAT_TOTALS, *rolling,
+        )
+    )
+
+    aggregates: dict[tuple, dict] = {}
+    # (targets, team targets, carries, team carries) over games with a known team
+    shares: dict[tuple, list[int]] = {}
+    for row in rows.iterator(chunk_size=2000):
+        key = (row['player'], row['game__season_year'], row['game__season_type'])
+        aggregate = aggregates.get(key)
+        if aggregate is None:
+            aggregate = aggregates[key] = {
+                **dict(zip(SEASON_KEY_FIELDS, key)),
+                'position': row['player__position'],
+                'games': 0,
+                **{name: 0 for name in models.STAT_TOTALS},
+                'fantasy_points': {},
+            }
+            shares[key] = [0, 0, 0, 0]
+
+        aggregate['games'] += 1
+        aggregate['team_id'] = row['team_at_game_time']
+        for name in models.STAT_TOTALS:
+            aggregate[name] += row[name]
+        for name in rolling:
+            aggregate[name] = places(row[name], '0.01')
+        for profile, points in (row['fantasy_points'] or {}).items():
+            aggregate['fantasy_points'][profile] = aggregate['fantasy_points'].get(profile, 0) + points
+
+        if row['team_at_game_time'] is not None:
+            share = shares[key]
+            share[0] += row['rec_targets']
+            share[1] += row['team_targets'] or 0
+            share[2] += row['rush_attempts']
+            share[3] += row['team_carries'] or 0
+
+    for key, aggregate in aggregates.items():
+        for name in models.ROLLING_STATS:
+            aggregate[f'{name}_per_game'] = places(aggregate[name] / aggregate['games'], '0.01')
+        aggregate['fantasy_points'] = {profile: round(points, 2) for profile, points in aggregate['fantasy_points'].items()}
+        aggregate['fantasy_points_per_game'] = {profile: round(points / aggregate['games'], 2) for profile, points in aggregate['fantasy_points'].items()}
+        targets, team_targets, carries, team_carries = shares[key]
+        aggregate['target_share'] = places(targets / team_targets if team_targets else 0, '0.0001')
+        aggregate['carry_share'] = places(carries / team_carries if team_carries else 0, '0.0001')
+
+    return bulk_upsert(models.PlayerSeasonAggregate, list(aggregates.values()), unique_fields=SEASON_KEY_FIELDS, label="PLAYER_SEASON_AGGREGATE")
+
+def places(value, exponent: str) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal(exponent))
@@ -0,0 +1,138 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, ClientError, ClientResponseError
+from asyncio import Semaphore, sleep
+from typing import Any
+from urllib.parse import urlsplit
+from .http_cache import HttpCache
+import json
+import logging
+import os
+import random
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv('FETCH_MAX_CONNECTIONS', 64))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv('FETCH_MAX_CONNECTIONS_PER_HOST', 16))
+TIMEOUT = float(os.getenv('FETCH_TIMEOUT', 30))
+MAX_RETRIES = int(os.getenv('FETCH_MAX_RETRIES', 4))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class FetchError(Exception):
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+class Fetcher(object):
+    """
+    Shared HTTP client for the pipeline.
+
+    Caps open connections overall and per host, and retries timeouts,
+    connection errors, 429 and 5xx responses with jittered exponential
+    backoff. Anything still failing is raised as FetchError so callers
+    can record it instead of aborting the whole run.
+
+    With an HttpCache every request is conditional; URLs answered with
+    a 304 or with a body identical to the cached one are collected in
+    self.unchanged so endpoints can skip their transform.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        timeout: float = TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE,
+        cache: HttpCache | None = None,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.cache = cache or HttpCache(None)
+        self.unchanged: set[str] = set()
+        self.session: ClientSession | None = None
+        self.semaphores: dict[str, Semaphore] = {}
+
+    async def __aenter__(self):
+        self.session = ClientSession(
+            connector=TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections_per_host),
+            timeout=ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def get_json(self, url: str) -> Any:
+        return await self.request(url, as_json=True)
+
+    async def get_text(self, url: str) -> str:
+        return await self.request(url, as_json=False)
+
+    def is_unchanged(self, url: str) -> bool:
+        return url in self.unchanged
+
+    async def request(self, url: str, as_json: bool) -> Any:
+        body = await self.fetch(url)
+        if not as_json:
+            return body
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise FetchError(url, "invalid JSON") from e
+
+    async def fetch(self, url: str) -> str:
+        semaphore = self.semaphores.setdefault(urlsplit(url).netloc, Semaphore(self.max_connections_per_host))
+        entry = self.cache.lookup(url)
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    async with self.session.get(url, headers=self.cache.validators(entry)) as response:
+                        if response.status == 304:
+                            # Only conditional requests can be answered with a
+                            # 304, and those are only sent with a cached entry
+                            if entry is None:
+                                raise FetchError(url, "HTTP 304 to a request with no cached response")
+                            self.unchanged.add(url)
+                            return entry['body']
+
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await response.text()
+                            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                            if self.cache.stage(url, entry, etag, last_modified, body):
+                                self.unchanged.add(url)
+                            return body
+
+                        reason = f"HTTP {response.status}"
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except ClientResponseError as e:
+                raise FetchError(url, f"HTTP {e.status}") from e
+            except (ClientError, TimeoutError) as e:
+                reason = repr(e)
+
+            if attempt == self.max_retries:
+                break
+
+            delay = retry_after if retry_after is not None else self.backoff(attempt)
+            logger.warning(f"RETRY {attempt + 1}/{self.max_retries}: {url} ({reason}), sleeping {delay:.2f}s")
+            await sleep(delay)
+
+        raise FetchError(url, reason)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(BACKOFF_MAX, self.backoff_base * 2 ** attempt))
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return min(BACKOFF_MAX, max(0.0, float(value)))
+    except ValueError:
+        return None
@@ -0,0 +1,99 @@
+from hashlib import sha256
+from pathlib import Path
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class HttpCache(object):
+    """
+    On-disk response cache keyed by URL.
+
+    Each entry keeps the ETag, Last-Modified and a hash of the body so
+    the next sync can send a conditional GET and tell whether anything
+    changed. New entries are only staged while fetching; flush() writes
+    them once the sync that consumed them has committed, so a failed
+    run never marks data as already ingested.
+    """
+
+    def __init__(self, directory: str | None):
+        self.directory = Path(directory) if directory else None
+        self.pending: dict[str, dict] = {}
+        self.forgotten: set[str] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def path(self, url: str, suffix: str) -> Path:
+        return self.directory / f"{sha256(url.encode()).hexdigest()}{suffix}"
+
+    def lookup(self, url: str) -> dict | None:
+        if not self.enabled:
+            return None
+        try:
+            entry = json.loads(self.path(url, '.json').read_text())
+            entry['body'] = self.path(url, '.body').read_text(encoding='utf-8')
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def validators(self, entry: dict | None) -> dict:
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def stage(self, url: str, entry: dict | None, etag: str | None, last_modified: str | None, body: str) -> bool:
+        """
+        Queues the new response for flush() and returns True when its
+        body hash matches the stored one.
+        """
+        body_hash = sha256(body.encode('utf-8')).hexdigest()
+        if self.enabled:
+            self.pending[url] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'body_hash': body_hash,
+                'body': body,
+            }
+        return entry is not None and entry.get('body_hash') == body_hash
+
+    def forget(self, url: str) -> None:
+        """
+        Drops the staged response and, on flush(), the stored one, for a
+        URL whose data was only partly ingested, so the next sync fetches
+        it in full instead of skipping it as unchanged.
+        """
+        self.pending.pop(url, None)
+        self.forgotten.add(url)
+
+    def flush(self) -> None:
+        if not self.enabled:
+            return
+
+        for url in self.forgotten:
+            for suffix in ('.json', '.body'):
+                self.path(url, suffix).unlink(missing_ok=True)
+        self.forgotten = set()
+
+        if not self.pending:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for url, entry in self.pending.items():
+            body = entry.pop('body')
+            self.write(self.path(url, '.body'), body)
+            self.write(self.path(url, '.json'), json.dumps(entry))
+
+        logger.info(f"HTTP CACHE: stored {len(self.pending)} responses")
+        self.pending = {}
+
+    def write(self, path: Path, content: str) -> None:
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        tmp.write_text(content, encoding='utf-8')
+        os.replace(tmp, path)
@@ -1,23 +1,39 @@
 from abc import ABC, abstractmethod
-from aiohttp import ClientSession
-from asyncio import TaskGroup, run
+from asyncio import TaskGroup, get_running_loop, run, sleep
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any
 import pandas as pd
 import string
-from .table import Table
+from .table import parse_table
+from .upsert import BATCH_SIZE, bulk_upsert
+from .aggregates import build_defense_vs_position, build_player_season_aggregates
+from .fetch import Fetcher, FetchError
+from .http_cache import HttpCache
 from dotenv import load_dotenv
 import logging
+import multiprocessing
 import os
 from nfl import models
+from nfl.caching import changed_tags, invalidate
+from nfl.fantasy import SCORED_STATS, fantasy_points
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from datetime import datetime
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 print(f"DEBUG: My logger name is: {logger.name}")
 
+FOLLOW_UP_DELAY = float(os.getenv('FETCH_FOLLOW_UP_DELAY', 5))
+PARSE_EXECUTOR = os.getenv('PARSE_EXECUTOR', 'process')
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+
 class Endpoint(ABC):
     base_url = None
-    
+    depends_on = None
+
     @abstractmethod
     async def send_api_request(self, *args, **kwargs) -> Any:
         pass
@@ -35,12 +51,54 @@ class EndpointGenerator(Endpoint):
     async def spawn_tasks(self, *args, **kwargs) -> Any:
         pass
 
+    async def gather(self, keys: list, fetch: Callable[[Any], Awaitable[Any]]) -> dict:
+        """
+        Fetches every key concurrently and returns {key: response}.
+
+        Keys that still fail after the fetcher's own retries get one
+        follow-up pass; whatever fails again is left in self.failed and
+        the run carries on with the rest.
+        """
+        results, failed = await self.fetch_all(keys, fetch)
+
+        if failed:
+            logger.warning(f"FOLLOW-UP: {type(self).__name__} retrying {len(failed)} failed requests")
+            await sleep(FOLLOW_UP_DELAY)
+            retried, failed = await self.fetch_all(failed, fetch)
+            results.update(retried)
+
+        self.failed = failed
+        if failed:
+            logger.error(f"FAILED: {type(self).__name__} gave up on {len(failed)} ids: {failed}")
+        return results
+
+    async def fetch_all(self, keys: list, fetch: Callable[[Any], Awaitable[Any]]) -> tuple[dict, list]:
+        results, failed = {}, []
+
+        async def run_one(key):
+            try:
+                results[key] = await fetch(key)
+            except FetchError as e:
+                logger.warning(f"FETCH FAILED: {e}")
+                failed.append(key)
+
+        async with TaskGroup() as tg:
+            for key in keys:
+                tg.create_task(run_one(key))
+        return results, failed
+
 class WebScraping(Endpoint):
     source = None
+    unchanged = False
 
-    @abstractmethod
-    async def send_api_request(self, *args, **kwargs) -> Any:
-        pass
+    async def send_api_request(self, session: Fetcher, executor: Executor | None = None) -> None:
+        html = await session.get_text(self.base_url)
+        if session.is_unchanged(self.base_url):
+            logger.info(f"UNCHANGED: {type(self).__name__}, skipping parse and transform")
+            self.unchanged = True
+            return
+
+        self.raw = await get_running_loop().run_in_executor(executor, parse_table, html, self.source)
 
 class Teams(Endpoint):
     base_url = os.getenv('TEAMS_URL')
@@ -49,13 +107,18 @@ class Teams(Endpoint):
         self.team_ids: list = []
         self.res: list = []
         self.raw = None
+        self.unchanged = False
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=Teams.base_url) as response:
-            self.raw = await response.json()
-            return self.helper()
+    async def send_api_request(self, session: Fetcher):
+        self.raw = await session.get_json(Teams.base_url)
+        self.unchanged = session.is_unchanged(Teams.base_url)
+        return self.helper()
     
     def transform(self) -> None:
+        if self.unchanged:
+            logger.info("UNCHANGED: Teams, skipping transform")
+            return
+
         for conference in self.raw["content"]["standings"]["groups"]:
             for division in conference["groups"]:
                 for team in division["standings"]["entries"]:
@@ -72,13 +135,7 @@ class Teams(Endpoint):
 
                     self.res.append(defaults)
 
-                    obj, created = models.Team.objects.update_or_create(
-                        abbreviation=defaults['abbreviation'],
-                        defaults=defaults
-                    )
-
-                    if created: logger.info(f"CREATED: TEAM {obj.full_name.upper()}")
-                    else: logger.debug(f"UPDATED: TEAM {obj.full_name.upper()}")
+        self.result = bulk_upsert(models.Team, self.res, unique_fields=['abbreviation'], label="TEAM")
     
     def helper(self) -> None:
         for conference in self.raw["content"]["standings"]["groups"]:
@@ -93,47 +150,46 @@ class Teams(Endpoint):
 class Odds(Endpoint):
     base_url = os.getenv('ODDS_URL')
 
-    async def send_api_request(self, session: ClientSession) -> None:
-        async with session.get(url=Odds.base_url) as response:
-            data = await response.json()
-            
-            for week in data["lines"][:1]:
-                print(week["displayValue"])
-                for event in week['events']:
-                    for comp in event['competitions']:
-                        print(comp)
+    async def send_api_request(self, session: Fetcher) -> None:
+        data = await session.get_json(Odds.base_url)
+
+        for week in data["lines"][:1]:
+            print(week["displayValue"])
+            for event in week['events']:
+                for comp in event['competitions']:
+                    print(comp)
 
 class Players(EndpointGenerator):
     base_url = os.getenv('PLAYERS_URL')
+    depends_on = Teams
 
     def __init__(self):
         self.res = []
-        self.raw = []
+        self.raw = {}
         self.util = []
         self.player_ids = []
+        self.failed = []
+        self.unchanged = set()
         
-    async def spawn_tasks(self, session: ClientSession, team_ids: list[str]) -> None:
-        async with TaskGroup() as tg:
-            tasks = [
-                tg.create_task(
-                    self.send_api_request(
-                        session=session,
-                        team_id=team_id,
-                    )
-                ) for team_id in team_ids
-            ]
-        self.raw = [t.result() for t in tasks]
+    async def spawn_tasks(self, session: Fetcher, team_ids: list[str]) -> None:
+        self.raw = await self.gather(
+            team_ids,
+            lambda team_id: self.send_api_request(session=session, team_id=team_id)
+        )
         return self.helper()
 
-    async def send_api_request(self, session: ClientSession, team_id: str) -> None:
-        async with session.get(url=self.base_url.format(team_id=team_id)) as response:
-            return await response.json()
+    async def send_api_request(self, session: Fetcher, team_id: str) -> None:
+        url = self.base_url.format(team_id=team_id)
+        data = await session.get_json(url)
+        if session.is_unchanged(url):
+            self.unchanged.add(team_id)
+        return data
 
     def transform(self) -> None:
         positions = {'QB', 'WR', 'RB', 'TE'}
 
         team_abbreviatons = {team.abbreviation: team for team in models.Team.objects.all()}
-        for team in self.raw:
+        for team_id, team in self.raw.items():
             for position in team["athletes"]:
                 if position["position"] == "offense":
                     for athlete in position["items"]:
@@ -160,21 +216,14 @@ class Players(EndpointGenerator):
                                 "full_name": str(athlete.get('displayName', '')),
                             }
                             self.util.append(util_map)
-                            self.res.append(defaults)
-
-                            obj, created = models.Player.objects.update_or_create(
-                                full_name=str(athlete.get('displayName', '')),
-                                defaults=defaults
-                            )
+                            if team_id not in self.unchanged:
+                                self.res.append(defaults)
 
-                            if created:
-                                logger.info(f"CREATED: PLAYER {obj.full_name.upper()}")
-                            else:
-                                logger.debug(f"UPDATED: PLAYER {obj.full_name.upper()}")
+        self.result = bulk_upsert(models.Player, self.res, unique_fields=['full_name'], label="PLAYER")
 
     def helper(self):
         positions = {'QB', 'WR', 'RB', 'TE'}
-        for team in self.raw:
+        for team in self.raw.values():
             for position in team["athletes"]:
                 if position["position"] == "offense":
                     for athlete in position["items"]:
@@ -187,32 +236,46 @@ class Players(EndpointGenerator):
 
 class PlayerStats(EndpointGenerator):
     base_url = os.getenv('STATS_URL')
+    depends_on = Players
 
     def __init__(self):
-        self.raw = []
+        self.raw = {}
         self.res = []
-
-    async def spawn_tasks(self, session, player_ids):
-        async with TaskGroup() as taskgroup:
-            tasks = [
-                taskgroup.create_task(
-                    self.send_api_request(session, player_id)
-            ) for player_id in player_ids
-        ]
-        self.raw = [t.result() for t in tasks]
-
-    async def send_api_request(self, session: ClientSession, player_id: str):
-        async with session.get(PlayerStats.base_url.format(player_id=player_id)) as response:
-            return await response.json()
+        self.failed = []
+        self.unchanged = set()
+        self.event_teams = {}
+        # Players whose gamelog could not be fully written, e.g. a game not ingested yet
+        self.incomplete = set()
+
+    async def spawn_tasks(self, session: Fetcher, player_ids: list[str]):
+        self.raw = await self.gather(
+            player_ids,
+            lambda player_id: self.send_api_request(session, player_id)
+        )
+
+    async def send_api_request(self, session: Fetcher, player_id: str):
+        url = PlayerStats.base_url.format(player_id=player_id)
+        data = await session.get_json(url)
+        if session.is_unchanged(url):
+            self.unchanged.add(player_id)
+        return data
     
     def transform(self, util: list) -> None:
         games_map = {game.event: game for game in models.Game.objects.all()}
         players_map = {player.full_name: player for player in models.Player.objects.all()}
+        teams_map = dict(models.Team.objects.values_list('abbreviation', 'pk'))
+        self.event_teams = {}
+        self.incomplete = set()
         
-        for player_data, u in zip(self.raw, util):
+        for u in util:
+            player_data = self.raw.get(u['player_id'])
+            if player_data is None or u['player_id'] in self.unchanged:
+                continue
+
             player_instance = players_map.get(str(u['full_name']))
             if not player_instance:
                 logger.warning(f"Player not found in DB: {u['full_name']}")
+                self.incomplete.add(u['player_id'])
                 continue
 
             for season_type in player_data.get("seasonTypes", []):
@@ -228,7 +291,12 @@ class PlayerStats(EndpointGenerator):
 
                         if not game_instance:
                             logger.debug(f"Game ID {event_id} not found in DB. Skipping.")
+                            self.incomplete.add(u['player_id'])
                             continue
+
+                        self.event_teams[(player_instance.pk, game_instance.pk)] = self.event_team(
+                            player_data.get('events', {}).get(event_id), game_instance, teams_map
+                        )
                         
                         stats = {name: stat for name, stat in zip(player_data["names"], event["stats"])}
                         
@@ -265,19 +333,52 @@ class PlayerStats(EndpointGenerator):
                             'fumbles': self.check(value=stats.get('fumbles', 0)),
                             'fumbles_lost': self.check(value=stats.get('fumblesLost', 0)),
                             'games_played': games_played,
+                            'player': player_instance,
+                            'game': game_instance,
+                            'game_date': game_instance.date,
                         }
                         self.res.append(defaults)
 
-                        _, created = models.PlayerGameStats.objects.update_or_create(
-                            player=player_instance,
-                            game=game_instance,
-                            defaults=defaults
-                        )
-
-                        if created:
-                            logger.info(f"CREATED: PLAYER_STATS {str(u['full_name']).upper()}")
-                        else:
-                            logger.debug(f"UPDATED: PLAYER_STATS {str(u['full_name']).upper()}")
+        self.assign_teams()
+        for row, points in zip(self.res, fantasy_points(self.res)):
+            row['fantasy_points'] = points
+        self.result = bulk_upsert(models.PlayerGameStats, self.res, unique_fields=['player', 'game'], label="PLAYER_STATS")
+
+    def event_team(self, event: dict | None, game: models.Game, teams_map: dict[str, int]) -> int | None:
+        """
+        The team the player's gamelog names for one event, by abbreviation
+        or else by the side it was played on ("@" away, "vs" home).
+        """
+        if not event:
+            return None
+        team_id = teams_map.get((event.get('team') or {}).get('abbreviation'))
+        if team_id is None and event.get('atVs') in ('@', 'vs'):
+            team_id = game.awayTeam_id if event['atVs'] == '@' else game.homeTeam_id
+        return team_id
+
+    def assign_teams(self) -> None:
+        """
+        Sets the team each player played for and, from it, the opponent and
+        side of every row. The team named in the upstream event wins, so a
+        traded player's games stay with the team they were played for in
+        whatever order they are ingested; then the team the row was stored
+        with, and only then the player's current team.
+        """
+        stored = {
+            (player_id, game_id): team_id
+            for player_id, game_id, team_id in models.PlayerGameStats.objects
+            .filter(player__in={row['player'].pk for row in self.res}, team_at_game_time__isnull=False)
+            .values_list('player', 'game', 'team_at_game_time')
+        }
+
+        for row in self.res:
+            key = (row['player'].pk, row['game'].pk)
+            for team_id in (self.event_teams.get(key), stored.get(key), row['player'].team_id):
+                opponent_id, is_home = row['game'].matchup(team_id)
+                if is_home is not None:
+                    break
+            row['opponent_id'], row['is_home'] = opponent_id, is_home
+            row['team_at_game_time_id'] = team_id if is_home is not None else None
 
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -295,29 +396,34 @@ class Events(EndpointGenerator):
 
     def __init__(self):
         self.res = []
-        self.raw = []
+        self.raw = {}
+        self.failed = []
+        self.unchanged = set()
 
-    async def spawn_tasks(self, session: ClientSession, upcoming_week: int):
+    async def spawn_tasks(self, session: Fetcher, upcoming_week: int):
         previous_week = upcoming_week - 1
-        async with TaskGroup() as taskgroup:
-            tasks = [
-                taskgroup.create_task(
-                    self.send_api_request(session=session, week=week)
-                ) for week in range(previous_week, upcoming_week + 1)
-            ]
-        self.raw = [t.result() for t in tasks]
-
-    async def send_api_request(self, session: ClientSession, week: int) -> None:
-        async with session.get(Events.base_url.format(week=week)) as response:
-            return await response.json()
+        self.raw = await self.gather(
+            list(range(previous_week, upcoming_week + 1)),
+            lambda week: self.send_api_request(session=session, week=week)
+        )
+
+    async def send_api_request(self, session: Fetcher, week: int) -> None:
+        url = Events.base_url.format(week=week)
+        data = await session.get_json(url)
+        if session.is_unchanged(url):
+            self.unchanged.add(week)
+        return data
         
     def transform(self) -> None:
         if not self.raw:
             return
         
         team_abbreviatons = {team.abbreviation: team for team in models.Team.objects.all()}
-        for data in self.raw:
-            for event in data['events']:
+        for week in sorted(self.raw):
+            if week in self.unchanged:
+                continue
+
+            for event in self.raw[week]['events']:
                 for comp in event['competitions']:
                     for team in comp['competitors']:
                         if team['homeAway'] == 'home':
@@ -345,13 +451,8 @@ class Events(EndpointGenerator):
                 }
                 self.res.append(defaults)
 
-                obj, created = models.Game.objects.update_or_create(
-                    event=defaults['event'],
-                    defaults=defaults
-                )
-
-                if created: logger.info(f"CREATED: EVENT {obj.short_name.upper()} - WEEK {obj.week}")
-                else: logger.debug(f"UPDATED: EVENT {obj.short_name.upper()} - WEEK {obj.week}")
+        self.result = bulk_upsert(models.Game, self.res, unique_fields=['event'], label="EVENT")
+        sync_game_dates([game.pk for game in self.result.objects])
 
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -364,11 +465,6 @@ class OffensePassing(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=OffensePassing.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=OffensePassing.source).parser
-    
     def transform(self):
         if not self.raw:
             return
@@ -395,15 +491,7 @@ class OffensePassing(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamOffensePassingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM OFFENSE_PASSING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM OFFENSE_PASSING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamOffensePassingStats, self.res, unique_fields=['team'], label="TEAM OFFENSE_PASSING")
     
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -416,11 +504,6 @@ class OffenseRushing(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=OffenseRushing.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=OffenseRushing.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -442,15 +525,7 @@ class OffenseRushing(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamOffenseRushingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-            
-            if created:
-                logger.info(f"CREATED: TEAM OFFENSE_RUSHING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM OFFENSE_RUSHING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamOffenseRushingStats, self.res, unique_fields=['team'], label="TEAM OFFENSE_RUSHING")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -463,11 +538,6 @@ class OffenseReceiving(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=OffenseReceiving.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=OffenseReceiving.source).parser
-    
     def transform(self):
         if not self.raw:
             return
@@ -489,15 +559,7 @@ class OffenseReceiving(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamOffenseReceivingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM OFFENSE_RECEIVING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM OFFENSE_RECEIVING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamOffenseReceivingStats, self.res, unique_fields=['team'], label="TEAM OFFENSE_RECEIVING")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -510,11 +572,6 @@ class DefensePassing(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=DefensePassing.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=DefensePassing.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -540,15 +597,7 @@ class DefensePassing(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamDefensePassingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM DEFENSE_PASSING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM DEFENSE_PASSING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamDefensePassingStats, self.res, unique_fields=['team'], label="TEAM DEFENSE_PASSING")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -561,11 +610,6 @@ class DefenseRushing(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=DefenseRushing.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=DefenseRushing.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -588,15 +632,7 @@ class DefenseRushing(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamDefenseRushingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM DEFENSE_RUSHING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM DEFENSE_RUSHING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamDefenseRushingStats, self.res, unique_fields=['team'], label="TEAM DEFENSE_RUSHING")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -609,11 +645,6 @@ class DefenseReceiving(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=DefenseReceiving.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=DefenseReceiving.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -636,15 +667,7 @@ class DefenseReceiving(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamDefenseReceivingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM DEFENSE_RECEIVING {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM DEFENSE_RECEIVING {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamDefenseReceivingStats, self.res, unique_fields=['team'], label="TEAM DEFENSE_RECEIVING")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -657,11 +680,6 @@ class AdvanceOffense(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=AdvanceOffense.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=AdvanceOffense.source).parser
-
     def transform(self) -> None:
         if not self.raw:
             return
@@ -687,15 +705,7 @@ class AdvanceOffense(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamAdvanceOffenseStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM OFF_ADVANCE_STATS {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM OFF_ADVANCE_STATS {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamAdvanceOffenseStats, self.res, unique_fields=['team'], label="TEAM OFF_ADVANCE_STATS")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -708,11 +718,6 @@ class AdvanceDefense(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=AdvanceDefense.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=AdvanceDefense.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -738,15 +743,7 @@ class AdvanceDefense(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamAdvanceDefenseStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM DEF_ADVANCE_STATS {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM DEF_ADVANCE_STATS {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamAdvanceDefenseStats, self.res, unique_fields=['team'], label="TEAM DEF_ADVANCE_STATS")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -759,11 +756,6 @@ class CoverageSchemes(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=CoverageSchemes.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=CoverageSchemes.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -784,15 +776,7 @@ class CoverageSchemes(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamCoverageSchemeStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM COVERAGE_SCHEME_STATS {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM COVERAGE_SCHEME_STATS {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamCoverageSchemeStats, self.res, unique_fields=['team'], label="TEAM COVERAGE_SCHEME_STATS")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -805,11 +789,6 @@ class OffenseTendencies(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=OffenseTendencies.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=OffenseTendencies.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -831,15 +810,7 @@ class OffenseTendencies(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamOffensePlayCallingStats.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM TENDENCIES_STATS {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM TENDENCIES_STATS {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamOffensePlayCallingStats, self.res, unique_fields=['team'], label="TEAM TENDENCIES_STATS")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -852,11 +823,6 @@ class CoverageStatsByPosition(WebScraping):
         self.raw = []
         self.res = []
 
-    async def send_api_request(self, session: ClientSession):
-        async with session.get(url=CoverageStatsByPosition.base_url) as response:
-            html = await response.text()
-            self.raw = Table(html=html, source=CoverageStatsByPosition.source).parser
-
     def transform(self):
         if not self.raw:
             return
@@ -878,15 +844,7 @@ class CoverageStatsByPosition(WebScraping):
             }
             self.res.append(defaults)
 
-            _, created = models.TeamCoverageStatsByPosition.objects.update_or_create(
-                team=team_instance,
-                defaults=defaults
-            )
-
-            if created:
-                logger.info(f"CREATED: TEAM COVERAGE_STATS_BY_POSITION {str(item['Team']).upper()}")
-            else:
-                logger.debug(f"UPDATED: TEAM COVERAGE_STATS_BY_POSITION {str(item['Team']).upper()}")
+        self.result = bulk_upsert(models.TeamCoverageStatsByPosition, self.res, unique_fields=['team'], label="TEAM COVERAGE_STATS_BY_POSITION")
         
     def to_df(self) -> None:
         print(pd.DataFrame(self.res))
@@ -897,11 +855,85 @@ def generate_slug(name: str) -> str:
     name = name.lower().replace(' ', '-')
     return name
 
+def sync_game_dates(game_ids: list | None = None) -> int:
+    """
+    Copies Game.date onto PlayerGameStats.game_date, the gamelog keyset
+    column, for the given games or for every row still missing it.
+    """
+    stats = models.PlayerGameStats.objects.all()
+    if game_ids is None:
+        stats = stats.filter(game_date__isnull=True)
+    elif game_ids:
+        stats = stats.filter(game__in=game_ids)
+    else:
+        return 0
+
+    kickoff = models.Game.objects.filter(pk=OuterRef('game_id')).values('date')[:1]
+    return stats.update(game_date=Subquery(kickoff))
+
+def sync_matchups(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Fills team_at_game_time, opponent and is_home on gamelog rows ingested
+    before those columns existed. The side already recorded wins, otherwise
+    the player's current team is used if it played in the game.
+    """
+    stats = (
+        models.PlayerGameStats.objects
+        .filter(team_at_game_time__isnull=True)
+        .select_related('game', 'player')
+        .only('is_home', 'game__homeTeam', 'game__awayTeam', 'player__team')
+    )
+
+    updated = []
+    for row in stats.iterator(chunk_size=batch_size):
+        if row.is_home is None:
+            team_id = row.player.team_id
+        else:
+            team_id = row.game.homeTeam_id if row.is_home else row.game.awayTeam_id
+
+        row.opponent_id, row.is_home = row.game.matchup(team_id)
+        if row.is_home is not None:
+            row.team_at_game_time_id = team_id
+            updated.append(row)
+
+    models.PlayerGameStats.objects.bulk_update(updated, ['team_at_game_time', 'opponent', 'is_home'], batch_size=batch_size)
+    return len(updated)
+
+def rescore_fantasy_points(batch_size: int = 5000) -> int:
+    """
+    Recomputes every gamelog's fantasy points, e.g. after a scoring
+    profile was added or changed, one batch of rows per DataFrame.
+    """
+    stats = models.PlayerGameStats.objects.order_by('pk').values('pk', *SCORED_STATS)
+    updated, last_pk = 0, 0
+    while batch := list(stats.filter(pk__gt=last_pk)[:batch_size]):
+        rows = [
+            models.PlayerGameStats(pk=row['pk'], fantasy_points=points)
+            for row, points in zip(batch, fantasy_points(batch))
+        ]
+        models.PlayerGameStats.objects.bulk_update(rows, ['fantasy_points'], batch_size=BATCH_SIZE)
+        updated += len(rows)
+        last_pk = batch[-1]['pk']
+    return updated
+
+def parse_executor() -> Executor:
+    """
+    Pool that runs Table parsing off the event loop. Processes are used
+    by default so the scrapers' BeautifulSoup work runs on spare cores
+    while other downloads continue; daemonic processes (e.g. a Celery
+    prefork child) cannot fork, so those fall back to threads.
+    """
+    if PARSE_EXECUTOR == 'process' and not multiprocessing.current_process().daemon:
+        return ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return ThreadPoolExecutor(max_workers=PARSE_WORKERS)
+
 class NFLPipeline(object):
     def __init__(self, upcoming_week):
         self.endpoints: list = []
         self.generators: list = []
+        self.failed: list = []
         self.upcoming_week = upcoming_week
+        self.http_cache = HttpCache(settings.HTTP_CACHE_DIR)
 
     def create_endpoint(self, endpoint) -> None:
         self.endpoints.append(endpoint)
@@ -909,26 +941,56 @@ class NFLPipeline(object):
     def create_generator(self, generator) -> None:
         self.generators.append(generator)
     
+    def dependency_graph(self) -> dict:
+        """
+        Maps every registered endpoint to the registered endpoint it
+        depends on (Teams -> Players -> PlayerStats), or None.
+        """
+        registered = {type(endpoint): endpoint for endpoint in self.endpoints + self.generators}
+        return {
+            endpoint: registered.get(endpoint.depends_on)
+            for endpoint in self.endpoints + self.generators
+        }
+
     async def extract_data(self):
-       async with ClientSession() as session:
-            if not self.endpoints:
-                print('No endpoints to process.')
-            else:
-                for endpoint in self.endpoints:
-                    if isinstance(endpoint, Teams):
-                        team_ids = await endpoint.send_api_request(session)
-                    else:
-                        await endpoint.send_api_request(session)
-            if not self.generators:
-                print("No generators to process.")
-            else:
-                for generator in self.generators:
-                    if isinstance(generator, Events):
-                        await generator.spawn_tasks(session, upcoming_week=self.upcoming_week)
-                    elif isinstance(generator, Players):
-                        player_ids = await generator.spawn_tasks(session, team_ids)
-                    elif isinstance(generator, PlayerStats):
-                        await generator.spawn_tasks(session, player_ids)
+        graph = self.dependency_graph()
+        if not graph:
+            print('No endpoints to process.')
+            return
+
+        with parse_executor() as executor:
+            async with Fetcher(cache=self.http_cache) as session:
+                async with TaskGroup() as tg:
+                    tasks = {}
+
+                    def schedule(endpoint):
+                        if endpoint not in tasks:
+                            upstream = graph[endpoint]
+                            upstream_task = schedule(upstream) if upstream else None
+                            tasks[endpoint] = tg.create_task(self.extract(endpoint, session, upstream_task, executor))
+                        return tasks[endpoint]
+
+                    for endpoint in graph:
+                        schedule(endpoint)
+
+    async def extract(self, endpoint, session: Fetcher, upstream_task, executor: Executor) -> Any:
+        """
+        Waits for the endpoint's dependency, if any, then fetches it.
+        Independent endpoints start immediately and run side by side.
+        """
+        inputs = (await upstream_task if upstream_task else None) or []
+
+        try:
+            if isinstance(endpoint, Events):
+                return await endpoint.spawn_tasks(session, upcoming_week=self.upcoming_week)
+            elif isinstance(endpoint, EndpointGenerator):
+                return await endpoint.spawn_tasks(session, inputs)
+            elif isinstance(endpoint, WebScraping):
+                return await endpoint.send_api_request(session, executor=executor)
+            return await endpoint.send_api_request(session)
+        except FetchError as e:
+            logger.error(f"FAILED: {type(endpoint).__name__} skipped ({e})")
+            self.failed.append(type(endpoint).__name__)
 
     def is_nfl_season(self):
         today = datetime.now().date()
@@ -999,4 +1061,21 @@ def main():
     advance_defense.transform()
     coverage_schemes.transform()
     offense_tendencies.transform()
-    coverage_position.transform()
\ No newline at end of file
+    coverage_position.transform()
+
+    # Aggregate the seasons whose gamelogs were just written
+    seasons = {row.game.season_year for row in stats.result.objects}
+    defense_vs_position = build_defense_vs_position(seasons)
+    season_aggregates = build_player_season_aggregates(seasons)
+
+    # Players with skipped gamelog rows are fetched in full next time, not skipped as unchanged
+    for player_id in stats.incomplete:
+        pl.http_cache.forget(PlayerStats.base_url.format(player_id=player_id))
+
+    # Only remember what was fetched once the ingested rows are committed
+    transaction.on_commit(pl.http_cache.flush)
+
+    # Evict the cached responses of whatever changed, once for the whole sync
+    results = [endpoint.result for endpoint in pl.endpoints + pl.generators if getattr(endpoint, 'result', None)]
+    tags = changed_tags(obj for result in results + [defense_vs_position, season_aggregates] for obj in result.objects)
+    transaction.on_commit(lambda: invalidate(tags))
\ No newline at end of file
@@ -1,9 +1,15 @@
-from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from nfl.caching import changed_tags, invalidate
 from nfl.models import PlayerGameStats
 
 @receiver(post_save, sender=PlayerGameStats)
-def clear_weekly_stats(sender, **kwargs):
-    cache.clear() 
-    print("Weekly update detected: Redis cache flushed.")
\ No newline at end of file
+def invalidate_player_stats(sender, instance, **kwargs):
+    """
+    Single saves (admin, shell) only evict the player's and season's
+    cached responses. Ingestion writes in bulk and invalidates once per
+    sync instead.
+    """
+    tags = changed_tags([instance])
+    transaction.on_commit(lambda: invalidate(tags))
@@ -1,6 +1,11 @@
 from bs4 import BeautifulSoup
+from io import BytesIO
+from lxml import etree
 from pprint import pprint
 
+# Strings bs4's get_text() leaves out of a cell's text.
+SKIPPED_TAGS = {'script', 'style', 'template'}
+
 class Table(object):
     def __init__(self, html: str, source: str):
         self.html = html
@@ -8,6 +13,54 @@ class Table(object):
 
     @property
     def parser(self):
+        """
+        Reads only the first <table> of the page with lxml and stops
+        parsing as soon as it closes. Rows come out exactly as
+        soup_parser builds them.
+        """
+        table = self.first_table()
+        if table is None:
+            return []
+
+        headers = [cell_text(th) for th in table.iter('th')]
+
+        rows, i = list(table.iter('tr')), 0
+        if rows and next(rows[0].iter('th'), None) is not None:
+            i = 1
+
+        old_table = []
+        for row in rows[i:]:
+            data = [cell_text(td) for td in row.iter('td')]
+            if not data:
+                continue
+
+            data[0] = self.clean_team_field(data[0])
+
+            if len(data) == len(headers):
+                old_table.append(dict(zip(headers, data)))
+        return old_table
+
+    def first_table(self):
+        source = BytesIO(self.html.encode('utf-8'))
+        depth, table = 0, None
+
+        for event, element in etree.iterparse(source, events=('start', 'end'), tag='table', html=True, encoding='utf-8'):
+            if event == 'start':
+                depth += 1
+                if table is None:
+                    table = element
+            else:
+                depth -= 1
+                if depth == 0:
+                    return table
+        return table
+
+    @property
+    def soup_parser(self):
+        """
+        Original BeautifulSoup implementation, kept as the reference the
+        fast parser is tested and benchmarked against.
+        """
         soup = BeautifulSoup(self.html, 'lxml')
         table = soup.find('table')
         headers = [th.get_text(strip=True) for th in table.find_all('th')]
@@ -86,4 +139,24 @@ class Table(object):
             value = value.split(' ')[-1]
             return value
         else:
-            return value
\ No newline at end of file
+            return value
+
+def cell_text(element) -> str:
+    """
+    Same result as bs4's get_text(strip=True): every text node under the
+    element stripped and joined, skipping comments and script/style.
+    """
+    parts = [element.text.strip()] if element.text else []
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TAGS:
+            parts.append(cell_text(child))
+        if child.tail:
+            parts.append(child.tail.strip())
+    return ''.join(parts)
+
+def parse_table(html: str, source: str) -> list[dict]:
+    """
+    Module-level entry point so the parse can be shipped to a worker
+    process; only the raw HTML goes in and only row dicts come back.
+    """
+    return Table(html=html, source=source).parser
@@ -0,0 +1,120 @@
+from hashlib import sha256
+from typing import Any
+from django.db import models
+from nfl.models import IngestFingerprint
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+class UpsertResult(object):
+    def __init__(self, label: str):
+        self.label = label
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.objects: list = []
+
+    def __str__(self):
+        return f"{self.label} CREATED={self.created} UPDATED={self.updated} SKIPPED={self.skipped}"
+
+def bulk_upsert(model: type[models.Model], rows: list[dict], unique_fields: list[str], label: str, batch_size: int = BATCH_SIZE) -> UpsertResult:
+    """
+    Writes rows with a single INSERT ... ON CONFLICT DO UPDATE per batch.
+
+    Rows are matched to existing records on unique_fields, the same lookup
+    the old update_or_create calls used, so matching does not depend on a
+    database constraint and the created/updated counts stay exact. When a
+    key appears more than once the last row wins.
+
+    Each row's values are fingerprinted and compared with the ones stored
+    by the previous sync; existing rows whose fingerprint matches are
+    counted as skipped and not written at all.
+    """
+    result = UpsertResult(label)
+    if not rows:
+        return result
+
+    key_fields = [model._meta.get_field(name) for name in unique_fields]
+    update_fields = [name for name in rows[0] if name not in unique_fields]
+    value_fields = [model._meta.get_field(name) for name in update_fields]
+
+    latest: dict[tuple, models.Model] = {}
+    for row in rows:
+        obj = model(**row)
+        latest[row_key(obj, key_fields)] = obj
+    objs = list(latest.values())
+
+    for i in range(0, len(objs), batch_size):
+        chunk = objs[i:i + batch_size]
+        existing = existing_keys(model, key_fields, chunk)
+        digests = {fingerprint_key(row_key(obj, key_fields)): fingerprint(obj, value_fields) for obj in chunk}
+        stored = stored_fingerprints(model, digests)
+
+        batch = []
+        for obj in chunk:
+            obj.pk = existing.get(row_key(obj, key_fields))
+            key = fingerprint_key(row_key(obj, key_fields))
+            if obj.pk is None:
+                result.created += 1
+            elif stored.get(key) == digests[key]:
+                result.skipped += 1
+                del digests[key]
+                continue
+            else:
+                result.updated += 1
+            batch.append(obj)
+
+        if not batch:
+            continue
+
+        model.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['pk'],
+            update_fields=update_fields,
+        )
+        store_fingerprints(model, digests)
+        result.objects.extend(batch)
+
+    logger.info(f"UPSERTED: {result}")
+    return result
+
+def row_key(obj: models.Model, key_fields: list) -> tuple:
+    return tuple(getattr(obj, field.attname) for field in key_fields)
+
+def existing_keys(model: type[models.Model], key_fields: list, batch: list[models.Model]) -> dict[tuple, Any]:
+    attnames = [field.attname for field in key_fields]
+    lookup = {
+        f"{attname}__in": {getattr(obj, attname) for obj in batch}
+        for attname in attnames
+    }
+
+    existing = {}
+    for *key, pk in model.objects.filter(**lookup).values_list(*attnames, 'pk'):
+        existing[tuple(key)] = pk
+    return existing
+
+def fingerprint(obj: models.Model, fields: list) -> str:
+    values = {field.attname: field.to_python(getattr(obj, field.attname)) for field in fields}
+    return sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+def fingerprint_key(key: tuple) -> str:
+    return json.dumps(key, default=str)
+
+def stored_fingerprints(model: type[models.Model], digests: dict[str, str]) -> dict[str, str]:
+    return dict(
+        IngestFingerprint.objects
+        .filter(model=model._meta.label, key__in=list(digests))
+        .values_list('key', 'digest')
+    )
+
+def store_fingerprints(model: type[models.Model], digests: dict[str, str]) -> None:
+    IngestFingerprint.objects.bulk_create(
+        [IngestFingerprint(model=model._meta.label, key=key, digest=digest) for key, digest in digests.items()],
+        update_conflicts=True,
+        unique_fields=['model', 'key'],
+        update_fields=['digest', 'updated_at'],
+    )
@@ -1,16 +1,14 @@
 from celery import shared_task
+from decimal import Decimal
 from .services.services import main
+from .caching import invalidate
+from .warming import warm_cache
+from .publishing import PublishInProgress, publish_snapshots
 from celery.utils.log import get_task_logger
 from django.db import transaction
-from django.db.models import F, Window
+from django.db.models import Case, F, IntegerField, Value, When, Window
 from django.db.models.functions import DenseRank
-from .models import (
-    Team, TeamRankSnapshot, 
-    TeamOffensePassingStats, TeamOffenseRushingStats, TeamOffenseReceivingStats,
-    TeamDefensePassingStats, TeamDefenseRushingStats, TeamDefenseReceivingStats,
-    TeamAdvanceOffenseStats, TeamAdvanceDefenseStats, TeamCoverageSchemeStats,
-    TeamOffensePlayCallingStats, TeamCoverageStatsByPosition
-)
+from .models import Team, Game, TeamRankSnapshot, TeamWeeklySnapshot, TEAM_STAT_TABLES
 
 logger = get_task_logger(__name__)
 
@@ -29,139 +27,187 @@ def weekly_nfl_sync():
     except Exception as e:
         logger.error(f"Scheduled task failed: {e}")
 
-@shared_task
-def update_team_rank_snapshots():
-    """
-    Calculates ranks and updates TeamRankSnapshot. 
-    Annotation keys MUST match the TeamRankSnapshot field names exactly.
-    """
-    
-    # Helpers for clean ranking
-    def rank_desc(field): 
-        return Window(expression=DenseRank(), order_by=F(field).desc())
-    
-    def rank_asc(field): 
-        return Window(expression=DenseRank(), order_by=F(field).asc())
-
-    # --- 1. Calculate Ranks for Each Category ---
-    
+# Snapshot field -> (Team lookup path, higher is better)
+RANKS = {
     # Offense Passing
-    off_pass = TeamOffensePassingStats.objects.annotate(
-        off_pass_yards_rank=rank_desc('pass_yards'),
-        off_pass_tds_rank=rank_desc('pass_touchdowns'),
-        off_pass_rating_rank=rank_desc('pass_rating')
-    ).values('team_id', 'off_pass_yards_rank', 'off_pass_tds_rank', 'off_pass_rating_rank')
+    'off_pass_yards_rank': ('team_offense_passing__pass_yards', True),
+    'off_pass_tds_rank': ('team_offense_passing__pass_touchdowns', True),
+    'off_pass_rating_rank': ('team_offense_passing__pass_rating', True),
 
     # Offense Rushing
-    off_rush = TeamOffenseRushingStats.objects.annotate(
-        off_rush_yards_rank=rank_desc('rush_yards'),
-        off_rush_tds_rank=rank_desc('rush_touchdowns'),
-        off_rush_attempts_rank=rank_desc('rush_attempts')
-    ).values('team_id', 'off_rush_yards_rank', 'off_rush_tds_rank', 'off_rush_attempts_rank')
+    'off_rush_yards_rank': ('team_offense_rushing__rush_yards', True),
+    'off_rush_tds_rank': ('team_offense_rushing__rush_touchdowns', True),
+    'off_rush_attempts_rank': ('team_offense_rushing__rush_attempts', True),
 
     # Offense Receiving
-    off_rec = TeamOffenseReceivingStats.objects.annotate(
-        off_receptions_rank=rank_desc('receptions'),
-        off_rec_yards_rank=rank_desc('rec_yards'),
-        off_rec_tds_rank=rank_desc('rec_touchdowns')
-    ).values('team_id', 'off_receptions_rank', 'off_rec_yards_rank', 'off_rec_tds_rank')
+    'off_receptions_rank': ('team_offense_receiving__receptions', True),
+    'off_rec_yards_rank': ('team_offense_receiving__rec_yards', True),
+    'off_rec_tds_rank': ('team_offense_receiving__rec_touchdowns', True),
 
     # Defense Passing
-    def_pass = TeamDefensePassingStats.objects.annotate(
-        def_pass_yards_rank=rank_asc('pass_yards'),
-        def_pass_tds_rank=rank_asc('pass_touchdowns'),
-        def_pass_rating_rank=rank_asc('pass_rating')
-    ).values('team_id', 'def_pass_yards_rank', 'def_pass_tds_rank', 'def_pass_rating_rank')
+    'def_pass_yards_rank': ('team_defense_passing__pass_yards', False),
+    'def_pass_tds_rank': ('team_defense_passing__pass_touchdowns', False),
+    'def_pass_rating_rank': ('team_defense_passing__pass_rating', False),
 
     # Defense Rushing
-    def_rush = TeamDefenseRushingStats.objects.annotate(
-        def_rush_yards_rank=rank_asc('rush_yards'),
-        def_rush_tds_rank=rank_asc('rush_touchdowns'),
-        def_rush_attempts_rank=rank_asc('rush_attempts')
-    ).values('team_id', 'def_rush_yards_rank', 'def_rush_tds_rank', 'def_rush_attempts_rank')
+    'def_rush_yards_rank': ('team_defense_rushing__rush_yards', False),
+    'def_rush_tds_rank': ('team_defense_rushing__rush_touchdowns', False),
+    'def_rush_attempts_rank': ('team_defense_rushing__rush_attempts', False),
 
     # Defense Receiving
-    def_rec = TeamDefenseReceivingStats.objects.annotate(
-        def_receptions_rank=rank_asc('receptions'),
-        def_rec_yards_rank=rank_asc('rec_yards'),
-        def_rec_tds_rank=rank_asc('rec_touchdowns'),
-        def_pass_defended_rank=rank_asc('pass_defended')
-    ).values('team_id', 'def_receptions_rank', 'def_rec_yards_rank', 'def_rec_tds_rank', 'def_pass_defended_rank')
+    'def_receptions_rank': ('team_defense_receiving__receptions', False),
+    'def_rec_yards_rank': ('team_defense_receiving__rec_yards', False),
+    'def_rec_tds_rank': ('team_defense_receiving__rec_touchdowns', False),
+    'def_pass_defended_rank': ('team_defense_receiving__pass_defended', False),
 
     # Advanced Offense
-    adv_off = TeamAdvanceOffenseStats.objects.annotate(
-        off_expected_points_added_per_play_rank=rank_desc('expected_points_added_per_play'),
-        off_expected_points_added_per_pass_rank=rank_desc('expected_points_added_per_pass'),
-        off_expected_points_added_per_rush_rank=rank_desc('expected_points_added_per_rush')
-    ).values('team_id', 'off_expected_points_added_per_play_rank', 
-             'off_expected_points_added_per_pass_rank', 'off_expected_points_added_per_rush_rank')
+    'off_expected_points_added_per_play_rank': ('team_advance_offense__expected_points_added_per_play', True),
+    'off_expected_points_added_per_pass_rank': ('team_advance_offense__expected_points_added_per_pass', True),
+    'off_expected_points_added_per_rush_rank': ('team_advance_offense__expected_points_added_per_rush', True),
 
     # Advanced Defense
-    adv_def = TeamAdvanceDefenseStats.objects.annotate(
-        def_expected_points_added_per_play_rank=rank_asc('expected_points_added_per_play'),
-        def_expected_points_added_allowed_per_pass_rank=rank_asc('expected_points_added_allowed_per_pass'),
-        def_expected_points_added_allowed_per_rush_rank=rank_asc('expected_points_added_allowed_per_rush')
-    ).values('team_id', 'def_expected_points_added_per_play_rank', 
-             'def_expected_points_added_allowed_per_pass_rank', 'def_expected_points_added_allowed_per_rush_rank')
+    'def_expected_points_added_per_play_rank': ('team_advance_defense__expected_points_added_per_play', False),
+    'def_expected_points_added_allowed_per_pass_rank': ('team_advance_defense__expected_points_added_allowed_per_pass', False),
+    'def_expected_points_added_allowed_per_rush_rank': ('team_advance_defense__expected_points_added_allowed_per_rush', False),
 
     # Coverage Scheme
-    cov_scheme = TeamCoverageSchemeStats.objects.annotate(
-        man_rate_rank=rank_desc('man_rate'),
-        zone_rate_rank=rank_desc('zone_rate'),
-        middle_closed_rate_rank=rank_desc('middle_closed_rate'),
-        middle_open_rate_rank=rank_desc('middle_open_rate')
-    ).values('team_id', 'man_rate_rank', 'zone_rate_rank', 'middle_closed_rate_rank', 'middle_open_rate_rank')
+    'man_rate_rank': ('team_coverage_rates__man_rate', True),
+    'zone_rate_rank': ('team_coverage_rates__zone_rate', True),
+    'middle_closed_rate_rank': ('team_coverage_rates__middle_closed_rate', True),
+    'middle_open_rate_rank': ('team_coverage_rates__middle_open_rate', True),
 
     # Play Calling
-    play_call = TeamOffensePlayCallingStats.objects.annotate(
-        motion_rate_rank=rank_desc('motion_rate'),
-        play_action_rate_rank=rank_desc('play_action_rate'),
-        shotgun_rate_rank=rank_desc('shotgun_rate'),
-        nohuddle_rate_rank=rank_desc('nohuddle_rate')
-    ).values('team_id', 'motion_rate_rank', 'play_action_rate_rank', 'shotgun_rate_rank', 'nohuddle_rate_rank')
+    'motion_rate_rank': ('team_play_calling__motion_rate', True),
+    'play_action_rate_rank': ('team_play_calling__play_action_rate', True),
+    'shotgun_rate_rank': ('team_play_calling__shotgun_rate', True),
+    'nohuddle_rate_rank': ('team_play_calling__nohuddle_rate', True),
 
     # Coverage by Position
-    pos_cov = TeamCoverageStatsByPosition.objects.annotate(
-        yards_allowed_wr_rank=rank_asc('yards_allowed_wr'),
-        yards_allowed_te_rank=rank_asc('yards_allowed_te'),
-        yards_allowed_rb_rank=rank_asc('yards_allowed_rb'),
-        yards_allowed_outside_rank=rank_asc('yards_allowed_outside'),
-        yards_allowed_slot_rank=rank_asc('yards_allowed_slot')
-    ).values('team_id', 'yards_allowed_wr_rank', 'yards_allowed_te_rank', 'yards_allowed_rb_rank', 
-             'yards_allowed_outside_rank', 'yards_allowed_slot_rank')
-
-    master_data = {}
-
-    def merge_results(queryset):
-        for item in queryset:
-            tid = item['team_id']
-            if tid not in master_data:
-                master_data[tid] = {}
-            stats_only = {k: v for k, v in item.items() if k != 'team_id'}
-            master_data[tid].update(stats_only)
-
-    # Execute merges
-    merge_results(off_pass)
-    merge_results(off_rush)
-    merge_results(off_rec)
-    merge_results(def_pass)
-    merge_results(def_rush)
-    merge_results(def_rec)
-    merge_results(adv_off)
-    merge_results(adv_def)
-    merge_results(cov_scheme)
-    merge_results(play_call)
-    merge_results(pos_cov)
+    'yards_allowed_wr_rank': ('team_coverage_stats_by_position__yards_allowed_wr', False),
+    'yards_allowed_te_rank': ('team_coverage_stats_by_position__yards_allowed_te', False),
+    'yards_allowed_rb_rank': ('team_coverage_stats_by_position__yards_allowed_rb', False),
+    'yards_allowed_outside_rank': ('team_coverage_stats_by_position__yards_allowed_outside', False),
+    'yards_allowed_slot_rank': ('team_coverage_stats_by_position__yards_allowed_slot', False),
+}
+
+def rank(path: str, descending: bool) -> Case:
+    """
+    DenseRank over one stat column. Teams without a value (missing from
+    that stat table) sort last and get rank 0, like a fresh snapshot.
+    """
+    order = F(path).desc(nulls_last=True) if descending else F(path).asc(nulls_last=True)
+    return Case(
+        When(**{f"{path}__isnull": True}, then=Value(0)),
+        default=Window(expression=DenseRank(), order_by=order),
+        output_field=IntegerField(),
+    )
+
+def stat_columns() -> dict[str, list[str]]:
+    return {
+        table: [
+            field.name for field in Team._meta.get_field(table).related_model._meta.concrete_fields
+            if field.name not in ('id', 'team')
+        ]
+        for table in TEAM_STAT_TABLES
+    }
+
+def team_stats(row: dict, columns: dict[str, list[str]]) -> dict:
+    """
+    Nests the joined stat columns of one row by table, dropping tables the
+    team has no row in.
+    """
+    stats = {}
+    for table, names in columns.items():
+        values = {name: row.pop(f"{table}__{name}") for name in names}
+        if any(value is not None for value in values.values()):
+            stats[table] = {
+                name: float(value) if isinstance(value, Decimal) else value
+                for name, value in values.items()
+            }
+    return stats
+
+@shared_task
+def update_team_rank_snapshots():
+    """
+    Calculates ranks and updates TeamRankSnapshot. 
+    RANKS keys MUST match the TeamRankSnapshot field names exactly.
+
+    Every rank comes from one SELECT over Team left-joined to all the
+    stat tables, and the snapshots are written with one bulk upsert.
+    The same rows are kept as the TeamWeeklySnapshot of the latest
+    completed week.
+    """
+    columns = stat_columns()
+    ranks = Team.objects.order_by().annotate(
+        **{field: rank(path, descending) for field, (path, descending) in RANKS.items()}
+    ).values('id', *RANKS, *(f"{table}__{name}" for table, names in columns.items() for name in names))
+
+    latest = Game.objects.filter(status='Final').order_by('-date').first()
+    snapshots, weekly = [], []
+    for row in ranks:
+        team_id = row.pop('id')
+        stats = team_stats(row, columns)
+        snapshots.append(TeamRankSnapshot(team_id=team_id, **row))
+
+        if latest:
+            weekly.append(TeamWeeklySnapshot(
+                team_id=team_id,
+                season_year=latest.season_year,
+                season_type=latest.season_type,
+                week=latest.week,
+                stats=stats,
+                **row
+            ))
 
     try:
         with transaction.atomic():
-            count = 0
-            for tid, stats in master_data.items():
-                TeamRankSnapshot.objects.update_or_create(
-                    team_id=tid,
-                    defaults=stats
-                )
-                count += 1
-            logger.info("Updated TeamRankSnapshot Model")
+            TeamRankSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=['team'],
+                update_fields=[*RANKS, 'updated_at'],
+            )
+            TeamWeeklySnapshot.objects.bulk_create(
+                weekly,
+                update_conflicts=True,
+                unique_fields=['team', 'season_year', 'season_type', 'week'],
+                update_fields=[*RANKS, 'stats'],
+            )
+            transaction.on_commit(lambda: invalidate(['ranks']))
+            logger.info(f"Updated TeamRankSnapshot Model for {len(snapshots)} teams")
+            if latest:
+                logger.info(f"Stored TeamWeeklySnapshot for {latest.season_year} week {latest.week}")
+
+        warm_api_cache.delay()
+        logger.info("Triggered follow-up cache warming task")
+
     except Exception as e:
-        logger.error(f"Scheduled task failed for TeamRankSnapshot Model: {e}")
\ No newline at end of file
+        logger.error(f"Scheduled task failed for TeamRankSnapshot Model: {e}")
+
+@shared_task
+def warm_api_cache():
+    """
+    Pre-renders the most requested responses right after an update so the
+    first visitors don't pay for the empty cache.
+    """
+    warmed, elapsed = warm_cache()
+    logger.info(f"Warmed {warmed} cached responses in {elapsed:.2f}s")
+
+    publish_api_snapshots.delay()
+    logger.info("Triggered follow-up snapshot publishing task")
+    return warmed
+
+@shared_task(bind=True, max_retries=6)
+def publish_api_snapshots(self):
+    """
+    Publishes the read-only endpoints as static files for nginx, after
+    every ingest and nightly. A run that finds another one publishing
+    waits for it, so the newest data still gets published.
+    """
+    try:
+        manifest = publish_snapshots()
+    except PublishInProgress as e:
+        logger.info("Snapshot publish already running, retrying in 5 minutes")
+        raise self.retry(exc=e, countdown=300)
+    logger.info(f"Published {len(manifest['files'])} snapshot files")
+    return len(manifest['files'])
@@ -0,0 +1,125 @@
+from datetime import datetime
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from nfl.caching import changed_tags
+from nfl.models import DefenseVsPosition, PlayerGameStats, PlayerSeasonAggregate
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.services.aggregates import build_defense_vs_position, build_player_season_aggregates
+
+class DefenseVsPositionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.det, self.chi, self.gb = TeamFactory(abbreviation="DET"), TeamFactory(abbreviation="CHI"), TeamFactory(abbreviation="GB")
+        det_qb, chi_qb, gb_qb = (PlayerFactory(team=team, position="QB") for team in (self.det, self.chi, self.gb))
+
+        # CHI allows 300 at home and 200 away, GB allows 150
+        week1 = GameFactory(homeTeam=self.chi, awayTeam=self.det, season_year=2025)
+        week2 = GameFactory(homeTeam=self.det, awayTeam=self.chi, season_year=2025)
+        week3 = GameFactory(homeTeam=self.det, awayTeam=self.gb, season_year=2025)
+        PlayerGameStatsFactory(player=det_qb, game=week1, pass_yards=300, pass_touchdowns=3, rush_yards=0)
+        PlayerGameStatsFactory(player=det_qb, game=week2, pass_yards=180, pass_touchdowns=1, rush_yards=20)
+        PlayerGameStatsFactory(player=det_qb, game=week3, pass_yards=150, pass_touchdowns=0, rush_yards=0)
+        for qb, game in ((chi_qb, week1), (chi_qb, week2), (gb_qb, week3)):
+            PlayerGameStatsFactory(player=qb, game=game, pass_yards=250, rush_yards=0)
+        PlayerGameStatsFactory(player=PlayerFactory(team=self.det, position="K"), game=week1)
+
+    def row(self, opponent, location='all'):
+        return DefenseVsPosition.objects.get(opponent=opponent, position="QB", location=location)
+
+    def test_totals_averages_and_ranks(self):
+        result = build_defense_vs_position()
+
+        chi = self.row(self.chi)
+        self.assertEqual((chi.games, chi.pass_yards, chi.pass_touchdowns), (2, 480, 4))
+        self.assertEqual(chi.yards_per_game, 250)
+        self.assertEqual((self.row(self.chi, 'home').pass_yards, self.row(self.chi, 'away').pass_yards), (180, 300))
+        self.assertEqual(self.row(self.gb).rank, 1)
+        self.assertEqual(self.row(self.det).rank, 2)
+        self.assertEqual(chi.rank, 2)
+        self.assertFalse(DefenseVsPosition.objects.exclude(position="QB").exists())
+        self.assertEqual(result.created, DefenseVsPosition.objects.count())
+
+    def test_rebuild_only_writes_changes(self):
+        build_defense_vs_position([2025])
+
+        result = build_defense_vs_position([2025])
+
+        self.assertEqual((result.created, result.updated), (0, 0))
+        self.assertEqual(changed_tags(result.objects), set())
+
+    def test_cells_without_gamelogs_are_deleted(self):
+        build_defense_vs_position([2025])
+        PlayerGameStats.objects.filter(opponent=self.gb).update(opponent=self.chi)
+
+        result = build_defense_vs_position([2025])
+
+        self.assertFalse(DefenseVsPosition.objects.filter(opponent=self.gb).exists())
+        self.assertIn('defense', changed_tags(result.objects))
+
+        build_defense_vs_position([2024])
+        self.assertTrue(DefenseVsPosition.objects.filter(opponent=self.chi).exists())
+
+    def test_other_seasons_are_untouched(self):
+        build_defense_vs_position([2024])
+
+        self.assertFalse(DefenseVsPosition.objects.exists())
+
+    def test_endpoint_returns_matrix_in_one_query(self):
+        build_defense_vs_position()
+        url = reverse('nfl:defense-vs-position-view')
+
+        with self.assertNumQueries(1):
+            rows = self.client.get(url, {'season_year': 2025, 'season_type': 2, 'location': ''}).json()
+
+        self.assertEqual([row['rank'] for row in rows], [1, 2, 2])
+        self.assertEqual(rows[0]['opponent'], "GB")
+        self.assertEqual(rows[0]['per_game']['pass_yards'], 150)
+        self.assertEqual(len(self.client.get(url, {'location': 'away'}).json()), 2)
+
+class PlayerSeasonAggregateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.team = TeamFactory(abbreviation="DET")
+        self.wr = PlayerFactory(team=self.team, position="WR")
+        self.te = PlayerFactory(team=self.team, position="TE")
+
+        # The WR gets 1..6 targets in weeks 1..6, the TE 4 every week
+        for week in range(1, 7):
+            game = GameFactory(homeTeam=self.team, season_year=2025, week=week, date=timezone.make_aware(datetime(2025, 9, week)))
+            PlayerGameStatsFactory(player=self.wr, game=game, rec_targets=week, receptions=week, rec_yards=10 * week, rush_attempts=0)
+            PlayerGameStatsFactory(player=self.te, game=game, rec_targets=4, receptions=2, rec_yards=20, rush_attempts=1)
+        PlayerGameStatsFactory(player=self.wr, game=GameFactory(homeTeam=self.team, season_year=2024), rec_targets=9)
+
+    def test_totals_rolling_averages_and_shares(self):
+        build_player_season_aggregates([2025])
+
+        wr = PlayerSeasonAggregate.objects.get(player=self.wr)
+        self.assertEqual((wr.games, wr.rec_targets, wr.rec_yards), (6, 21, 210))
+        self.assertEqual(wr.rec_yards_per_game, 35)
+        self.assertEqual(wr.rec_yards_last3, 50)
+        self.assertEqual(wr.rec_yards_last5, 40)
+        self.assertEqual(wr.target_share, Decimal('0.4667'))
+        self.assertEqual(wr.carry_share, 0)
+        self.assertEqual((wr.team_id, wr.position), (self.team.pk, "WR"))
+        self.assertEqual(PlayerSeasonAggregate.objects.get(player=self.te).carry_share, 1)
+        self.assertFalse(PlayerSeasonAggregate.objects.filter(season_year=2024).exists())
+
+    def test_leaderboard_sorts_and_filters(self):
+        build_player_season_aggregates()
+        url = reverse('nfl:player-leaderboard-view')
+
+        with self.assertNumQueries(2):
+            body = self.client.get(url, {'season_year': 2025, 'ordering': '-target_share'}).json()
+
+        self.assertEqual([row['slug'] for row in body['results']], [self.te.slug, self.wr.slug])
+        self.assertEqual(body['results'][0]['team'], "DET")
+        wrs = self.client.get(url, {'season_year': 2025, 'position': 'WR', 'ordering': '-rec_yards_last3'}).json()
+        self.assertEqual(wrs['count'], 1)
+        self.assertEqual(self.client.get(url, {'min_games': 2}).json()['count'], 2)
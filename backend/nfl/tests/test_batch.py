@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from nfl.caching import invalidate
+from nfl.factories import PlayerFactory, GameFactory, PlayerGameStatsFactory
+
+class PlayerStatsBatchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('nfl:player-game-stats-batch-view')
+
+        self.players = [PlayerFactory() for _ in range(4)]
+        for player in self.players:
+            PlayerGameStatsFactory(player=player, game=GameFactory(season_year=2025, homeTeam=player.team))
+            PlayerGameStatsFactory(player=player, game=GameFactory(season_year=2024, homeTeam=player.team))
+
+    def get(self, players, **params):
+        return self.client.get(self.url, {'ids': ','.join(str(player.pk) for player in players), **params})
+
+    def test_matches_detail_endpoint(self):
+        body = self.get(self.players[:2], season_year=2025).json()
+
+        for player, data in zip(self.players[:2], body['players']):
+            detail = self.client.get(reverse('nfl:player-game-stats-view', args=[player.pk, player.slug]), {'season_year': 2025})
+            self.assertEqual(data, detail.json())
+        self.assertEqual([len(data['stats']) for data in body['players']], [1, 1])
+
+    def test_one_query_for_players_and_one_for_gamelogs(self):
+        with self.assertNumQueries(2):
+            body = self.get(self.players, location='home').json()
+
+        self.assertEqual([data['id'] for data in body['players']], [player.pk for player in self.players])
+
+    def test_players_are_cached_on_their_own(self):
+        self.get(self.players[:2])
+
+        with self.assertNumQueries(0):
+            self.get(reversed(self.players[:2]))
+        with self.assertNumQueries(2):
+            body = self.get(self.players[1:3]).json()
+        self.assertEqual([data['id'] for data in body['players']], [self.players[1].pk, self.players[2].pk])
+
+        # Other filters and invalidated players are loaded again
+        with self.assertNumQueries(2):
+            self.get(self.players[:2], season_year=2025)
+        invalidate([f'player:{self.players[0].pk}'])
+        with self.assertNumQueries(2):
+            self.get(self.players[:2])
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.client.get(self.url, {'ids': '1,x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'ids': ','.join(map(str, range(1, 12)))}).status_code, 400)
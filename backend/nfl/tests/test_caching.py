@@ -0,0 +1,119 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nfl.caching import changed_tags, invalidate
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+
+class TaggedCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def gamelogs(self, season_year):
+        return self.client.get(reverse('nfl:player-stats-gamelogs-view'), {'season_year': season_year})
+
+    def test_response_is_cached_until_its_tag_is_invalidated(self):
+        TeamFactory()
+        url = reverse('nfl:team-list-api-view')
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(len(cached.json()['teams']), 1)
+        self.assertIn('max-age', cached['Cache-Control'])
+
+        TeamFactory()
+        invalidate(['teams'])
+        self.assertEqual(len(self.client.get(url).json()['teams']), 2)
+
+    def test_ingest_only_evicts_affected_season(self):
+        old = PlayerGameStatsFactory(game=GameFactory(season_year=2024))
+        new = PlayerGameStatsFactory(game=GameFactory(season_year=2025))
+        self.gamelogs(2024)
+        self.gamelogs(2025)
+
+        tags = changed_tags([new])
+        invalidate(tags)
+
+        self.assertIn(f'player:{new.player_id}', tags)
+        self.assertNotIn(f'player:{old.player_id}', tags)
+        with self.assertNumQueries(0):
+            self.gamelogs(2024)
+        with CaptureQueriesContext(connection) as queries:
+            self.gamelogs(2025)
+        self.assertGreater(len(queries), 0)
+
+    def test_single_save_evicts_player_on_commit(self):
+        stats = PlayerGameStatsFactory(player=PlayerFactory(), rush_yards=10)
+        url = reverse('nfl:player-game-stats-view', args=[stats.player.pk, stats.player.slug])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stats.rush_yards = 99
+            stats.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()['stats'][0]['rush_yards'], 99)
+
+    def test_team_change_touches_every_endpoint(self):
+        self.assertIn('gamelogs', changed_tags([TeamFactory()]))
+
+class ConditionalResponseTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('nfl:team-list-api-view')
+        TeamFactory()
+
+    def test_current_etag_gets_304_without_queries(self):
+        first = self.client.get(self.url)
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            repeat = self.client.get(self.url, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.content, b'')
+        self.assertEqual(repeat['ETag'], first['ETag'])
+
+        since = self.client.get(self.url, headers={'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(since.status_code, 304)
+
+    def test_etag_follows_the_data_version(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.assertNotEqual(self.client.get(self.url, {'nickname': 'Lions'})['ETag'], etag)
+        invalidate(['ranks'])
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': etag}).status_code, 304)
+
+        invalidate(['teams'])
+        fresh = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+
+    def test_every_view_sends_validators(self):
+        player = PlayerGameStatsFactory().player
+        urls = [
+            reverse('nfl:player-list-api-view'),
+            reverse('nfl:player-game-stats-view', args=[player.pk, player.slug]),
+            f"{reverse('nfl:player-game-stats-batch-view')}?ids={player.pk}",
+            reverse('nfl:team-stats-view'),
+            reverse('nfl:team-stats-ranks-view'),
+            reverse('nfl:team-rank-deltas-view'),
+            reverse('nfl:player-stats-gamelogs-view'),
+            reverse('nfl:events-view'),
+            reverse('nfl:defense-vs-position-view'),
+            reverse('nfl:player-leaderboard-view'),
+            reverse('nfl:export-view', args=['team-stats', 'csv']),
+        ]
+        for url in urls:
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304, url)
+
+    def test_errors_have_no_etag(self):
+        response = self.client.get(reverse('nfl:player-game-stats-batch-view'), {'ids': 'x'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('ETag'))
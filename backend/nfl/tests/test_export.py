@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from io import BytesIO, StringIO
+from unittest import mock
+from nfl.factories import PlayerFactory, GameFactory, PlayerGameStatsFactory, TeamOffensePassingStatsFactory
+import csv
+import json
+import os
+import pyarrow.parquet as pq
+import tempfile
+
+class ExportTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.player = PlayerFactory(position="WR")
+        self.stats = [
+            PlayerGameStatsFactory(player=self.player, game=GameFactory(season_year=2025), rec_yards=80 + i, fantasy_points={'ppr': 12.5})
+            for i in range(5)
+        ]
+        PlayerGameStatsFactory(game=GameFactory(season_year=2024))
+
+    def download(self, dataset, file_format, **params):
+        response = self.client.get(reverse('nfl:export-view', args=[dataset, file_format]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, list(response.streaming_content)
+
+    def test_csv(self):
+        response, content = self.download('gamelogs', 'csv', season_year=2025)
+
+        rows = list(csv.DictReader(StringIO(b''.join(content).decode())))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="gamelogs.csv"')
+        self.assertEqual(sorted(int(row['id']) for row in rows), [stats.pk for stats in self.stats])
+        self.assertEqual(rows[0]['player__full_name'], self.player.full_name)
+        self.assertEqual(json.loads(rows[0]['fantasy_points']), {'ppr': 12.5})
+
+    def test_ndjson(self):
+        _, content = self.download('gamelogs', 'ndjson', position='WR', season_year=2025)
+
+        rows = [json.loads(line) for line in b''.join(content).splitlines()]
+        self.assertEqual(sorted(row['rec_yards'] for row in rows), [80, 81, 82, 83, 84])
+        self.assertEqual(rows[0]['fantasy_points'], {'ppr': 12.5})
+
+    @mock.patch('nfl.export.CHUNK_SIZE', 2)
+    def test_parquet_is_written_a_row_group_at_a_time(self):
+        _, content = self.download('gamelogs', 'parquet', season_year=2025)
+
+        parquet = pq.ParquetFile(BytesIO(b''.join(content)))
+        table = parquet.read()
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        self.assertGreater(len(content), 3)
+        self.assertEqual(sorted(table.column('rec_yards').to_pylist()), [80, 81, 82, 83, 84])
+        self.assertEqual(str(table.schema.field('game_date').type), 'timestamp[us, tz=UTC]')
+
+    def test_team_stats(self):
+        TeamOffensePassingStatsFactory(team=self.player.team, pass_yards=4100)
+
+        _, content = self.download('team-stats', 'parquet')
+
+        rows = {row['id']: row for row in pq.read_table(BytesIO(b''.join(content))).to_pylist()}
+        self.assertEqual(rows.pop(self.player.team.pk)['team_offense_passing__pass_yards'], 4100)
+        self.assertTrue(all(row['team_offense_passing__pass_yards'] is None for row in rows.values()))
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(reverse('nfl:export-view', args=['games', 'csv'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('nfl:export-view', args=['gamelogs', 'xlsx'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('nfl:export-view', args=['gamelogs', 'csv']), {'season_year': 'x'}).status_code, 400)
+
+    def test_command(self):
+        path = os.path.join(tempfile.mkdtemp(), 'gamelogs.csv')
+        out = StringIO()
+
+        call_command('export_stats', 'gamelogs', '--filter', 'season_year=2024', '-o', path, stdout=out)
+
+        with open(path) as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 1)
+        self.assertIn("Wrote", out.getvalue())
@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from io import StringIO
+from unittest import mock
+from nfl.fantasy import SCORING_PROFILES, fantasy_points, load_profiles
+from nfl.models import PlayerGameStats, PlayerSeasonAggregate
+from nfl.factories import PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.services.services import PlayerStats
+
+class ScoringTest(SimpleTestCase):
+    def test_profiles(self):
+        qb = {'pass_yards': 310, 'pass_touchdowns': 2, 'interceptions': 1, 'rush_yards': 12}
+        wr = {'receptions': 8, 'rec_yards': 95, 'rec_touchdowns': 1, 'fumbles_lost': 1}
+
+        qb_points, wr_points = fantasy_points([qb, wr])
+
+        self.assertEqual(qb_points['standard'], 20.6)
+        self.assertEqual(qb_points['draftkings'], 23.6)
+        self.assertEqual(wr_points['standard'], 13.5)
+        self.assertEqual(wr_points['half_ppr'], 17.5)
+        self.assertEqual(wr_points['ppr'], 21.5)
+        self.assertEqual(wr_points['draftkings'], 22.5)
+
+    def test_scraped_strings_and_dashes(self):
+        points, = fantasy_points([{'rush_yards': '45', 'rush_touchdowns': '-', 'receptions': None}])
+
+        self.assertEqual(points['ppr'], 4.5)
+
+    def test_empty(self):
+        self.assertEqual(fantasy_points([]), [])
+
+    @mock.patch.dict(SCORING_PROFILES)
+    def test_custom_profile(self):
+        load_profiles({'six_pt_pass': {'base': 'ppr', 'points': {'pass_touchdowns': 6}}})
+
+        self.assertEqual(SCORING_PROFILES['six_pt_pass']['points']['pass_touchdowns'], 6)
+        self.assertEqual(SCORING_PROFILES['six_pt_pass']['points']['receptions'], 1)
+
+    @mock.patch.dict(SCORING_PROFILES)
+    def test_custom_profile_errors(self):
+        for profile in [
+            {'base': 'ppr', 'points': {'pass_tds': 6}},
+            {'points': {'player': 1}},
+            {'bonuses': [['rush_yds', 100, 3]]},
+            {'base': 'superflex'},
+        ]:
+            with self.assertRaises(ImproperlyConfigured):
+                load_profiles({'custom': profile})
+
+        self.assertNotIn('custom', SCORING_PROFILES)
+
+# Factory QB lines would add random passing points
+NO_PASSING = {'pass_yards': 0, 'pass_touchdowns': 0, 'interceptions': 0}
+
+class FantasyPointsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_ingest_stores_points_per_profile(self):
+        game = GameFactory()
+        player = PlayerFactory(team=game.homeTeam)
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['receptions', 'receivingYards'],
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [{'eventId': game.event, 'stats': ['5', '60']}]}]}],
+        }}
+
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        points = PlayerGameStats.objects.get().fantasy_points
+        self.assertEqual((points['standard'], points['half_ppr'], points['ppr']), (6, 8.5, 11))
+
+    def test_gamelogs_sort_by_profile(self):
+        catches = PlayerGameStatsFactory(player=PlayerFactory(position="WR"), receptions=10, rec_yards=50, fantasy_points={'standard': 5, 'ppr': 15})
+        scores = PlayerGameStatsFactory(player=PlayerFactory(position="WR"), receptions=2, rec_yards=40, fantasy_points={'standard': 10, 'ppr': 12})
+        url = reverse('nfl:player-stats-gamelogs-view')
+
+        def order(profile):
+            body = self.client.get(url, {'position': 'WR', 'profile': profile, 'ordering': '-fantasy'}).json()
+            return [row['id'] for row in body['results']]
+
+        self.assertEqual(order('ppr'), [catches.pk, scores.pk])
+        self.assertEqual(order('standard'), [scores.pk, catches.pk])
+        self.assertEqual(self.client.get(url, {'profile': 'nope'}).status_code, 400)
+
+    def test_leaderboard_sorts_by_season_points(self):
+        busy, efficient = PlayerFactory(position="RB"), PlayerFactory(position="RB")
+        for _ in range(3):
+            PlayerGameStatsFactory(player=busy, rush_yards=50, **NO_PASSING)
+        PlayerGameStatsFactory(player=efficient, rush_yards=120, **NO_PASSING)
+        call_command('score_fantasy', stdout=StringIO())
+        url = reverse('nfl:player-leaderboard-view')
+
+        total = self.client.get(url, {'profile': 'standard', 'ordering': '-fantasy'}).json()['results']
+        per_game = self.client.get(url, {'profile': 'standard', 'ordering': '-fantasy_per_game'}).json()['results']
+
+        self.assertEqual([row['slug'] for row in total], [busy.slug, efficient.slug])
+        self.assertEqual([row['slug'] for row in per_game], [efficient.slug, busy.slug])
+        self.assertEqual(PlayerSeasonAggregate.objects.get(player=busy).fantasy_points_per_game['standard'], 5)
+
+    def test_rescore_command(self):
+        stats = PlayerGameStatsFactory(rush_yards=100, rush_touchdowns=1, fantasy_points={}, **NO_PASSING)
+
+        out = StringIO()
+        call_command('score_fantasy', stdout=out)
+
+        stats.refresh_from_db()
+        self.assertEqual(stats.fantasy_points['draftkings'], 19)
+        self.assertIn("Scored 1 gamelog rows", out.getvalue())
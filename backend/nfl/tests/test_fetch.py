@@ -0,0 +1,160 @@
+from asyncio import run
+from tempfile import TemporaryDirectory
+from unittest import mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from django.test import SimpleTestCase
+from nfl.services.fetch import Fetcher, FetchError
+from nfl.services.http_cache import HttpCache
+from nfl.services.services import PlayerStats
+
+class FetcherTest(SimpleTestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+
+    def serve(self, scenario, cache=None):
+        """
+        Runs scenario(fetcher, server) against a local server whose
+        /flaky route fails twice before answering and whose /etag route
+        honours If-None-Match.
+        """
+        hits = {'flaky': 0, 'etag': 0}
+
+        async def flaky(request):
+            hits['flaky'] += 1
+            if hits['flaky'] <= 2:
+                return web.Response(status=503)
+            return web.json_response({'ok': True})
+
+        async def missing(request):
+            return web.Response(status=404)
+
+        async def player(request):
+            if request.match_info['player_id'] == 'bad':
+                return web.Response(status=500)
+            return web.json_response({'id': request.match_info['player_id']})
+
+        async def etag(request):
+            hits['etag'] += 1
+            if request.headers.get('If-None-Match') == '"v1"':
+                return web.Response(status=304)
+            return web.json_response({'week': 1}, headers={'ETag': '"v1"'})
+
+        async def no_validators(request):
+            return web.json_response({'week': 1})
+
+        async def not_modified(request):
+            return web.Response(status=304)
+
+        async def main():
+            app = web.Application()
+            app.router.add_get('/flaky', flaky)
+            app.router.add_get('/etag', etag)
+            app.router.add_get('/no-validators', no_validators)
+            app.router.add_get('/not-modified', not_modified)
+            app.router.add_get('/missing', missing)
+            app.router.add_get('/players/{player_id}', player)
+            async with TestServer(app) as server:
+                async with Fetcher(max_retries=2, backoff_base=0.001, cache=cache) as fetcher:
+                    return await scenario(fetcher, server)
+
+        return run(main()), hits
+
+    def test_retries_server_errors(self):
+        async def scenario(fetcher, server):
+            return await fetcher.get_json(str(server.make_url('/flaky')))
+
+        data, hits = self.serve(scenario)
+
+        self.assertEqual(data, {'ok': True})
+        self.assertEqual(hits['flaky'], 3)
+
+    def test_client_errors_are_not_retried(self):
+        async def scenario(fetcher, server):
+            with self.assertRaises(FetchError):
+                await fetcher.get_json(str(server.make_url('/missing')))
+
+        self.serve(scenario)
+
+    def test_not_modified_without_cached_entry(self):
+        async def scenario(fetcher, server):
+            with self.assertRaisesMessage(FetchError, "HTTP 304 to a request with no cached response"):
+                await fetcher.get_json(str(server.make_url('/not-modified')))
+
+        self.serve(scenario, cache=HttpCache(self.cache_dir))
+
+    @mock.patch('nfl.services.services.FOLLOW_UP_DELAY', 0)
+    def test_generator_records_failed_ids(self):
+        stats = PlayerStats()
+
+        async def scenario(fetcher, server):
+            with mock.patch.object(PlayerStats, 'base_url', str(server.make_url('/players/')) + '{player_id}'):
+                await stats.spawn_tasks(fetcher, ['1', 'bad', '2'])
+
+        self.serve(scenario)
+
+        self.assertEqual(set(stats.raw), {'1', '2'})
+        self.assertEqual(stats.failed, ['bad'])
+
+    def sync_twice(self, path, flush=True):
+        """
+        Fetches path in two separate runs sharing one cache directory and
+        returns the data and unchanged flag seen by the second run.
+        """
+        async def scenario(fetcher, server):
+            url = str(server.make_url(path))
+            await fetcher.get_json(url)
+            self.assertFalse(fetcher.is_unchanged(url))
+            if flush:
+                fetcher.cache.flush()
+
+            async with Fetcher(cache=HttpCache(self.cache_dir)) as second:
+                return await second.get_json(url), second.is_unchanged(url)
+
+        return self.serve(scenario, cache=HttpCache(self.cache_dir))
+
+    def test_etag_round_trip(self):
+        (data, unchanged), hits = self.sync_twice('/etag')
+
+        self.assertEqual(data, {'week': 1})
+        self.assertTrue(unchanged)
+        self.assertEqual(hits['etag'], 2)
+
+    def test_identical_body_without_validators(self):
+        (data, unchanged), _ = self.sync_twice('/no-validators')
+
+        self.assertEqual(data, {'week': 1})
+        self.assertTrue(unchanged)
+
+    def test_nothing_is_stored_until_flush(self):
+        (data, unchanged), _ = self.sync_twice('/etag', flush=False)
+
+        self.assertEqual(data, {'week': 1})
+        self.assertFalse(unchanged)
+
+    def test_forget_drops_staged_and_stored_entries(self):
+        cache = HttpCache(self.cache_dir)
+        cache.stage('http://example.com/a', None, '"v1"', None, '{}')
+        cache.stage('http://example.com/b', None, '"v1"', None, '{}')
+        cache.flush()
+
+        cache.stage('http://example.com/b', cache.lookup('http://example.com/b'), '"v2"', None, '[]')
+        cache.forget('http://example.com/a')
+        cache.forget('http://example.com/b')
+        cache.flush()
+
+        self.assertIsNone(cache.lookup('http://example.com/a'))
+        self.assertIsNone(cache.lookup('http://example.com/b'))
+
+    def test_disabled_cache(self):
+        cache = HttpCache(None)
+        self.assertIsNone(cache.lookup('http://example.com'))
+        self.assertFalse(cache.stage('http://example.com', None, '"v1"', None, '{}'))
+
+        with mock.patch.object(HttpCache, 'write') as write:
+            cache.flush()
+
+        write.assert_not_called()
+        self.assertEqual(cache.pending, {})
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+
+class TradedPlayerFilterTest(TestCase):
+    """
+    Opponent and location come from the team the player had in that game,
+    not the one they are on now.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.game = GameFactory(season_year=2025)
+        self.player = PlayerFactory(team=self.game.homeTeam, position="WR")
+        PlayerGameStatsFactory(player=self.player, game=self.game)
+        self.player.team = TeamFactory()
+        self.player.save()
+
+    def gamelogs(self, **params):
+        response = self.client.get(reverse('nfl:player-stats-gamelogs-view'), dict(position="WR", **params))
+        return [row['id'] for row in response.json()['results']]
+
+    def test_opponent_and_location(self):
+        away = self.game.awayTeam.abbreviation
+
+        self.assertEqual(len(self.gamelogs(opponent=away, location='home')), 1)
+        self.assertEqual(self.gamelogs(opponent=away, location='away'), [])
+        self.assertEqual(self.gamelogs(opponent=self.game.homeTeam.abbreviation), [])
+
+    def test_player_detail_location(self):
+        url = reverse('nfl:player-game-stats-view', args=[self.player.pk, self.player.slug])
+
+        home = self.client.get(url, {'season_year': 2025, 'location': 'home'}).json()
+        away = self.client.get(url, {'season_year': 2025, 'location': 'away'}).json()
+
+        self.assertEqual(len(home['stats']), 1)
+        self.assertEqual(away['stats'], [])
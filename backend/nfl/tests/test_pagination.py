@@ -0,0 +1,134 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from nfl.models import PlayerGameStats
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.pagination import GamelogKeysetPagination, PlayerGameStatsMatchupsPagination
+from nfl.services.services import sync_game_dates, sync_matchups
+
+class GamelogKeysetPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('nfl:player-stats-gamelogs-view')
+        self.addCleanup(setattr, GamelogKeysetPagination, 'page_size', GamelogKeysetPagination.page_size)
+
+        kickoff = timezone.now()
+        for week in range(3):
+            game = GameFactory(date=kickoff - timedelta(weeks=week), season_year=2025)
+            # Several rows per game so pages split rows sharing a game_date
+            for _ in range(3):
+                PlayerGameStatsFactory(player=PlayerFactory(position="QB"), game=game)
+
+    def pages(self, page_size):
+        GamelogKeysetPagination.page_size = page_size
+        ids, pages = [], 0
+        response = self.client.get(self.url, {'cursor': ''})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            ids.extend(row['id'] for row in body['results'])
+            pages += 1
+            if body['next'] is None:
+                return ids, pages
+            response = self.client.get(body['next'])
+
+    def test_pages_cover_every_row_once_newest_first(self):
+        ids, pages = self.pages(page_size=2)
+
+        expected = list(PlayerGameStats.objects.order_by('-game_date', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 5)
+
+    def test_first_page_has_count_later_pages_do_not(self):
+        GamelogKeysetPagination.page_size = 4
+
+        first = self.client.get(self.url, {'cursor': ''}).json()
+        second = self.client.get(first['next']).json()
+
+        self.assertEqual(first['count'], 9)
+        self.assertIsNone(second['count'])
+        self.assertIsNone(second['previous'])
+
+    @override_settings(ALLOWED_HOSTS=['nfl.example.com', 'www.example.com'])
+    def test_links_are_relative(self):
+        GamelogKeysetPagination.page_size = 4
+
+        first = self.client.get(self.url, {'cursor': ''}, HTTP_HOST='nfl.example.com').json()
+        cached = self.client.get(self.url, {'cursor': ''}, HTTP_HOST='www.example.com').json()
+
+        self.assertTrue(first['next'].startswith(f'{self.url}?cursor='))
+        self.assertEqual(cached['next'], first['next'])
+
+    @mock.patch.object(PlayerGameStatsMatchupsPagination, 'page_size', 4)
+    def test_page_number_links_are_relative(self):
+        body = self.client.get(self.url, {'page': 2}).json()
+
+        self.assertEqual(body['next'], f'{self.url}?page=3')
+        self.assertEqual(body['previous'], self.url)
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ['not-a-cursor', 'bm90fGFueXRoaW5n']:
+            self.assertEqual(self.client.get(self.url, {'cursor': cursor}).status_code, 404)
+
+    def test_page_numbers_without_cursor(self):
+        body = self.client.get(self.url, {'page': 1}).json()
+
+        self.assertEqual(body['count'], 9)
+        self.assertIsNone(body['next'])
+
+    def test_deep_page_query_count(self):
+        GamelogKeysetPagination.page_size = 1
+        last = PlayerGameStats.objects.order_by('game_date', '-id').first()
+        cursor = GamelogKeysetPagination().encode_cursor(last.game_date + timedelta(seconds=1), 0)
+
+        cache.clear()
+        # page joined to player, team, game and both teams
+        # + spreads, moneylines, totals for each of the three teams
+        with self.assertNumQueries(10):
+            response = self.client.get(self.url, {'cursor': cursor})
+        self.assertEqual([row['id'] for row in response.json()['results']], [last.pk])
+
+class BackfillTest(TestCase):
+    def test_backfills_missing_dates(self):
+        stats = PlayerGameStatsFactory()
+        PlayerGameStats.objects.filter(pk=stats.pk).update(game_date=None)
+
+        self.assertEqual(sync_game_dates(), 1)
+        stats.refresh_from_db()
+        self.assertEqual(stats.game_date, stats.game.date)
+        self.assertEqual(sync_game_dates(), 0)
+
+    def test_follows_rescheduled_game(self):
+        stats = PlayerGameStatsFactory()
+        moved = stats.game.date + timedelta(days=1)
+        type(stats.game).objects.filter(pk=stats.game_id).update(date=moved)
+
+        sync_game_dates([stats.game_id])
+
+        stats.refresh_from_db()
+        self.assertEqual(stats.game_date, moved)
+
+    def test_backfills_missing_matchups(self):
+        game = GameFactory()
+        stats = PlayerGameStatsFactory(game=game, player=PlayerFactory(team=game.homeTeam))
+        PlayerGameStats.objects.filter(pk=stats.pk).update(team_at_game_time=None, opponent=None, is_home=None)
+
+        self.assertEqual(sync_matchups(), 1)
+        stats.refresh_from_db()
+        self.assertEqual((stats.team_at_game_time_id, stats.opponent_id, stats.is_home), (game.homeTeam_id, game.awayTeam_id, True))
+
+    def test_backfill_trusts_recorded_side(self):
+        game = GameFactory()
+        stats = PlayerGameStatsFactory(game=game, player=PlayerFactory(team=game.awayTeam))
+        PlayerGameStats.objects.filter(pk=stats.pk).update(team_at_game_time=None)
+        stats.player.team = TeamFactory()
+        stats.player.save()
+
+        sync_matchups()
+
+        stats.refresh_from_db()
+        self.assertEqual((stats.team_at_game_time_id, stats.opponent_id, stats.is_home), (game.awayTeam_id, game.homeTeam_id, False))
@@ -0,0 +1,102 @@
+from asyncio import run, sleep
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from django.test import SimpleTestCase
+from nfl.services.services import NFLPipeline, Teams, Players, PlayerStats, Events, OffensePassing, DefenseRushing
+
+class Timed(object):
+    """
+    Replaces the network call with a short sleep and records when
+    each endpoint started and finished.
+    """
+    log: dict = {}
+
+    async def timed(self, result=None):
+        start = perf_counter()
+        await sleep(0.05)
+        Timed.log[type(self).__name__] = (start, perf_counter())
+        return result
+
+class FakeTeams(Timed, Teams):
+    async def send_api_request(self, session):
+        return await self.timed(['1', '2'])
+
+class FakePlayers(Timed, Players):
+    depends_on = FakeTeams
+
+    async def spawn_tasks(self, session, team_ids):
+        self.inputs = team_ids
+        return await self.timed(['10', '20'])
+
+class FakePlayerStats(Timed, PlayerStats):
+    depends_on = FakePlayers
+
+    async def spawn_tasks(self, session, player_ids):
+        self.inputs = player_ids
+        return await self.timed()
+
+class FakeEvents(Timed, Events):
+    async def spawn_tasks(self, session, upcoming_week):
+        return await self.timed()
+
+class FakeOffensePassing(Timed, OffensePassing):
+    async def send_api_request(self, session, executor=None):
+        return await self.timed()
+
+class FakeDefenseRushing(Timed, DefenseRushing):
+    async def send_api_request(self, session, executor=None):
+        return await self.timed()
+
+class ExtractDataTest(SimpleTestCase):
+    def setUp(self):
+        Timed.log = {}
+        self.pipeline = NFLPipeline(upcoming_week=5)
+        self.players, self.stats = FakePlayers(), FakePlayerStats()
+
+        self.pipeline.create_endpoint(FakeTeams())
+        self.pipeline.create_generator(FakeEvents())
+        self.pipeline.create_generator(self.players)
+        self.pipeline.create_generator(self.stats)
+        self.pipeline.create_endpoint(FakeOffensePassing())
+        self.pipeline.create_endpoint(FakeDefenseRushing())
+
+    def test_dependency_chain_passes_results_downstream(self):
+        run(self.pipeline.extract_data())
+
+        self.assertEqual(self.players.inputs, ['1', '2'])
+        self.assertEqual(self.stats.inputs, ['10', '20'])
+        self.assertGreaterEqual(Timed.log['FakePlayers'][0], Timed.log['FakeTeams'][1])
+        self.assertGreaterEqual(Timed.log['FakePlayerStats'][0], Timed.log['FakePlayers'][1])
+
+    def test_independent_endpoints_overlap(self):
+        run(self.pipeline.extract_data())
+
+        teams_end = Timed.log['FakeTeams'][1]
+        for name in ('FakeEvents', 'FakeOffensePassing', 'FakeDefenseRushing'):
+            self.assertLess(Timed.log[name][0], teams_end)
+
+class FakeFetcher(object):
+    def __init__(self, html):
+        self.html = html
+
+    async def get_text(self, url):
+        return self.html
+
+    def is_unchanged(self, url):
+        return False
+
+class ScraperParsingTest(SimpleTestCase):
+    html = """
+        <table>
+            <tr><th>Team</th><th>Att</th></tr>
+            <tr><td>LionsLions</td><td>400</td></tr>
+        </table>
+    """
+
+    def test_parses_in_worker_process(self):
+        endpoint = OffensePassing()
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            run(endpoint.send_api_request(FakeFetcher(self.html), executor=executor))
+
+        self.assertEqual(endpoint.raw, [{'Team': 'Lions', 'Att': '400'}])
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from nfl.filters import PlayerMatchupsFilter, UpcomingGameFilter
+from nfl.models import Team, Player, Game, PlayerGameStats
+import re
+
+SEASONS = [2023, 2024, 2025]
+WEEKS = 17
+POSITIONS = ['QB', 'RB', 'WR', 'TE']
+TEAMS = 8
+
+# Tables that grow every week, a full scan of either is a regression
+BIG_TABLES = {PlayerGameStats._meta.db_table, Game._meta.db_table}
+
+def full_scans(queryset) -> set[str]:
+    """
+    Tables the database reads end to end for a queryset. Postgres is told
+    to avoid sequential scans so one only shows up when no index fits.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0][0]['Plan']
+            finally:
+                cursor.execute("RESET enable_seqscan")
+            return set(seq_scans(plan))
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        scans = set()
+        for *_, detail in cursor.fetchall():
+            match = re.match(r'SCAN (\w+)(?: AS \w+)?$', detail)
+            if match:
+                scans.add(match.group(1))
+        return scans
+
+def seq_scans(plan: dict):
+    if plan['Node Type'] == 'Seq Scan':
+        yield plan['Relation Name']
+    for child in plan.get('Plans', []):
+        yield from seq_scans(child)
+
+class QueryPlanTest(TestCase):
+    """
+    Runs the hot filters against a few seasons of synthetic games and
+    fails when one of them falls back to scanning a big table.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        teams = Team.objects.bulk_create([
+            Team(slug=f"team-{i}", full_name=f"Team {i}", abbreviation=f"T{i}") for i in range(TEAMS)
+        ])
+        players = Player.objects.bulk_create([
+            Player(slug=f"{team.abbreviation}-{position}-{n}".lower(), full_name=f"{team.abbreviation} {position} {n}", position=position, team=team)
+            for team in teams for position in POSITIONS for n in range(2)
+        ])
+        roster = {team.pk: [player for player in players if player.team_id == team.pk] for team in teams}
+
+        games = []
+        for season_year in SEASONS:
+            kickoff = timezone.make_aware(datetime(season_year, 9, 7))
+            for week in range(1, WEEKS + 1):
+                for i in range(0, TEAMS, 2):
+                    home, away = teams[(i + week) % TEAMS], teams[(i + week + 1) % TEAMS]
+                    games.append(Game(
+                        date=kickoff + timedelta(weeks=week - 1, hours=i), name="", short_name="",
+                        season_year=season_year, season_type=2, week=week,
+                        homeTeam=home, awayTeam=away, status="Final", event=f"{season_year}-{week}-{i}",
+                    ))
+        games = Game.objects.bulk_create(games)
+
+        stats = []
+        for game in games:
+            for team_id in (game.homeTeam_id, game.awayTeam_id):
+                opponent_id, is_home = game.matchup(team_id)
+                stats.extend(
+                    PlayerGameStats(player=player, game=game, game_date=game.date, opponent_id=opponent_id, is_home=is_home)
+                    for player in roster[team_id]
+                )
+        PlayerGameStats.objects.bulk_create(stats)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def gamelogs(self, **params):
+        return PlayerMatchupsFilter(params, queryset=PlayerGameStats.objects.all()).qs.order_by('-game_date', '-id')[:51]
+
+    def assertNoFullScans(self, queryset):
+        self.assertFalse(full_scans(queryset) & BIG_TABLES, str(queryset.query))
+
+    def test_dataset_is_multi_season(self):
+        self.assertEqual(PlayerGameStats.objects.values('game__season_year').distinct().count(), len(SEASONS))
+        self.assertEqual(PlayerGameStats.objects.count(), len(SEASONS) * WEEKS * TEAMS * len(POSITIONS) * 2)
+
+    def test_gamelog_opponent(self):
+        self.assertNoFullScans(self.gamelogs(opponent='T3'))
+
+    def test_gamelog_dashboard_query(self):
+        self.assertNoFullScans(self.gamelogs(position='WR', opponent='T3', season_year=2025, season_type=2, location='away'))
+
+    def test_gamelog_season(self):
+        self.assertNoFullScans(PlayerMatchupsFilter({'season_year': 2024, 'season_type': 2}, queryset=PlayerGameStats.objects.all()).qs)
+
+    def test_gamelog_keyset_page(self):
+        self.assertNoFullScans(self.gamelogs())
+
+    def test_upcoming_games(self):
+        self.assertNoFullScans(UpcomingGameFilter({'week': 5, 'status': 'Final'}, queryset=Game.objects.all()).qs)
+
+    def test_detects_full_scan(self):
+        self.assertIn(PlayerGameStats._meta.db_table, full_scans(PlayerGameStats.objects.order_by().filter(pass_yards__gt=300)))
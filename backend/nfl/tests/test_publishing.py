@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from io import BytesIO, StringIO
+from unittest import mock
+from nfl.factories import PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.publishing import PUBLISH_LOCK, PublishInProgress, publish_snapshots
+from nfl.tasks import publish_api_snapshots
+import brotli
+import gzip
+import json
+import os
+import pyarrow.parquet as pq
+import tempfile
+
+@override_settings(ALLOWED_HOSTS=['nfl.example.com', 'testserver'], WARM_HOST='nfl.example.com')
+class PublishSnapshotsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.root = tempfile.mkdtemp()
+        patcher = mock.patch('nfl.publishing.SNAPSHOT_ROOT', self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.game = GameFactory(season_year=2025, season_type=2, week=3, status="Final")
+        self.player = PlayerFactory(team=self.game.homeTeam)
+        PlayerGameStatsFactory(player=self.player, game=self.game)
+
+    def read(self, url):
+        with open(os.path.join(self.root, url.removeprefix('/snapshots/')), 'rb') as f:
+            return f.read()
+
+    def test_files_match_the_api(self):
+        files = publish_snapshots()['files']
+
+        self.assertEqual(self.read(files['teams.json']), self.client.get(reverse('nfl:team-list-api-view')).content)
+        self.assertEqual(self.read(files['events/3.json']), self.client.get(reverse('nfl:events-view'), {'week': 3}).content)
+        player = self.client.get(reverse('nfl:player-game-stats-view', args=[self.player.pk, self.player.slug])).content
+        self.assertEqual(self.read(files[f'players/{self.player.pk}.json']), player)
+        self.assertIn('ranks.json', files)
+        self.assertEqual(pq.read_table(BytesIO(self.read(files['gamelogs.parquet']))).num_rows, 1)
+
+    def test_precompressed_and_content_hashed(self):
+        files = publish_snapshots()['files']
+        data = self.read(files['teams.json'])
+
+        self.assertRegex(files['teams.json'], r'^/snapshots/teams\.[0-9a-f]{16}\.json$')
+        self.assertEqual(gzip.decompress(self.read(files['teams.json'] + '.gz')), data)
+        self.assertEqual(brotli.decompress(self.read(files['teams.json'] + '.br')), data)
+        self.assertEqual(json.loads(self.read('/snapshots/manifest.json'))['files'], files)
+
+    def test_old_files_are_kept_one_round(self):
+        first = publish_snapshots()['files']
+        self.assertEqual(publish_snapshots()['files'], first)
+
+        self.game.homeTeam.full_name = "Renamed"
+        self.game.homeTeam.save()
+        cache.clear()
+        second = publish_snapshots()['files']
+        self.assertNotEqual(second['teams.json'], first['teams.json'])
+        self.assertTrue(os.path.exists(os.path.join(self.root, first['teams.json'].removeprefix('/snapshots/'))))
+
+        publish_snapshots()
+        self.assertFalse(os.path.exists(os.path.join(self.root, first['teams.json'].removeprefix('/snapshots/'))))
+        self.assertFalse(os.path.exists(os.path.join(self.root, first['teams.json'].removeprefix('/snapshots/') + '.br')))
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command('publish_snapshots', stdout=out)
+
+        self.assertIn("Published", out.getvalue())
+
+    def test_overlapping_publish_is_refused(self):
+        cache.add(PUBLISH_LOCK, 'other run')
+
+        with self.assertRaises(PublishInProgress):
+            publish_snapshots()
+        with self.assertRaises(CommandError):
+            call_command('publish_snapshots', stdout=StringIO())
+
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertEqual(cache.get(PUBLISH_LOCK), 'other run')
+
+    def test_lock_released_after_publish(self):
+        with mock.patch('nfl.publishing.snapshot_tables', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                publish_snapshots()
+
+        self.assertIsNone(cache.get(PUBLISH_LOCK))
+        publish_snapshots()
+        self.assertIsNone(cache.get(PUBLISH_LOCK))
+
+    def test_task_retries_while_locked(self):
+        cache.add(PUBLISH_LOCK, 'other run')
+
+        with mock.patch.object(publish_api_snapshots, 'retry', side_effect=RuntimeError) as retry:
+            with self.assertRaises(RuntimeError):
+                publish_api_snapshots()
+
+        self.assertIsInstance(retry.call_args.kwargs['exc'], PublishInProgress)
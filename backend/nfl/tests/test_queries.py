@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nfl.models import Game, PointSpread, Moneyline, Total
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory, TeamOffensePassingStatsFactory
+from nfl.planner import plan_queryset
+from nfl.serializers import GameSerializer
+
+class QueryCountTest(TestCase):
+    """
+    Every endpoint runs the same number of queries however many rows it
+    renders.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.player = PlayerFactory(position="QB")
+
+    def add_rows(self, n):
+        for _ in range(n):
+            home, away = TeamFactory(), TeamFactory()
+            for team in (home, away):
+                PointSpread.objects.create(team=team, display_name="Spread")
+                Moneyline.objects.create(team=team, display_name="Moneyline")
+                Total.objects.create(team=team, display_name="Total")
+            game = GameFactory(homeTeam=home, awayTeam=away, week=1, season_year=2025)
+            PlayerGameStatsFactory(player=self.player, game=game)
+            PlayerGameStatsFactory(player=PlayerFactory(team=home, position="QB"), game=game)
+
+    def count(self, url, params=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertFixedQueries(self, expected, url, params=None):
+        self.add_rows(1)
+        self.assertEqual(self.count(url, params), expected)
+        self.add_rows(4)
+        self.assertEqual(self.count(url, params), expected)
+
+    def test_teams(self):
+        # teams + spreads, moneylines, totals
+        self.assertFixedQueries(4, reverse('nfl:team-list-api-view'))
+
+    def test_events(self):
+        # games joined to both teams + three prefetches per side
+        self.assertFixedQueries(7, reverse('nfl:events-view'), {'week': 1})
+
+    def test_gamelogs(self):
+        # count + page joined to player, team, game and both teams
+        # + spreads, moneylines, totals for each of the three teams
+        self.assertFixedQueries(11, reverse('nfl:player-stats-gamelogs-view'), {'position': 'QB'})
+
+    def test_player_detail(self):
+        url = reverse('nfl:player-game-stats-view', args=[self.player.pk, self.player.slug])
+        # player joined to team + stats joined to game and both teams
+        self.assertFixedQueries(2, url, {'season_year': 2025})
+
+    def test_player_search(self):
+        # the cleared cache moves the tag on: one index rebuild, players joined to team
+        self.assertFixedQueries(1, reverse('nfl:player-list-api-view'), {'fullName': 'a'})
+
+    def test_team_stats(self):
+        self.assertFixedQueries(1, reverse('nfl:team-stats-view'))
+
+    def test_team_stats_with_missing_tables(self):
+        TeamOffensePassingStatsFactory(team=self.player.team, pass_yards=4100)
+        TeamFactory()
+
+        with self.assertNumQueries(1):
+            teams = self.client.get(reverse('nfl:team-stats-view')).json()
+
+        passing = {team['id']: team['team_offense_passing'] for team in teams}
+        self.assertEqual(passing.pop(self.player.team.pk)['pass_yards'], 4100)
+        self.assertEqual(list(passing.values()), [None])
+        self.assertTrue(all(team['team_coverage_rates'] is None for team in teams))
+
+    def test_team_ranks(self):
+        self.assertFixedQueries(1, reverse('nfl:team-stats-ranks-view'))
+
+class PlanQuerysetTest(TestCase):
+    def test_plan_from_serializer_nesting(self):
+        queryset = plan_queryset(Game.objects.all(), GameSerializer)
+
+        self.assertEqual(queryset.query.select_related, {'homeTeam': {}, 'awayTeam': {}})
+        self.assertEqual(
+            sorted(lookup.prefetch_to for lookup in queryset._prefetch_related_lookups),
+            ['awayTeam__moneyline', 'awayTeam__point_spread', 'awayTeam__total',
+             'homeTeam__moneyline', 'homeTeam__point_spread', 'homeTeam__total'],
+        )
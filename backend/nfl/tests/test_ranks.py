@@ -0,0 +1,46 @@
+from unittest import mock
+from django.test import TestCase
+from nfl.models import TeamRankSnapshot, TeamDefenseRushingStats
+from nfl.factories import TeamFactory, TeamOffensePassingStatsFactory
+from nfl.tasks import update_team_rank_snapshots
+
+@mock.patch('nfl.tasks.warm_api_cache.delay')
+class TeamRankSnapshotTest(TestCase):
+    def setUp(self):
+        self.best, self.worst, self.missing = TeamFactory(), TeamFactory(), TeamFactory()
+        TeamOffensePassingStatsFactory(team=self.best, pass_yards=4500, pass_touchdowns=30)
+        TeamOffensePassingStatsFactory(team=self.worst, pass_yards=3200, pass_touchdowns=30)
+        TeamDefenseRushingStats.objects.create(team=self.best, rush_yards=2100)
+        TeamDefenseRushingStats.objects.create(team=self.worst, rush_yards=1500)
+
+    def snapshot(self, team):
+        return TeamRankSnapshot.objects.get(team=team)
+
+    def test_ranks_every_team_in_one_pass(self, warm):
+        TeamRankSnapshot.objects.create(team=self.best, off_pass_yards_rank=9)
+
+        update_team_rank_snapshots()
+
+        self.assertEqual(TeamRankSnapshot.objects.count(), 3)
+        self.assertEqual(self.snapshot(self.best).off_pass_yards_rank, 1)
+        self.assertEqual(self.snapshot(self.worst).off_pass_yards_rank, 2)
+        self.assertEqual(self.snapshot(self.worst).def_rush_yards_rank, 1)
+        self.assertEqual(self.snapshot(self.best).off_pass_tds_rank, self.snapshot(self.worst).off_pass_tds_rank)
+        warm.assert_called_once()
+
+    def test_team_missing_from_a_table_gets_zero(self, warm):
+        update_team_rank_snapshots()
+
+        self.assertEqual(self.snapshot(self.missing).off_pass_yards_rank, 0)
+        self.assertEqual(self.snapshot(self.missing).def_rush_yards_rank, 0)
+
+    def test_single_select_and_single_write(self, warm):
+        # latest game, ranks SELECT, savepoint, INSERT ... ON CONFLICT, release
+        with self.assertNumQueries(5):
+            update_team_rank_snapshots()
+
+    def test_failed_update_does_not_warm(self, warm):
+        with mock.patch.object(TeamRankSnapshot.objects, 'bulk_create', side_effect=Exception("boom")):
+            update_team_rank_snapshots()
+
+        warm.assert_not_called()
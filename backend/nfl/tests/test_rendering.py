@@ -0,0 +1,77 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from io import StringIO
+from rest_framework.renderers import JSONRenderer
+from nfl.models import Game, PlayerGameStats, PlayerSeasonAggregate, PointSpread
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.rendering import FastJSONRenderer, row_plan
+from nfl.serializers import (
+    GameSerializer, PlayerGameStatsMatchupsSerializer, PlayerSeasonAggregateSerializer, DefenseVsPositionSerializer,
+)
+from nfl.services.aggregates import build_player_season_aggregates
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_matches_stock_renderer(self):
+        data = {'name': "Amon-Ra St. Brown \u2028Jaxon Smith-Njigba é", 'yards': Decimal('12.50'), 'ok': True, 'none': None, 'rows': [1, 2.5]}
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_uses_stock_renderer(self):
+        data = {'a': [1, 2]}
+
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+class RowPlanTest(TestCase):
+    """
+    Lists built from values() rows render to the same bytes as the
+    serializer does from model instances.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        home = TeamFactory(full_name="Montréal Étoiles")
+        game = GameFactory(homeTeam=home, name="Étoiles \u2029at home")
+        PointSpread.objects.create(team=home, display_name="Open", open_line="-3.5")
+        PointSpread.objects.create(team=home, display_name="Close", open_line="-4")
+        for _ in range(3):
+            PlayerGameStatsFactory(player=PlayerFactory(team=home), game=game, fantasy_points={'ppr': 12.4})
+        PlayerGameStatsFactory(player=PlayerFactory(team=game.awayTeam), game=game)
+        build_player_season_aggregates()
+
+    def assertSameBytes(self, serializer_class, queryset):
+        plan = row_plan(serializer_class)
+        fast = FastJSONRenderer().render(plan.render(plan.values(queryset)))
+        stock = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(fast, stock)
+
+    def test_gamelogs(self):
+        self.assertSameBytes(PlayerGameStatsMatchupsSerializer, PlayerGameStats.objects.all())
+
+    def test_events(self):
+        self.assertSameBytes(GameSerializer, Game.objects.all())
+
+    def test_leaderboard(self):
+        self.assertSameBytes(PlayerSeasonAggregateSerializer, PlayerSeasonAggregate.objects.all())
+
+    def test_method_fields_are_not_compiled(self):
+        self.assertIsNone(row_plan(DefenseVsPositionSerializer))
+
+    def test_paginated_endpoint(self):
+        response = self.client.get(reverse('nfl:player-stats-gamelogs-view'), {'page': 1})
+        queryset = PlayerGameStats.objects.all()[:5]
+
+        self.assertEqual(response.json()['results'], PlayerGameStatsMatchupsSerializer(queryset, many=True).data)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command('bench_rendering', rows=[4], repeat=1, stdout=out)
+
+        self.assertIn("4 rows", out.getvalue())
@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from io import StringIO
+from nfl.caching import changed_tags, invalidate
+from nfl.factories import TeamFactory, PlayerFactory, PlayerGameStatsFactory
+from nfl.search import PlayerIndex, words
+
+def player(i, full_name, games=0):
+    return {'id': i, 'slug': f'p{i}', 'fullName': full_name, 'position': 'WR', 'team': 'DET', 'games': games}
+
+class PlayerIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = PlayerIndex([
+            player(1, "Amon-Ra St. Brown", games=40),
+            player(2, "Ja'Marr Chase", games=50),
+            player(3, "Jameson Williams", games=30),
+            player(4, "Josh Allen", games=60),
+            player(5, "Josh Jacobs", games=20),
+            player(6, "Jalen Hurts", games=55),
+            player(7, "Equanimeous St. Brown", games=5),
+        ])
+
+    def search(self, query, limit=10):
+        return [row['id'] for row in self.index.search(query, limit)]
+
+    def test_words(self):
+        self.assertEqual(words("Amon-Ra St. Brown"), ['amonra', 'st', 'brown'])
+        self.assertEqual(words("  JA'MARR  chase "), ['jamarr', 'chase'])
+        self.assertEqual(words("Jérémy"), ['jeremy'])
+
+    def test_prefix_of_any_word(self):
+        self.assertEqual(self.search("brown"), [1, 7])
+        self.assertEqual(self.search("jamar"), [2])
+        self.assertEqual(self.search("ra"), [1])
+        self.assertEqual(self.search("amon-ra"), [1])
+        self.assertEqual(self.search("st brow"), [1, 7])
+        self.assertEqual(self.search("zz"), [])
+
+    def test_ranking_and_limit(self):
+        # Names starting with the query first, then players with more games
+        self.assertEqual(self.search("ja"), [6, 2, 3, 5])
+        self.assertEqual(self.search("josh"), [4, 5])
+        self.assertEqual(self.search("j", limit=2), [4, 6])
+        self.assertEqual(self.search("", limit=3), [4, 6, 2])
+
+    def test_slim_payload(self):
+        self.assertEqual(self.index.search("chase"), [{'id': 2, 'slug': 'p2', 'fullName': "Ja'Marr Chase", 'position': 'WR', 'team': 'DET'}])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command('bench_search', players=50, repeat=1, budget=1000, stdout=out)
+
+        self.assertIn("50 players", out.getvalue())
+
+class PlayerSearchEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('nfl:player-list-api-view')
+
+    def test_search(self):
+        starter = PlayerFactory(full_name="Josh Allen", team=TeamFactory(abbreviation="BUF"))
+        PlayerGameStatsFactory(player=starter)
+        PlayerFactory(full_name="Josh Jacobs")
+
+        players = self.client.get(self.url, {'fullName': 'jo', 'limit': 1}).json()['players']
+
+        self.assertEqual(players, [{'id': starter.pk, 'slug': starter.slug, 'fullName': "Josh Allen", 'position': starter.position, 'team': "BUF"}])
+        self.assertEqual(self.client.get(self.url, {'limit': 'all'}).status_code, 400)
+
+    def test_rebuilt_after_ingest(self):
+        self.assertEqual(self.client.get(self.url, {'fullName': 'puka'}).json()['players'], [])
+        PlayerFactory(full_name="Puka Nacua")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, {'fullName': 'puka'}).json()['players'], [])
+
+        invalidate(['players'])
+        self.assertEqual(len(self.client.get(self.url, {'fullName': 'puka'}).json()['players']), 1)
+
+    def test_stats_ingest_reorders_results(self):
+        allen, jacobs = PlayerFactory(full_name="Josh Allen"), PlayerFactory(full_name="Josh Jacobs")
+        PlayerGameStatsFactory(player=allen)
+        self.assertEqual([row['id'] for row in self.client.get(self.url, {'fullName': 'josh'}).json()['players']], [allen.pk, jacobs.pk])
+
+        invalidate(changed_tags([PlayerGameStatsFactory(player=jacobs), PlayerGameStatsFactory(player=jacobs)]))
+
+        self.assertEqual([row['id'] for row in self.client.get(self.url, {'fullName': 'josh'}).json()['players']], [jacobs.pk, allen.pk])
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.utils import timezone
+from django.test import TestCase
+from django.urls import reverse
+from nfl.models import Game, TeamWeeklySnapshot
+from nfl.factories import TeamFactory, GameFactory, TeamOffensePassingStatsFactory
+from nfl.tasks import update_team_rank_snapshots
+
+@mock.patch('nfl.tasks.warm_api_cache.delay')
+class TeamWeeklySnapshotTest(TestCase):
+    def setUp(self):
+        self.det, self.chi = TeamFactory(abbreviation="DET"), TeamFactory(abbreviation="CHI")
+        self.det_passing = TeamOffensePassingStatsFactory(team=self.det, pass_yards=300)
+        self.chi_passing = TeamOffensePassingStatsFactory(team=self.chi, pass_yards=200)
+
+    def sync_week(self, week, det_yards, chi_yards, season_year=2025):
+        date = timezone.make_aware(datetime(season_year, 9, 1)) + timedelta(weeks=week)
+        if not Game.objects.filter(date=date).exists():
+            GameFactory(homeTeam=self.det, awayTeam=self.chi, season_year=season_year, week=week, status="Final", date=date)
+        self.det_passing.pass_yards, self.chi_passing.pass_yards = det_yards, chi_yards
+        self.det_passing.save()
+        self.chi_passing.save()
+        update_team_rank_snapshots()
+
+    def test_each_week_is_kept(self, warm):
+        self.sync_week(1, 300, 200)
+        self.sync_week(2, 300, 400)
+        self.sync_week(2, 300, 450)
+
+        snapshots = TeamWeeklySnapshot.objects.filter(team=self.chi)
+        self.assertEqual([s.off_pass_yards_rank for s in snapshots], [2, 1])
+        self.assertEqual(snapshots.last().stats['team_offense_passing']['pass_yards'], 450)
+
+    def test_rank_history(self, warm):
+        self.sync_week(1, 300, 200)
+        self.sync_week(2, 300, 400)
+
+        response = self.client.get(reverse('nfl:team-rank-history-view', args=['CHI']), {'season_year': 2025})
+
+        self.assertEqual([(row['week'], row['off_pass_yards_rank']) for row in response.json()], [(1, 2), (2, 1)])
+
+    def test_week_over_week_deltas(self, warm):
+        self.sync_week(17, 100, 900, season_year=2024)
+        self.sync_week(1, 300, 200)
+        self.sync_week(2, 300, 400)
+        self.sync_week(3, 100, 500)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('nfl:team-rank-deltas-view'), {'season_year': 2025, 'week': 2})
+
+        rows = {row['abbreviation']: row for row in response.json()}
+        self.assertEqual(rows['CHI']['week'], 2)
+        self.assertEqual(rows['CHI']['ranks']['off_pass_yards_rank'], {'rank': 1, 'previous': 2, 'change': 1})
+        self.assertEqual(rows['DET']['ranks']['off_pass_yards_rank']['change'], -1)
+
+    def test_latest_deltas_span_seasons(self, warm):
+        self.sync_week(17, 100, 900, season_year=2024)
+        self.sync_week(1, 300, 200)
+
+        response = self.client.get(reverse('nfl:team-rank-deltas-view'))
+
+        rows = {row['abbreviation']: row for row in response.json()}
+        self.assertEqual((rows['CHI']['season_year'], rows['CHI']['week']), (2025, 1))
+        self.assertEqual(rows['CHI']['ranks']['off_pass_yards_rank']['previous'], 1)
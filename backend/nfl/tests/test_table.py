@@ -0,0 +1,64 @@
+from django.test import SimpleTestCase
+from nfl.services.table import Table
+
+NFL_PAGE = """
+<html><head><script>window.__INITIAL_DATA__ = {"table": "<table></table>"};</script></head>
+<body>
+  <table summary="Team stats">
+    <thead><tr><th>Team</th><th>Att</th><th>Cmp %</th></tr></thead>
+    <tbody>
+      <tr>
+        <td><div class="d3-o-club-info">
+          <div class="d3-o-club-fullname">Lions</div>
+          <div class="d3-o-club-shortname"> Lions </div>
+        </div></td>
+        <td>612</td><td>68.&#55;<!-- rounded --></td>
+      </tr>
+      <tr><td>Bears<span>Bears</span></td><td>590</td><td>61.2</td></tr>
+    </tbody>
+  </table>
+  <table><tr><th>Other</th></tr><tr><td>ignored</td></tr></table>
+</body></html>
+"""
+
+SUMER_PAGE = """
+<table>
+  <tr><th>Team</th><th>Season</th><th>EPA/Play</th><th>Success %</th></tr>
+  <tr><td><img alt=""> Detroit Lions</td><td>2025</td><td>0.21</td><td>49.1%</td></tr>
+  <tr><td>San Francisco 49ers</td><td>2025</td><td>0.12</td><td>46.0%</td></tr>
+  <tr><td>Short Row</td></tr>
+</table>
+"""
+
+SHARP_PAGE = """
+<div><table>
+  <thead><tr><th>Team</th><th>Man Rate</th></tr></thead>
+  <tbody>
+    <tr><td>Lions<style>.x{}</style></td><td><table><tr><td>31%</td></tr></table></td></tr>
+    <tr><td>Bears</td><td>28%<script>track()</script></td></tr>
+  </tbody>
+</table></div>
+"""
+
+class TableParserTest(SimpleTestCase):
+    def assertMatchesSoup(self, html, source):
+        table = Table(html=html, source=source)
+        self.assertEqual(table.parser, table.soup_parser)
+        return table.parser
+
+    def test_nfl_source(self):
+        rows = self.assertMatchesSoup(NFL_PAGE, 'nfl')
+        self.assertEqual(rows, [
+            {'Team': 'Lions', 'Att': '612', 'Cmp %': '68.7'},
+            {'Team': 'Bears', 'Att': '590', 'Cmp %': '61.2'},
+        ])
+
+    def test_sumer_source(self):
+        rows = self.assertMatchesSoup(SUMER_PAGE, 'sumer')
+        self.assertEqual([row['Team'] for row in rows], ['Lions', '49ers'])
+
+    def test_sharp_source_with_nested_table(self):
+        self.assertMatchesSoup(SHARP_PAGE, 'sharp')
+
+    def test_page_without_table(self):
+        self.assertEqual(Table(html="<p>maintenance</p>", source='nfl').parser, [])
@@ -0,0 +1,191 @@
+from django.test import TestCase
+from nfl.models import Team, Player, PlayerGameStats, TeamOffenseRushingStats
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.services.upsert import bulk_upsert
+from nfl.services.services import OffenseRushing, PlayerStats
+
+class BulkUpsertTest(TestCase):
+    def test_counts_created_and_updated(self):
+        TeamFactory(abbreviation="DET", full_name="Detroit Lions")
+        rows = [
+            {"slug": "detroit-lions", "full_name": "Detroit Lions", "nickname": "Lions", "abbreviation": "DET"},
+            {"slug": "chicago-bears", "full_name": "Chicago Bears", "nickname": "Bears", "abbreviation": "CHI"},
+        ]
+
+        result = bulk_upsert(Team, rows, unique_fields=['abbreviation'], label="TEAM")
+
+        self.assertEqual((result.created, result.updated), (1, 1))
+        self.assertEqual(Team.objects.count(), 2)
+        self.assertEqual(Team.objects.get(abbreviation="DET").nickname, "Lions")
+
+    def test_last_duplicate_row_wins(self):
+        game = GameFactory()
+        player = PlayerFactory(team=game.homeTeam)
+        rows = [
+            {"player": player, "game": game, "pass_yards": 100},
+            {"player": player, "game": game, "pass_yards": 250},
+        ]
+
+        result = bulk_upsert(PlayerGameStats, rows, unique_fields=['player', 'game'], label="PLAYER_STATS")
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(PlayerGameStats.objects.get().pass_yards, 250)
+
+    def test_matches_on_lookup_without_unique_constraint(self):
+        player = PlayerFactory(full_name="Traded Player")
+        new_team = TeamFactory()
+
+        result = bulk_upsert(
+            Player,
+            [{"full_name": "Traded Player", "slug": player.slug, "team": new_team}],
+            unique_fields=['full_name'],
+            label="PLAYER"
+        )
+
+        self.assertEqual(result.updated, 1)
+        self.assertEqual(Player.objects.get().team, new_team)
+
+    def test_batches_large_inputs(self):
+        game = GameFactory()
+        players = PlayerFactory.create_batch(7, team=game.homeTeam)
+        PlayerGameStatsFactory(player=players[0], game=game)
+        rows = [{"player": p, "game": game, "rush_yards": 10} for p in players]
+
+        result = bulk_upsert(PlayerGameStats, rows, unique_fields=['player', 'game'], label="PLAYER_STATS", batch_size=3)
+
+        self.assertEqual((result.created, result.updated), (6, 1))
+        self.assertEqual(PlayerGameStats.objects.filter(rush_yards=10).count(), 7)
+
+class TransformUpsertTest(TestCase):
+    def test_scraped_rows_are_upserted(self):
+        TeamFactory(nickname="Lions", abbreviation="DET")
+        endpoint = OffenseRushing()
+        endpoint.raw = [
+            {'Team': 'Lions', 'Att': '400', 'Rush Yds': '2000', 'YPC': '5.0', 'TD': '20', 'Rush FUM': '3'},
+            {'Team': 'Unknown', 'Att': '1', 'Rush Yds': '1', 'YPC': '1.0', 'TD': '0', 'Rush FUM': '0'},
+        ]
+
+        endpoint.transform()
+        endpoint.raw[0]['Rush Yds'] = '2100'
+        endpoint.res = []
+        endpoint.transform()
+
+        self.assertEqual(endpoint.result.updated, 1)
+        self.assertEqual(TeamOffenseRushingStats.objects.get().rush_yards, 2100)
+
+    def test_player_stats_record_matchup(self):
+        game = GameFactory()
+        player = PlayerFactory(team=game.awayTeam)
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['rushingYards'],
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [{'eventId': game.event, 'stats': ['45']}]}]}],
+        }}
+
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        stats = PlayerGameStats.objects.get()
+        self.assertEqual((stats.opponent_id, stats.is_home, stats.game_date), (game.homeTeam_id, False, game.date))
+        self.assertEqual(stats.team_at_game_time_id, game.awayTeam_id)
+
+    def test_traded_player_keeps_team_at_game_time(self):
+        game = GameFactory()
+        player = PlayerFactory(team=game.homeTeam)
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['rushingYards'],
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [{'eventId': game.event, 'stats': ['45']}]}]}],
+        }}
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        player.team = game.awayTeam
+        player.save()
+        endpoint.raw['p1']['seasonTypes'][0]['categories'][0]['events'][0]['stats'] = ['60']
+        endpoint.res = []
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        stats = PlayerGameStats.objects.get()
+        self.assertEqual(stats.rush_yards, 60)
+        self.assertEqual((stats.team_at_game_time_id, stats.opponent_id, stats.is_home), (game.homeTeam_id, game.awayTeam_id, True))
+
+    def test_pre_trade_games_ingested_after_trade(self):
+        game = GameFactory()
+        player = PlayerFactory(team=TeamFactory())
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['rushingYards'],
+            'events': {game.event: {'atVs': 'vs', 'team': {'abbreviation': game.homeTeam.abbreviation}}},
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [{'eventId': game.event, 'stats': ['45']}]}]}],
+        }}
+
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        stats = PlayerGameStats.objects.get()
+        self.assertEqual((stats.team_at_game_time_id, stats.opponent_id, stats.is_home), (game.homeTeam_id, game.awayTeam_id, True))
+
+    def test_event_side_without_abbreviation(self):
+        game = GameFactory()
+        player = PlayerFactory(team=TeamFactory())
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['rushingYards'],
+            'events': {game.event: {'atVs': '@', 'team': {'abbreviation': 'UNK'}}},
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [{'eventId': game.event, 'stats': ['45']}]}]}],
+        }}
+
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}])
+
+        stats = PlayerGameStats.objects.get()
+        self.assertEqual((stats.team_at_game_time_id, stats.opponent_id, stats.is_home), (game.awayTeam_id, game.homeTeam_id, False))
+
+    def test_players_with_missing_games_are_incomplete(self):
+        game = GameFactory()
+        player = PlayerFactory(team=game.homeTeam)
+        endpoint = PlayerStats()
+        endpoint.raw = {'p1': {
+            'names': ['rushingYards'],
+            'seasonTypes': [{'categories': [{'splitType': '2', 'events': [
+                {'eventId': game.event, 'stats': ['45']},
+                {'eventId': 'not-ingested', 'stats': ['30']},
+            ]}]}],
+        }, 'p2': {'names': [], 'seasonTypes': []}}
+
+        endpoint.transform([{'player_id': 'p1', 'full_name': player.full_name}, {'player_id': 'p2', 'full_name': "Nobody"}])
+
+        self.assertEqual(PlayerGameStats.objects.count(), 1)
+        self.assertEqual(endpoint.incomplete, {'p1', 'p2'})
+
+class ChangeDetectionTest(TestCase):
+    rows = [
+        {"slug": "detroit-lions", "full_name": "Detroit Lions", "nickname": "Lions", "abbreviation": "DET"},
+        {"slug": "chicago-bears", "full_name": "Chicago Bears", "nickname": "Bears", "abbreviation": "CHI"},
+    ]
+
+    def test_identical_rows_are_skipped(self):
+        bulk_upsert(Team, self.rows, unique_fields=['abbreviation'], label="TEAM")
+
+        with self.assertNumQueries(2):
+            result = bulk_upsert(Team, self.rows, unique_fields=['abbreviation'], label="TEAM")
+
+        self.assertEqual((result.created, result.updated, result.skipped), (0, 0, 2))
+        self.assertEqual(result.objects, [])
+
+    def test_only_changed_rows_are_written(self):
+        bulk_upsert(Team, self.rows, unique_fields=['abbreviation'], label="TEAM")
+        rows = [dict(self.rows[0], nickname="Detroit"), self.rows[1]]
+
+        result = bulk_upsert(Team, rows, unique_fields=['abbreviation'], label="TEAM")
+        again = bulk_upsert(Team, rows, unique_fields=['abbreviation'], label="TEAM")
+
+        self.assertEqual((result.updated, result.skipped), (1, 1))
+        self.assertEqual([team.abbreviation for team in result.objects], ["DET"])
+        self.assertEqual(again.skipped, 2)
+        self.assertEqual(Team.objects.get(abbreviation="DET").nickname, "Detroit")
+
+    def test_deleted_row_is_recreated(self):
+        bulk_upsert(Team, self.rows, unique_fields=['abbreviation'], label="TEAM")
+        Team.objects.filter(abbreviation="CHI").delete()
+
+        result = bulk_upsert(Team, self.rows, unique_fields=['abbreviation'], label="TEAM")
+
+        self.assertEqual((result.created, result.skipped), (1, 1))
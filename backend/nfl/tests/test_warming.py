@@ -0,0 +1,71 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from nfl.caching import invalidate
+from nfl.factories import TeamFactory, PlayerFactory, GameFactory, PlayerGameStatsFactory
+from nfl.warming import warm_cache, unless_warming, render_internal
+
+@override_settings(ALLOWED_HOSTS=['nfl.example.com', 'testserver'], WARM_HOST='nfl.example.com')
+class CacheWarmingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        home, away = TeamFactory(abbreviation="DET"), TeamFactory(abbreviation="CHI")
+        self.game = GameFactory(homeTeam=home, awayTeam=away, season_year=2025, week=7, status="Final")
+        self.popular = PlayerGameStatsFactory(player=PlayerFactory(team=home, position="QB"), game=self.game).player
+        self.unvisited = PlayerGameStatsFactory(player=PlayerFactory(team=away, position="WR"), game=self.game).player
+
+    def detail_url(self, player):
+        return reverse('nfl:player-game-stats-view', args=[player.pk, player.slug])
+
+    def test_warms_frontend_queries(self):
+        self.client.get(self.detail_url(self.popular))
+
+        warmed, elapsed = warm_cache()
+
+        # teams, team stats, ranks, events, defense vs position, 4 positions x 2 opponents, 1 visited player
+        self.assertEqual(warmed, 14)
+        self.assertGreaterEqual(elapsed, 0)
+        with self.assertNumQueries(0):
+            self.client.get(reverse('nfl:events-view'), {'week': 7, 'status': 'Final'})
+            self.client.get(reverse('nfl:team-stats-view'))
+            self.client.get(self.detail_url(self.popular))
+            self.client.get(reverse('nfl:player-stats-gamelogs-view'), {
+                'position': 'QB', 'opponent': 'CHI', 'season_year': 2025,
+                'season_type': 2, 'location': '', 'cursor': '',
+            })
+
+    def test_only_visited_players_are_warmed(self):
+        self.client.get(self.detail_url(self.popular))
+        invalidate(['player'])
+        warm_cache()
+
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url(self.popular))
+        self.assertEqual(cache.get(f'hits:player:{self.unvisited.pk}'), None)
+
+    @mock.patch('nfl.pagination.GamelogKeysetPagination.page_size', 1)
+    def test_requests_use_warm_host(self):
+        response = render_internal(reverse('nfl:player-stats-gamelogs-view'), {'cursor': ''})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_warming_requests_skip_rate_limit(self):
+        request = RequestFactory().get('/')
+        rate = unless_warming('10/m')
+
+        self.assertEqual(rate('group', request), '10/m')
+        request.cache_warming = True
+        self.assertIsNone(rate('group', request))
+
+    @mock.patch('rest_framework.throttling.SimpleRateThrottle.THROTTLE_RATES', {'anon': '1/day', 'user': '1/day'})
+    def test_warming_skips_daily_throttle(self):
+        self.client.get(reverse('nfl:team-stats-view'))
+        self.assertEqual(self.client.get(reverse('nfl:team-stats-view')).status_code, 429)
+
+        warmed, _ = warm_cache()
+
+        self.assertEqual(warmed, 13)
@@ -3,10 +3,16 @@ from .views import (
     TeamListAPIView,
     TeamStatsListView,
     TeamRanksListView,
+    TeamRankHistoryView,
+    TeamRankDeltaListView,
     PlayerListAPIView,
     PlayerGameStatsRetrieveAPIView,
+    PlayerGameStatsBatchView,
     PlayerGameStatsMatchupsListView,
-    EventListView
+    EventListView,
+    DefenseVsPositionListView,
+    PlayerSeasonLeaderboardView,
+    ExportView
 )
 
 app_name = 'nfl'
@@ -15,11 +21,17 @@ urlpatterns = [
     path('teams/', TeamListAPIView.as_view(), name='team-list-api-view'),
     path('team/stats/', TeamStatsListView.as_view(), name='team-stats-view'),
     path('team/stats/ranks/', TeamRanksListView.as_view(), name='team-stats-ranks-view'),
+    path('team/stats/ranks/deltas/', TeamRankDeltaListView.as_view(), name='team-rank-deltas-view'),
+    path('team/<str:abbreviation>/ranks/history/', TeamRankHistoryView.as_view(), name='team-rank-history-view'),
 
     path('players/', PlayerListAPIView.as_view(), name='player-list-api-view'), # Used for autocomplete search bar
 
     path('player/stats/id/<int:pk>/<str:slug>', PlayerGameStatsRetrieveAPIView.as_view(), name='player-game-stats-view'),
+    path('player/stats/batch/', PlayerGameStatsBatchView.as_view(), name='player-game-stats-batch-view'),
 
     path('player/stats/gamelogs', PlayerGameStatsMatchupsListView.as_view(), name='player-stats-gamelogs-view'),
-    path('events/', EventListView.as_view(), name='events-view')
+    path('player/stats/leaderboard/', PlayerSeasonLeaderboardView.as_view(), name='player-leaderboard-view'),
+    path('defense/vs-position/', DefenseVsPositionListView.as_view(), name='defense-vs-position-view'),
+    path('events/', EventListView.as_view(), name='events-view'),
+    path('export/<slug:dataset>.<slug:file_format>', ExportView.as_view(), name='export-view')
 ]
\ No newline at end of file
@@ -1,38 +1,78 @@
 from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
-from django.views.decorators.cache import cache_page
+from django.http import StreamingHttpResponse
+from django.db.models import DecimalField, F, FloatField, IntegerField, Window
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Lag, RowNumber
 from django_ratelimit.decorators import ratelimit
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from urllib.parse import urlencode
+from .export import DATASETS, FORMATS, export
+from .fantasy import DEFAULT_PROFILE, SCORING_PROFILES
+from .caching import (
+    cached_objects, cached_response, conditional_response, count_hits,
+    static_tags, player_tags, batch_player_tags, gamelog_tags, event_tags, export_tags,
+)
+from .planner import PlannedQuerysetMixin
+from .rendering import FastListMixin
+from .search import DEFAULT_LIMIT, MAX_LIMIT, player_index
+from .warming import unless_warming
 from .models import *
-from .pagination import PlayerGameStatsMatchupsPagination
+from .pagination import PlayerGameStatsMatchupsPagination, LeaderboardPagination
 from .serializers import (
     TeamSerializer,
-    PlayerSerializer,
     PlayerStatsSerializer,
     TeamStatsSerializer,
     TeamRanksSerializer,
     PlayerGameStatsMatchupsSerializer,
-    GameSerializer
+    GameSerializer,
+    TeamWeeklySnapshotSerializer,
+    TeamRankDeltaSerializer,
+    DefenseVsPositionSerializer,
+    PlayerSeasonAggregateSerializer
 )
 from .filters import (
-    PlayerFilter,
     PlayerStatFilter,
     PlayerMatchupsFilter,
-    UpcomingGameFilter
+    UpcomingGameFilter,
+    TeamRankHistoryFilter,
+    TeamRankDeltaFilter,
+    DefenseVsPositionFilter,
+    PlayerSeasonAggregateFilter
 )
 
 ONE_WEEK = 60 * 60 * 24 * 7
 
-class TeamListAPIView(generics.ListAPIView):
+class FantasyPointsMixin(object):
+    """
+    Pulls the ?profile= scoring profile (ppr by default) out of the stored
+    fantasy points JSON into plain annotations, one per fantasy_fields
+    entry, so ?ordering= can sort on them.
+    """
+    fantasy_fields = {'fantasy': 'fantasy_points'}
+
+    def get_queryset(self):
+        profile = self.request.query_params.get('profile') or DEFAULT_PROFILE
+        if profile not in SCORING_PROFILES:
+            raise ValidationError({'profile': f"Unknown scoring profile, expected one of {sorted(SCORING_PROFILES)}"})
+
+        return super().get_queryset().annotate(**{
+            name: Cast(KT(f'{field}__{profile}'), FloatField())
+            for name, field in self.fantasy_fields.items()
+        })
+
+class TeamListAPIView(PlannedQuerysetMixin, generics.ListAPIView):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['nickname',]
 
-    @method_decorator(cache_page(ONE_WEEK))
-    @method_decorator(ratelimit(key='ip', rate='30/m', method='GET', block=True))
+    @method_decorator(conditional_response(static_tags('teams')))
+    @method_decorator(cached_response(ONE_WEEK, static_tags('teams')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('30/m'), method='GET', block=True))
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
@@ -40,73 +80,226 @@ class TeamListAPIView(generics.ListAPIView):
         data = {"teams": serializer.data}
         return Response(data)
           
-class PlayerListAPIView(generics.ListAPIView):
-    queryset = Player.objects.all()
-    serializer_class = PlayerSerializer
-    filter_backends = [DjangoFilterBackend]
-    filterset_class = PlayerFilter
-    pagination_class = None
+class PlayerListAPIView(generics.GenericAPIView):
+    """
+    Autocomplete for the search bar, ?fullName=amon-ra st&limit=5. Served
+    from the in-process prefix index (nfl.search), best matches first.
+    """
+    @method_decorator(conditional_response(static_tags('players')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('120/m'), method='GET', block=True))
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': "Must be a number."})
 
-    @method_decorator(cache_page(ONE_WEEK))
-    @method_decorator(ratelimit(key='ip', rate='30/m', method='GET', block=True))
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        
         return Response({
-            'players': serializer.data
+            'players': player_index().search(request.query_params.get('fullName', ''), max(limit, 1))
         })
 
-class PlayerGameStatsRetrieveAPIView(generics.RetrieveAPIView):
+class PlayerGameStatsRetrieveAPIView(PlannedQuerysetMixin, generics.RetrieveAPIView):
     queryset = Player.objects.all()
     serializer_class = PlayerStatsSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = PlayerStatFilter
     lookup_field = 'slug'
 
-    @method_decorator(cache_page(ONE_WEEK))
-    @method_decorator(ratelimit(key='ip', rate='10/m', method='GET', block=True))
+    @method_decorator(count_hits('player', ONE_WEEK))
+    @method_decorator(conditional_response(player_tags))
+    @method_decorator(cached_response(ONE_WEEK, player_tags))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('10/m'), method='GET', block=True))
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
-class TeamStatsListView(generics.ListAPIView):
-    queryset = Team.objects.all()
+class PlayerGameStatsBatchView(PlannedQuerysetMixin, generics.GenericAPIView):
+    """
+    Gamelogs of several players at once for comparisons, e.g.
+    ?ids=12,40,77&season_year=2025&location=home. Each player is cached on
+    its own; the ones not cached are loaded together, players in one
+    query and all their gamelogs in one prefetch.
+    """
+    queryset = Player.objects.all()
+    serializer_class = PlayerStatsSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PlayerStatFilter
+    max_players = 10
+
+    @method_decorator(conditional_response(batch_player_tags))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('10/m'), method='GET', block=True))
+    def get(self, request, *args, **kwargs):
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in request.query_params.get('ids', '').split(',') if pk.strip()))
+        except ValueError:
+            raise ValidationError({'ids': "Must be comma separated player ids."})
+        if not 0 < len(ids) <= self.max_players:
+            raise ValidationError({'ids': f"Between 1 and {self.max_players} player ids."})
+
+        params = urlencode(sorted(
+            (name, value) for name, value in request.query_params.items() if name in PlayerStatFilter.base_filters
+        ))
+        players = cached_objects(
+            'player-stats', ids, lambda pk: player_tags(request, pk=pk), params, ONE_WEEK, self.build,
+        )
+        return Response({'players': [players[pk] for pk in ids if pk in players]})
+
+    def build(self, ids: list[int]) -> dict[int, dict]:
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+        return {player['id']: player for player in self.get_serializer(queryset, many=True).data}
+
+class TeamStatsListView(PlannedQuerysetMixin, generics.ListAPIView):
+    # All eleven stat tables LEFT JOINed onto the 32 teams, one query
+    queryset = Team.objects.select_related(*TEAM_STAT_TABLES)
     serializer_class = TeamStatsSerializer
     pagination_class = None
 
-    @method_decorator(cache_page(60 * 60)) 
+    @method_decorator(conditional_response(static_tags('team-stats')))
+    @method_decorator(cached_response(60 * 60, static_tags('team-stats')))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-class TeamRanksListView(generics.ListAPIView):
+class TeamRanksListView(PlannedQuerysetMixin, generics.ListAPIView):
     queryset = Team.objects.select_related('rank_snapshot').all()
     serializer_class = TeamRanksSerializer
     pagination_class = None
     
-    @method_decorator(cache_page(60 * 60)) 
+    @method_decorator(conditional_response(static_tags('ranks')))
+    @method_decorator(cached_response(60 * 60, static_tags('ranks')))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class TeamRankHistoryView(PlannedQuerysetMixin, generics.ListAPIView):
+    """
+    One team's weekly ranks and stats, oldest week first.
+    """
+    serializer_class = TeamWeeklySnapshotSerializer
+    pagination_class = None
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TeamRankHistoryFilter
+
+    def get_queryset(self):
+        return TeamWeeklySnapshot.objects.filter(team__abbreviation=self.kwargs['abbreviation'])
+
+    @method_decorator(conditional_response(static_tags('ranks')))
+    @method_decorator(cached_response(60 * 60, static_tags('ranks')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('30/m'), method='GET', block=True))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-class PlayerGameStatsMatchupsListView(generics.ListAPIView):
+class TeamRankDeltaListView(PlannedQuerysetMixin, generics.ListAPIView):
+    """
+    League-wide ranks for the latest snapshot up to ?week= next to the
+    previous week's, computed in one query with LAG over each team's
+    snapshots.
+    """
+    serializer_class = TeamRankDeltaSerializer
+    pagination_class = None
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TeamRankDeltaFilter
+
+    def get_queryset(self):
+        weeks = [F('season_year'), F('season_type'), F('week')]
+        return TeamWeeklySnapshot.objects.select_related('team').annotate(
+            newest=Window(RowNumber(), partition_by=[F('team')], order_by=[week.desc() for week in weeks]),
+            **{f'previous_{field}': Window(Lag(field), partition_by=[F('team')], order_by=weeks) for field in RANK_FIELDS}
+        ).order_by('team__abbreviation')
+
+    def filter_queryset(self, queryset):
+        # Filtering on the window annotation keeps the earlier weeks inside
+        # the LAG and only returns each team's latest row.
+        return super().filter_queryset(queryset).filter(newest=1)
+
+    @method_decorator(conditional_response(static_tags('ranks')))
+    @method_decorator(cached_response(60 * 60, static_tags('ranks')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('30/m'), method='GET', block=True))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class PlayerGameStatsMatchupsListView(FantasyPointsMixin, FastListMixin, PlannedQuerysetMixin, generics.ListAPIView):
+    # ?ordering= applies to page number mode, cursor pages are newest first
     queryset = PlayerGameStats.objects.all().select_related('player', 'game', 'player__team')
     serializer_class = PlayerGameStatsMatchupsSerializer
     pagination_class = PlayerGameStatsMatchupsPagination
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = PlayerMatchupsFilter
+    ordering_fields = ['fantasy', 'game_date']
 
-    @method_decorator(cache_page(ONE_WEEK))
-    @method_decorator(ratelimit(key='ip', rate='60/m', method='GET', block=True))
+    @method_decorator(conditional_response(gamelog_tags))
+    @method_decorator(cached_response(ONE_WEEK, gamelog_tags))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('60/m'), method='GET', block=True))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-class EventListView(generics.ListAPIView):
+class EventListView(FastListMixin, PlannedQuerysetMixin, generics.ListAPIView):
     queryset = Game.objects.all()
     serializer_class = GameSerializer
     pagination_class = None
     filter_backends = [DjangoFilterBackend]
     filterset_class = UpcomingGameFilter
 
-    @method_decorator(cache_page(ONE_WEEK))
-    @method_decorator(ratelimit(key='ip', rate='10/m', method='GET', block=True))
+    @method_decorator(conditional_response(event_tags))
+    @method_decorator(cached_response(ONE_WEEK, event_tags))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('10/m'), method='GET', block=True))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class DefenseVsPositionListView(PlannedQuerysetMixin, generics.ListAPIView):
+    """
+    The whole defense vs position matrix for a season in one response,
+    every defense against every skill position.
+    """
+    queryset = DefenseVsPosition.objects.all()
+    serializer_class = DefenseVsPositionSerializer
+    pagination_class = None
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = DefenseVsPositionFilter
+
+    @method_decorator(conditional_response(static_tags('defense')))
+    @method_decorator(cached_response(ONE_WEEK, static_tags('defense')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('30/m'), method='GET', block=True))
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
\ No newline at end of file
+        return super().list(request, *args, **kwargs)
+
+class PlayerSeasonLeaderboardView(FantasyPointsMixin, FastListMixin, PlannedQuerysetMixin, generics.ListAPIView):
+    """
+    Season leaderboard read from the precomputed aggregates, sortable on
+    any stat, e.g. ?season_year=2025&position=WR&ordering=-target_share
+    or ?profile=draftkings&ordering=-fantasy_per_game.
+    """
+    queryset = PlayerSeasonAggregate.objects.all()
+    serializer_class = PlayerSeasonAggregateSerializer
+    pagination_class = LeaderboardPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = PlayerSeasonAggregateFilter
+    fantasy_fields = {'fantasy': 'fantasy_points', 'fantasy_per_game': 'fantasy_points_per_game'}
+    ordering_fields = [
+        field.name for field in PlayerSeasonAggregate._meta.concrete_fields
+        if isinstance(field, (IntegerField, DecimalField)) and field.name != 'id'
+    ] + list(fantasy_fields)
+    ordering = ['-games', 'id']
+
+    @method_decorator(conditional_response(static_tags('leaderboard')))
+    @method_decorator(cached_response(ONE_WEEK, static_tags('leaderboard')))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('30/m'), method='GET', block=True))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class ExportView(generics.GenericAPIView):
+    """
+    A whole filtered dataset as one streamed file instead of pages, e.g.
+    export/gamelogs.parquet?season_year=2024&position=WR. Datasets and
+    formats are in nfl.export; gamelogs take the gamelog filters.
+    """
+    @method_decorator(conditional_response(export_tags))
+    @method_decorator(ratelimit(key='ip', rate=unless_warming('5/m'), method='GET', block=True))
+    def get(self, request, dataset, file_format):
+        if dataset not in DATASETS or file_format not in FORMATS:
+            raise NotFound()
+
+        queryset = DATASETS[dataset].filter(request.query_params)
+        response = StreamingHttpResponse(export(DATASETS[dataset], file_format, queryset), content_type=FORMATS[file_format][1])
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.{file_format}"'
+        return response
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file is not rendered, whatever the client accepts
+        return super().perform_content_negotiation(request, force=True)
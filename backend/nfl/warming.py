@@ -0,0 +1,97 @@
+from time import perf_counter
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from .caching import top_hits
+from .models import Team, Player, Game, SKILL_POSITIONS
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+WARM_TOP_PLAYERS = int(os.getenv('WARM_TOP_PLAYERS', 50))
+REGULAR_SEASON = 2
+
+def unless_warming(rate: str):
+    """
+    Ratelimit rate that does not apply to the warmer's own requests.
+    """
+    def rate_for(group, request):
+        return None if getattr(request, 'cache_warming', False) else rate
+    return rate_for
+
+def warm_requests(top_players: int = WARM_TOP_PLAYERS) -> list[tuple[str, dict]]:
+    """
+    (path, query) pairs for the responses the frontend asks for first,
+    with the query parameters exactly as it sends them so the cache keys
+    match.
+    """
+    requests = [
+        (reverse('nfl:team-list-api-view'), {}),
+        (reverse('nfl:team-stats-view'), {}),
+        (reverse('nfl:team-stats-ranks-view'), {}),
+    ]
+
+    latest = Game.objects.filter(status='Final').order_by('-date').first()
+    if latest is None:
+        return requests
+
+    requests.append((reverse('nfl:events-view'), {'week': latest.week, 'status': 'Final'}))
+    requests.append((reverse('nfl:defense-vs-position-view'), {'season_year': latest.season_year, 'season_type': REGULAR_SEASON}))
+
+    for position in SKILL_POSITIONS:
+        for opponent in Team.objects.values_list('abbreviation', flat=True):
+            requests.append((reverse('nfl:player-stats-gamelogs-view'), {
+                'position': position,
+                'opponent': opponent,
+                'season_year': latest.season_year,
+                'season_type': REGULAR_SEASON,
+                'location': '',
+                'cursor': '',
+            }))
+
+    candidates = Player.objects.filter(stats__game__season_year=latest.season_year).values_list('pk', flat=True).distinct()
+    top = top_hits('player', candidates, top_players)
+    for player in Player.objects.filter(pk__in=top).only('pk', 'slug'):
+        requests.append((reverse('nfl:player-game-stats-view', args=[player.pk, player.slug]), {}))
+
+    return requests
+
+def render_internal(path: str, query: dict):
+    """
+    One GET rendered straight through its view, flagged as the warmer's
+    so rate limits and hit counting leave it alone. It is addressed to
+    WARM_HOST, as host validation rejects RequestFactory's own.
+    """
+    request = RequestFactory().get(
+        path, query, HTTP_ACCEPT='application/json', HTTP_HOST=settings.WARM_HOST, SERVER_NAME=settings.WARM_HOST,
+    )
+    request.cache_warming = True
+    match = resolve(path)
+
+    response = match.func(request, *match.args, **match.kwargs)
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    return response
+
+def warm_cache(top_players: int = WARM_TOP_PLAYERS) -> tuple[int, float]:
+    """
+    Renders every warm request through its view so cached_response stores
+    it. Returns the number of responses warmed and the seconds it took.
+    """
+    start = perf_counter()
+    warmed = 0
+
+    for path, query in warm_requests(top_players):
+        try:
+            response = render_internal(path, query)
+        except Exception as e:
+            logger.error(f"WARM FAILED: {path} {query} ({e})")
+            continue
+
+        if response.status_code == 200:
+            warmed += 1
+        else:
+            logger.warning(f"WARM SKIPPED: {path} {query} returned {response.status_code}")
+
+    return warmed, perf_counter() - start
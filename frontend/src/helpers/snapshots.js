@@ -0,0 +1,15 @@
+let manifest;
+
+const getManifest = () => {
+    manifest ??= fetch('/snapshots/manifest.json')
+        .then((response) => response.json())
+        .catch(() => ({ files: {} }));
+    return manifest;
+};
+
+// The published snapshot file of a response when there is one (served by
+// nginx, see nginx/default.conf), the API otherwise
+export default async function fetchSnapshot(name, apiUrl) {
+    const { files } = await getManifest();
+    return fetch(files?.[name] ?? apiUrl);
+}
@@ -35,7 +35,7 @@ export default function Layout() {
     }
 
     if (input.length >= 2) {
-      const data = await fetch("/nfl/players/?fullName=" + input);
+      const data = await fetch("/nfl/players/?limit=5&fullName=" + encodeURIComponent(input));
       const json = await data.json();
       setResults(json?.players);
       setSearhBarCache(prev => ({ ...prev, [input]: json?.players }));
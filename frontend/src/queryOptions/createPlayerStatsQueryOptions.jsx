@@ -1,4 +1,5 @@
 import { queryOptions } from "@tanstack/react-query";
+import fetchSnapshot from "../helpers/snapshots";
 
 export default function createPlayerStatsQueryOptions(player_id, player_slug) {
     return queryOptions({
@@ -11,6 +12,6 @@ export default function createPlayerStatsQueryOptions(player_id, player_slug) {
 
 const getPlayerStats = async (player_id, player_slug) => {
     await new Promise((resolve) => setTimeout(resolve, 1000));
-    const response = await fetch(`/nfl/player/stats/id/${player_id}/${player_slug}`);
+    const response = await fetchSnapshot(`players/${player_id}.json`, `/nfl/player/stats/id/${player_id}/${player_slug}`);
     return response.json()
 }
\ No newline at end of file
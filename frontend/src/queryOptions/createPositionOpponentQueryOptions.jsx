@@ -4,12 +4,12 @@ export default function createPositionOpponentQueryOptions(position, opponent, s
     return infiniteQueryOptions({
         queryKey: ['positionOpponent', position, opponent, seasonYear, seasonType, location],
         queryFn: ({ pageParam }) => getPositionOpponent(position, opponent, seasonYear, seasonType, location, pageParam),
-        initialPageParam: 1,
+        initialPageParam: '',
         getNextPageParam: (lastPage) => {
             if (lastPage.next) {
                 try {
-                    const url = new URL(lastPage.next);
-                    return url.searchParams.get('page');
+                    const url = new URL(lastPage.next, window.location.origin);
+                    return url.searchParams.get('cursor');
                 } catch {
                     return undefined;
                 }
@@ -27,7 +27,7 @@ const getPositionOpponent = async (position, opponent, seasonYear, seasonType, l
         season_year: seasonYear,
         season_type: seasonType,
         location,
-        page: pageParam.toString()
+        cursor: pageParam
     });
 
     const response = await fetch(`/nfl/player/stats/gamelogs?${params.toString()}`);
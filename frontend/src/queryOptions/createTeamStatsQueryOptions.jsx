@@ -1,4 +1,5 @@
 import { queryOptions } from '@tanstack/react-query'
+import fetchSnapshot from '../helpers/snapshots'
 
 export default function createTeamStatsQueryOptions() {
     return queryOptions({
@@ -10,6 +11,6 @@ export default function createTeamStatsQueryOptions() {
 
 const getTeamStats = async () => {
     await new Promise((resolve) => setTimeout(resolve, 1000));
-    const response = await fetch('/nfl/team/stats/');
+    const response = await fetchSnapshot('team-stats.json', '/nfl/team/stats/');
     return response.json();
 }
\ No newline at end of file
@@ -1,4 +1,5 @@
 import { queryOptions } from '@tanstack/react-query'
+import fetchSnapshot from '../helpers/snapshots'
 
 export default function createTeamStatsRanksQueryOptions() {
     return queryOptions({
@@ -10,6 +11,6 @@ export default function createTeamStatsRanksQueryOptions() {
 
 const getTeamStatsRanks = async () => {
     await new Promise((resolve) => setTimeout(resolve, 1000));
-    const response = await fetch('/nfl/team/stats/ranks/');
+    const response = await fetchSnapshot('ranks.json', '/nfl/team/stats/ranks/');
     return response.json();
 }
\ No newline at end of file
@@ -1,4 +1,5 @@
 import { queryOptions } from '@tanstack/react-query'
+import fetchSnapshot from '../helpers/snapshots'
 
 export default function createTeamsQueryOptions() {
     return queryOptions({
@@ -10,6 +11,6 @@ export default function createTeamsQueryOptions() {
 
 const getTeams = async () => {
     await new Promise((resolve) => setTimeout(resolve, 1000));
-    const response = await fetch('/nfl/teams/');
+    const response = await fetchSnapshot('teams.json', '/nfl/teams/');
     return response.json();
 }
\ No newline at end of file